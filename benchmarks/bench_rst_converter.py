@@ -0,0 +1,72 @@
+"""Micro-benchmark for the per-call cost of converting a docstring to Markdown.
+
+Compares a fresh docutils setup per call (what `convert_rst_to_markdown` used to do)
+with a reused `RstConverter`.
+
+Usage:
+    python benchmarks/bench_rst_converter.py [--number N]
+"""
+
+import argparse
+import sys
+import timeit
+
+from docutils.core import publish_doctree
+from docutils.parsers.rst import roles
+
+from luma.rst_converter import (
+    SETTINGS_OVERRIDES,
+    SPHINX_ROLES,
+    MarkdownWriter,
+    RstConverter,
+    sphinx_ref_role,
+)
+
+SAMPLES = {
+    # Plain text, which the converter handles without docutils.
+    "short": "The amount to deposit.",
+    "typical": (
+        "Send a request to the server.\n\n"
+        "Use :class:`requests.Session` to reuse connections, and see\n"
+        "``timeout`` for details.\n\n"
+        "- First item\n"
+        "- Second item with *emphasis*\n\n"
+        ".. note::\n\n"
+        "   Retries aren't supported.\n"
+    ),
+}
+
+
+def convert_without_reuse(rst_text: str) -> str:
+    for role_name in SPHINX_ROLES:
+        roles.register_local_role(role_name, sphinx_ref_role)
+
+    doctree = publish_doctree(
+        rst_text,
+        settings_overrides={**SETTINGS_OVERRIDES, "Warning_stream": sys.stdout},
+    )
+    visitor = MarkdownWriter(doctree)
+    doctree.walkabout(visitor)
+    return "".join(visitor.output).strip()
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--number", type=int, default=500)
+    args = argument_parser.parse_args()
+
+    converter = RstConverter()
+    print(f"{'sample':<10}{'fresh (us)':>14}{'reused (us)':>14}{'speedup':>10}")
+    for name, text in SAMPLES.items():
+        assert convert_without_reuse(text) == converter.convert(text)
+
+        fresh = timeit.timeit(lambda: convert_without_reuse(text), number=args.number)
+        reused = timeit.timeit(lambda: converter.convert(text), number=args.number)
+        print(
+            f"{name:<10}{fresh / args.number * 1e6:>14.1f}"
+            f"{reused / args.number * 1e6:>14.1f}{fresh / reused:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Size report for a search index shard in each format.
+
+Compares `MiniSearch.toJSON`'s format, which repeats the fields of a page for every
+heading, with Luma's compact shard format, uncompressed and precompressed.
+
+Usage:
+    python benchmarks/bench_search_index.py [--pages N] [--headings N]
+"""
+
+import argparse
+import gzip
+import json
+
+from luma.minisearch import build_index
+from luma.search import SEARCH_FIELDS, STORED_FIELDS, _encode_shard
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_documents(num_pages: int, num_headings: int):
+    docs = []
+    for page in range(num_pages):
+        path = f"/guides/topic-{page}"
+        fields = {
+            "title": f"Configuring topic {page}",
+            "section": f"Section {page % 10}",
+            "type": "page",
+        }
+        docs.append(
+            {
+                "id": path,
+                "path": path,
+                "content": f"Learn how topic {page} works and when to use it. " * 5,
+                "heading": "",
+                "headingLevel": 0,
+                **fields,
+            }
+        )
+        for heading in range(num_headings):
+            anchor = f"step-{heading}-options"
+            docs.append(
+                {
+                    "id": f"{path}#{anchor}",
+                    "path": f"{path}#{anchor}",
+                    "content": "",
+                    "heading": f"Step {heading} options",
+                    "headingLevel": 2,
+                    **fields,
+                }
+            )
+    return docs
+
+
+def get_sizes(data: bytes):
+    sizes = {"raw": len(data), "gzip": len(gzip.compress(data, compresslevel=9))}
+    if brotli is not None:
+        sizes["brotli"] = len(brotli.compress(data))
+    return sizes
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--pages", type=int, default=50)
+    argument_parser.add_argument("--headings", type=int, default=40)
+    args = argument_parser.parse_args()
+
+    docs = make_documents(args.pages, args.headings)
+    minisearch = build_index(docs, fields=SEARCH_FIELDS, store_fields=STORED_FIELDS)
+    formats = {
+        "minisearch": json.dumps(minisearch).encode(),
+        "compact": json.dumps(_encode_shard(docs), separators=(",", ":")).encode(),
+    }
+
+    sizes = {name: get_sizes(data) for name, data in formats.items()}
+    columns = list(sizes["minisearch"])
+    print(f"{len(docs)} documents")
+    print(f"{'format':<12}" + "".join(f"{column + ' (kB)':>14}" for column in columns))
+    for name, format_sizes in sizes.items():
+        print(
+            f"{name:<12}"
+            + "".join(f"{format_sizes[column] / 1024:>14.1f}" for column in columns)
+        )
+
+
+if __name__ == "__main__":
+    main()
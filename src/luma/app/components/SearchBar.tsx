@@ -1,20 +1,109 @@
-import React, { useState, useEffect, useRef, useMemo } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { createPortal } from "react-dom";
 import { useRouter } from "next/router";
 import MiniSearch from "minisearch";
 import styles from "./SearchBar.module.css";
 
-import searchIndexData from "../data/search-index.json";
+// Lists the URLs of the index shards in 'public/', so the index itself isn't part
+// of the JavaScript bundle.
+import searchIndexManifest from "../data/search-index.json";
 
-interface SearchDocument {
-  id: string;
-  title: string;
-  path: string;
-  content: string;
-  section: string;
-  heading: string;
-  headingLevel: number;
-  type: string;
+// The fields must match `SEARCH_FIELDS` and `STORED_FIELDS` in 'search.py'.
+const SEARCH_OPTIONS = {
+  fields: ["title", "heading", "content"],
+  storeFields: ["title", "path", "section", "heading", "headingLevel", "type"],
+  searchOptions: {
+    boost: { title: 3, heading: 2, content: 1 },
+    fuzzy: 0.2,
+    prefix: true,
+  },
+};
+
+type SearchIndexShard = MiniSearch<SearchResult>;
+
+// Must match `SHARD_FORMAT_VERSION` in 'search.py'.
+const SHARD_FORMAT_VERSION = 1;
+
+// Luma stores the fields of each page once, with the strings interned, instead of
+// repeating them for every heading like `MiniSearch.toJSON` does. See
+// `_encode_shard` in 'search.py'.
+interface CompactShard {
+  version: number;
+  strings: string[];
+  pages: {
+    path: number[];
+    title: number[];
+    section: number[];
+    type: number[];
+  };
+  documents: {
+    page: number[];
+    // The anchor, heading and heading level of each heading, by document.
+    headings: Record<string, [string, string, number]>;
+  };
+  index: { fieldLength: number[][]; [key: string]: unknown };
+}
+
+type SerializedIndex = Parameters<typeof MiniSearch.loadJS>[0];
+
+// Convert a compact shard to the object that `MiniSearch.loadJS` accepts.
+function decodeShard(shard: CompactShard): SerializedIndex {
+  if (shard.version !== SHARD_FORMAT_VERSION) {
+    throw new Error(`Unsupported search index version: ${shard.version}`);
+  }
+  const { strings, pages, documents, index } = shard;
+  const documentIds: Record<string, string> = {};
+  const fieldLength: Record<string, number[]> = {};
+  const storedFields: Record<string, Omit<SearchResult, "id">> = {};
+  documents.page.forEach((page, shortId) => {
+    const heading = documents.headings[shortId];
+    const pagePath = strings[pages.path[page]];
+    const path = heading ? `${pagePath}#${heading[0]}` : pagePath;
+    documentIds[shortId] = path;
+    fieldLength[shortId] = index.fieldLength[shortId];
+    storedFields[shortId] = {
+      title: strings[pages.title[page]],
+      path,
+      section: strings[pages.section[page]],
+      heading: heading ? heading[1] : "",
+      headingLevel: heading ? heading[2] : 0,
+      type: strings[pages.type[page]],
+    };
+  });
+  return {
+    ...index,
+    documentCount: documents.page.length,
+    nextId: documents.page.length,
+    documentIds,
+    fieldLength,
+    storedFields,
+    dirtCount: 0,
+  } as SerializedIndex;
+}
+
+// Shared by every search bar, so that the shards are only fetched once per visit.
+let shardsPromise: Promise<SearchIndexShard[]> | null = null;
+
+function loadSearchIndex(basePath: string): Promise<SearchIndexShard[]> {
+  if (shardsPromise === null) {
+    shardsPromise = Promise.all(
+      (searchIndexManifest as { shards: string[] }).shards.map(async (url) => {
+        const response = await fetch(`${basePath}${url}`);
+        if (!response.ok) {
+          throw new Error(`Couldn't fetch '${url}': ${response.status}`);
+        }
+        return MiniSearch.loadJS<SearchResult>(
+          decodeShard(await response.json()),
+          SEARCH_OPTIONS,
+        );
+      }),
+    );
+    // Try again the next time the search box gets focus.
+    shardsPromise.catch(() => {
+      shardsPromise = null;
+    });
+  }
+  return shardsPromise;
 }
 
 interface SearchResult {
@@ -102,30 +191,20 @@ export function SearchBar() {
   const dropdownRef = useRef<HTMLDivElement>(null);
   const router = useRouter();
 
-  // Build search index (memoized)
-  const searchIndex = useMemo(() => {
-    const documents = searchIndexData as SearchDocument[];
-
-    const miniSearch = new MiniSearch({
-      fields: ["title", "heading", "content"],
-      storeFields: [
-        "title",
-        "path",
-        "section",
-        "heading",
-        "headingLevel",
-        "type",
-      ],
-      searchOptions: {
-        boost: { title: 3, heading: 2, content: 1 },
-        fuzzy: 0.2,
-        prefix: true,
-      },
-    });
+  const [searchIndex, setSearchIndex] = useState<SearchIndexShard[] | null>(
+    null,
+  );
 
-    miniSearch.addAll(documents);
-    return miniSearch;
-  }, []);
+  // Fetch the index that Luma built in Python when the search box first gets
+  // focus, so that pages don't wait for it.
+  const loadIndex = () => {
+    if (searchIndex !== null) {
+      return;
+    }
+    loadSearchIndex(router.basePath)
+      .then(setSearchIndex)
+      .catch((error) => console.error("Search index error:", error));
+  };
 
   // Handle search query
   useEffect(() => {
@@ -136,7 +215,11 @@ export function SearchBar() {
     }
 
     try {
-      const searchResults = searchIndex.search(query);
+      // Scores of different shards are only approximately comparable, because
+      // each shard has its own term statistics.
+      const searchResults = searchIndex
+        .flatMap((shard) => shard.search(query))
+        .sort((a, b) => b.score - a.score);
       const limitedResults = searchResults.slice(0, 8).map((result) => ({
         id: result.id,
         title: result.title,
@@ -270,6 +353,7 @@ export function SearchBar() {
             placeholder="Search..."
             value={query}
             onChange={(e) => setQuery(e.target.value)}
+            onFocus={loadIndex}
             onKeyDown={handleKeyDown}
           />
         </div>
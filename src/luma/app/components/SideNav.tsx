@@ -3,12 +3,14 @@ import { useRouter } from "next/router";
 import Link from "next/link";
 import styles from "./SideNav.module.css";
 import { SearchBar } from "./SearchBar";
+import qualname_to_path from "../data/apis.json";
 
 import {
   Page,
   Reference,
   NavigationItem,
   Link as LinkType,
+  referenceMatchesPath,
 } from "../types/config";
 
 interface SideNavProps {
@@ -47,13 +49,52 @@ function SideNavLink({
   }
 
   return (
-    <li
-      className={isActive ? styles.sideNavItemActive : ""}
-      style={addTopSpacing ? { marginTop: "0.75rem" } : undefined}
-    >
-      <Link className={styles.sidenavItem} key={key} href={href}>
-        {linkText}
-      </Link>
+    <>
+      <li
+        className={isActive ? styles.sideNavItemActive : ""}
+        style={addTopSpacing ? { marginTop: "0.75rem" } : undefined}
+      >
+        <Link className={styles.sidenavItem} key={key} href={href}>
+          {linkText}
+        </Link>
+      </li>
+      {item.type == "reference" &&
+        item.split &&
+        referenceMatchesPath(item, currentPath) && (
+          <ReferenceApiLinks item={item} currentPath={currentPath} />
+        )}
+    </>
+  );
+}
+
+// The APIs of a split reference, shown while one of its pages is open. APIs that
+// failed to render have no page, and "apis.json" only lists the rendered ones.
+function ReferenceApiLinks({
+  item,
+  currentPath,
+}: {
+  item: Reference;
+  currentPath: string;
+}) {
+  const basePath = `/${item.relative_path.slice(0, -3)}`;
+  const apis = item.apis.filter((api) => api in qualname_to_path);
+  return (
+    <li>
+      <ul style={{ listStyle: "none", paddingLeft: "0.75rem", margin: 0 }}>
+        {apis.map((api) => {
+          const href = `${basePath}/${api}`;
+          return (
+            <li
+              key={api}
+              className={currentPath === href ? styles.sideNavItemActive : ""}
+            >
+              <Link className={styles.sidenavItem} href={href}>
+                {api.split(".").pop()}
+              </Link>
+            </li>
+          );
+        })}
+      </ul>
     </li>
   );
 }
@@ -0,0 +1,56 @@
+import { nodes, Tag, Node, Config, RenderableTreeNode } from "@markdoc/markdoc";
+
+// The search index links to H1 to H3 headings, except the first H1, which is the
+// page title.
+const MAX_INDEXED_HEADING_LEVEL = 3;
+
+function findHeadings(children: RenderableTreeNode[], headings: Tag[] = []) {
+  for (const child of children) {
+    if (Tag.isTag(child)) {
+      if (child.name === "Heading") {
+        headings.push(child);
+      }
+      findHeadings(child.children, headings);
+    }
+  }
+  return headings;
+}
+
+// Number repeated IDs like `_extract_page_content` in the Python package does, so
+// that search results link to the right heading. The counter skips IDs that are
+// taken, so that "Setup", "Setup" and "Setup 2" don't all end up as "setup-2".
+function numberRepeatedIDs(children: RenderableTreeNode[]) {
+  let skipFirstH1 = true;
+  const counts = new Map<string, number>();
+  const usedIDs = new Set<string>();
+  for (const heading of findHeadings(children)) {
+    const { id, level } = heading.attributes;
+    if (level > MAX_INDEXED_HEADING_LEVEL) {
+      continue;
+    }
+    if (skipFirstH1 && level === 1) {
+      skipFirstH1 = false;
+      continue;
+    }
+
+    let numberedID = id;
+    let count = counts.get(id) ?? 1;
+    while (usedIDs.has(numberedID)) {
+      count += 1;
+      numberedID = `${id}-${count}`;
+    }
+    counts.set(id, count);
+    usedIDs.add(numberedID);
+    heading.attributes.id = numberedID;
+  }
+}
+
+export const document = {
+  ...nodes.document,
+  transform(node: Node, config: Config) {
+    const attributes = node.transformAttributes(config);
+    const children = node.transformChildren(config);
+    numberRepeatedIDs(children);
+    return new Tag("article", attributes, children);
+  },
+};
@@ -10,11 +10,14 @@ function generateID(
   if (attributes.id && typeof attributes.id === "string") {
     return attributes.id;
   }
-  const text = extractTextFromChildren(children);
-  return text
-    .replace(/[?]/g, "")
-    .replace(/\s+/g, "-")
-    .toLowerCase();
+  // The same rules as `slugify` in the Python package, which the search index uses.
+  // Repeated IDs are numbered once the whole document is transformed.
+  return extractTextFromChildren(children)
+    .toLowerCase()
+    .replace(/[^\p{L}\p{N}_\s.-]/gu, "")
+    .split(/[\s_-]+/)
+    .filter((part) => part)
+    .join("-");
 }
 
 export const heading = {
@@ -1,5 +1,6 @@
 // markdoc/nodes/index.ts
 /* Use this file to export your markdoc nodes */
+export * from "./document.markdoc";
 export * from "./fence.markdoc";
 export * from "./heading.markdoc";
 export * from "./image.markdoc"
@@ -24,7 +24,7 @@ import { Config, Tab, NavigationItem } from "../types/config";
 const config = configData as Config;
 
 import { TableOfContentsItem } from "../components/TableOfContents";
-import { Page, Reference } from "../types/config";
+import { Page, Reference, referenceMatchesPath } from "../types/config";
 import { extractTextFromChildren } from "../markdoc/utils";
 
 function hasTabs(navigation: NavigationItem[]): boolean {
@@ -42,8 +42,7 @@ function findCurrentPage(
         return item;
       }
     } else if (item.type === "reference") {
-      const refPath = `/${item.relative_path.slice(0, -3)}`;
-      if (currentPath === refPath) {
+      if (referenceMatchesPath(item, currentPath)) {
         return item;
       }
     } else if (item.type === "section") {
@@ -67,8 +66,7 @@ function findActiveTabIndex(tabs: Tab[], currentPath: string): number {
       const pagePath = `/${item.path.slice(0, -3)}`;
       return path === pagePath;
     } else if (item.type === "reference") {
-      const refPath = `/${item.relative_path.slice(0, -3)}`;
-      return path === refPath;
+      return referenceMatchesPath(item, path);
     } else if (item.type === "section") {
       return item.contents.some((subitem) => pathMatchesItem(subitem, path));
     }
@@ -17,6 +17,13 @@ export interface Reference {
   relative_path: string;
   apis: string[];
   section?: string;
+  // If true, each API has its own page under the reference's path.
+  split?: boolean;
+}
+
+export function referenceMatchesPath(item: Reference, path: string): boolean {
+  const refPath = `/${item.relative_path.slice(0, -3)}`;
+  return path === refPath || (!!item.split && path.startsWith(`${refPath}/`));
 }
 
 export interface Section {
@@ -21,7 +21,18 @@ def download_starter_files(path: str):
 
 
 def download_or_update_scaffold(path: str) -> None:
-    cli_version = _get_cli_version()
+    if update_scaffold_files(path):
+        install_node_modules(path)
+
+
+def update_scaffold_files(path: str) -> bool:
+    """Copy the scaffold files to `path` if they're missing or outdated.
+
+    Returns:
+        Whether the scaffold files were copied. If they were, you need to install the
+        Node.js dependencies.
+    """
+    cli_version = get_cli_version()
 
     should_download_scaffold = False
     # Check if the scaffold directory already exists.
@@ -42,7 +53,8 @@ def download_or_update_scaffold(path: str) -> None:
 
     if should_download_scaffold:
         _copy_package_data("app", path)
-        install_node_modules(path)
+
+    return should_download_scaffold
 
 
 def _get_scaffold_version(path: str) -> str:
@@ -54,7 +66,7 @@ def _get_scaffold_version(path: str) -> str:
     return package_json["version"]
 
 
-def _get_cli_version():
+def get_cli_version():
     version = importlib.metadata.version("luma-docs")
     assert version is not None
     return version
@@ -0,0 +1,303 @@
+"""Build pipeline shared by the `dev` and `deploy` commands.
+
+The phases form a DAG that runs on a thread pool. Each phase fingerprints its inputs
+with the `BuildCache`. If the inputs haven't changed since the last run, the phase is
+skipped and its previous outputs are reused.
+"""
+
+import logging
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .bootstrap import update_scaffold_files
+from .cache import RENDER_CACHE_DIRNAME, BuildCache
+from .config import (
+    CONFIG_FILENAME,
+    Config,
+    ResolvedConfig,
+    ResolvedPage,
+    ResolvedSection,
+    ResolvedTab,
+    Section,
+    Tab,
+    load_config,
+    resolve_config,
+)
+from .link import (
+    link_config,
+    link_existing_pages,
+    link_first_page_to_index,
+    link_static_assets,
+)
+from .node import get_node_root, install_node_modules
+from .parser import (
+    REFERENCE_SOURCES_FILENAME,
+    list_references_in_config,
+    prepare_references,
+)
+from .pipeline import Pipeline
+from .scanner import ProjectInventory, scan_project
+from .search import build_search_index, search_index_exists
+from .utils import write_if_changed
+
+RESOLVED_CONFIG_FILENAME = "resolved-config.json"
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_project(
+    project_root: str,
+    *,
+    max_workers: Optional[int] = None,
+    reference_workers: Optional[int] = None,
+    persistent_worker: bool = False,
+) -> Tuple[Config, ResolvedConfig]:
+    """Generate all the files the Next.js app needs to render the project.
+
+    Independent steps run concurrently. For example, Luma generates references and
+    links pages while `npm install` runs.
+
+    Args:
+        project_root: The project root directory
+        max_workers: The maximum number of steps to run concurrently
+        reference_workers: The maximum number of processes to render API references
+            with
+        persistent_worker: Whether to render API references in the project's
+            persistent worker. This process then never imports the documented package.
+
+    Returns:
+        A tuple of the user-facing config and the resolved config
+    """
+    node_root = get_node_root(project_root)
+
+    pipeline = Pipeline()
+    pipeline.add_step("scaffold", lambda: update_scaffold_files(node_root))
+    pipeline.add_step(
+        "npm install",
+        lambda needs_install: needs_install and install_node_modules(node_root),
+        after=["scaffold"],
+    )
+    # A single walk of the project feeds config validation and both linkers.
+    pipeline.add_step("scan", lambda: scan_project(project_root))
+    pipeline.add_step(
+        "config",
+        lambda inventory: load_config(project_root, inventory, persistent_worker),
+        after=["scan"],
+    )
+    # The cache lives in the scaffold directory, so wait until it's up to date.
+    pipeline.add_step("cache", lambda _: BuildCache(project_root), after=["scaffold"])
+    pipeline.add_step(
+        "resolution",
+        lambda cache, config: _resolve_config(cache, config, project_root),
+        after=["cache", "config"],
+    )
+    pipeline.add_step(
+        "link config",
+        lambda resolved_config: link_config(resolved_config, project_root),
+        after=["resolution"],
+    )
+    pipeline.add_step(
+        "references",
+        lambda cache, config, resolved_config: _prepare_references(
+            cache,
+            project_root,
+            resolved_config,
+            static=config.static_analysis,
+            max_workers=reference_workers,
+            persistent_worker=persistent_worker,
+        ),
+        after=["cache", "config", "resolution"],
+    )
+    pipeline.add_step(
+        "link pages",
+        lambda cache, inventory: _link_existing_pages(cache, project_root, inventory),
+        after=["cache", "scan"],
+    )
+    pipeline.add_step(
+        "link assets",
+        lambda cache, inventory: _link_static_assets(cache, project_root, inventory),
+        after=["cache", "scan"],
+    )
+    pipeline.add_step(
+        "link index",
+        lambda resolved_config, _: link_first_page_to_index(
+            project_root, resolved_config
+        ),
+        after=["resolution", "link pages"],
+    )
+    pipeline.add_step(
+        "search index",
+        lambda cache, resolved_config, references_fingerprint, _: _build_search_index(
+            cache, project_root, resolved_config, references_fingerprint
+        ),
+        after=["cache", "resolution", "references", "link pages"],
+    )
+
+    results = pipeline.run(max_workers)
+    results["cache"].save()
+    return results["config"], results["resolution"]
+
+
+def _resolve_config(
+    cache: BuildCache, config: Config, project_root: str
+) -> ResolvedConfig:
+    fingerprint = cache.fingerprint(
+        config.model_dump(),
+        cache.hash_file(os.path.join(project_root, CONFIG_FILENAME)),
+        _hash_pages(cache, project_root, _list_pages_in_navigation(config.navigation)),
+    )
+
+    artifact_path = cache.artifact_path(RESOLVED_CONFIG_FILENAME)
+    if cache.is_fresh("resolve", fingerprint) and os.path.exists(artifact_path):
+        try:
+            with open(artifact_path) as file:
+                resolved_config = ResolvedConfig.model_validate_json(file.read())
+        except (OSError, ValidationError) as e:
+            logger.debug(f"Couldn't load cached resolved config: {e}")
+        else:
+            logger.debug("Config unchanged. Skipping resolution.")
+            return resolved_config
+
+    resolved_config = resolve_config(config, project_root=project_root)
+
+    os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+    write_if_changed(artifact_path, resolved_config.model_dump_json())
+    cache.record("resolve", fingerprint)
+
+    return resolved_config
+
+
+def _prepare_references(
+    cache: BuildCache,
+    project_root: str,
+    resolved_config: ResolvedConfig,
+    *,
+    static: bool,
+    max_workers: Optional[int],
+    persistent_worker: bool,
+) -> str:
+    references = list(list_references_in_config(resolved_config))
+    package_names = sorted(
+        {
+            qualname.split(".")[0]
+            for reference in references
+            for qualname in reference.apis
+        }
+    )
+    fingerprint = cache.fingerprint(
+        [reference.model_dump() for reference in references],
+        {name: cache.hash_package(name) for name in package_names},
+        static,
+    )
+
+    node_root = get_node_root(project_root)
+    outputs = [
+        os.path.join(node_root, "data", "apis.json"),
+        cache.artifact_path(REFERENCE_SOURCES_FILENAME),
+    ] + [
+        os.path.join(node_root, "pages", path)
+        for reference in references
+        for path in reference.list_page_paths()
+    ]
+    if cache.is_fresh("references", fingerprint) and all(map(os.path.exists, outputs)):
+        logger.debug("References unchanged. Skipping reference generation.")
+        return fingerprint
+
+    prepare_references(
+        project_root,
+        resolved_config,
+        static=static,
+        max_workers=max_workers,
+        cache_dir=cache.artifact_path(RENDER_CACHE_DIRNAME),
+        persistent_worker=persistent_worker,
+    )
+    cache.record("references", fingerprint)
+    return fingerprint
+
+
+def _link_existing_pages(
+    cache: BuildCache, project_root: str, inventory: ProjectInventory
+) -> None:
+    pages = inventory.pages
+    fingerprint = _fingerprint_links(cache, project_root, "pages", pages)
+    if cache.is_fresh("link-pages", fingerprint):
+        logger.debug("Pages unchanged. Skipping page linking.")
+        return
+
+    link_existing_pages(project_root, pages)
+    # Linking changes the stats of the links, so fingerprint them again.
+    cache.record("link-pages", _fingerprint_links(cache, project_root, "pages", pages))
+
+
+def _link_static_assets(
+    cache: BuildCache, project_root: str, inventory: ProjectInventory
+) -> None:
+    assets = inventory.assets
+    fingerprint = _fingerprint_links(cache, project_root, "public", assets)
+    if cache.is_fresh("link-assets", fingerprint):
+        logger.debug("Static assets unchanged. Skipping asset linking.")
+        return
+
+    link_static_assets(project_root, assets)
+    # Linking changes the stats of the links, so fingerprint them again.
+    cache.record(
+        "link-assets", _fingerprint_links(cache, project_root, "public", assets)
+    )
+
+
+def _fingerprint_links(
+    cache: BuildCache, project_root: str, dirname: str, relative_paths: List[str]
+) -> str:
+    """Fingerprint the sources of hard links in the Node root and the links
+    themselves.
+
+    A link shares its source's inode, so deleting or replacing a link changes the
+    fingerprint too, and the next run recreates it.
+    """
+    node_root = get_node_root(project_root)
+    return cache.fingerprint(
+        cache.stat_files(os.path.join(project_root, path) for path in relative_paths),
+        cache.stat_files(
+            os.path.join(node_root, dirname, path) for path in relative_paths
+        ),
+    )
+
+
+def _build_search_index(
+    cache: BuildCache,
+    project_root: str,
+    resolved_config: ResolvedConfig,
+    references_fingerprint: str,
+) -> None:
+    pages = _list_pages_in_navigation(resolved_config.navigation)
+    fingerprint = cache.fingerprint(
+        resolved_config.model_dump(),
+        _hash_pages(cache, project_root, pages),
+        references_fingerprint,
+    )
+
+    if cache.is_fresh("search-index", fingerprint) and search_index_exists(
+        project_root
+    ):
+        logger.debug("Pages unchanged. Skipping search indexing.")
+        return
+
+    build_search_index(project_root, resolved_config)
+    cache.record("search-index", fingerprint)
+
+
+def _hash_pages(cache: BuildCache, project_root: str, pages: Iterable[str]):
+    return cache.hash_files(os.path.join(project_root, page) for page in pages)
+
+
+def _list_pages_in_navigation(navigation: Iterable) -> Iterable[str]:
+    """Yield the relative paths of the pages in a user-facing or resolved navigation."""
+    for item in navigation:
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, ResolvedPage):
+            yield item.path
+        elif isinstance(item, (Section, Tab, ResolvedSection, ResolvedTab)):
+            yield from _list_pages_in_navigation(item.contents)
@@ -0,0 +1,303 @@
+"""Persistent build cache.
+
+The cache lives in '.luma/cache' and holds a manifest that maps each build phase to a
+fingerprint of the phase's inputs. If the fingerprint of a phase matches the one
+recorded during the previous run, the phase's outputs are still valid and the CLI can
+skip the phase.
+
+Within the reference phase, the `RenderCache` stores each rendered API separately, so
+that changing one docstring only re-renders that API. Similarly, the `PageCache`
+stores the title, frontmatter and headings of each page, so that config resolution
+only reads the pages that changed.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from .bootstrap import get_cli_version
+from .markdown import Heading, scan_markdown_file
+from .node import get_node_root
+from .rst_converter import CONVERTER_VERSION, SETTINGS_OVERRIDES
+from .utils import write_if_changed
+
+MANIFEST_FILENAME = "manifest.json"
+RENDER_CACHE_DIRNAME = "render"
+PAGE_CACHE_FILENAME = "pages.json"
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_root(project_root: str) -> str:
+    return os.path.join(get_node_root(project_root), "cache")
+
+
+class BuildCache:
+    """Fingerprints of the inputs of each build phase.
+
+    File hashes are memoized by modification time and size, so an unchanged file is
+    only read once across runs.
+    """
+
+    def __init__(self, project_root: str):
+        self._root = get_cache_root(project_root)
+        self._path = os.path.join(self._root, MANIFEST_FILENAME)
+        self._version = get_cli_version()
+
+        manifest = self._load_manifest()
+        self._phases: Dict[str, str] = manifest.get("phases", {})
+        self._files: Dict[str, List[Any]] = manifest.get("files", {})
+        self._hashed_paths: Set[str] = set()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self._path):
+            return {}
+
+        try:
+            with open(self._path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable build cache '{self._path}': {e}")
+            return {}
+
+        # Outputs produced by a different version of Luma might not be compatible.
+        if manifest.get("version") != self._version:
+            return {}
+
+        return manifest
+
+    def artifact_path(self, filename: str) -> str:
+        """Return the path of a file stored alongside the manifest."""
+        return os.path.join(self._root, filename)
+
+    def hash_file(self, path: str) -> Optional[str]:
+        """Return the SHA-256 digest of a file, or `None` if the file doesn't exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        self._hashed_paths.add(path)
+        entry = self._files.get(path)
+        if entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return entry[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+
+        self._files[path] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def hash_files(self, paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {path: self.hash_file(path) for path in sorted(paths)}
+
+    def stat_files(self, paths: Iterable[str]) -> Dict[str, Optional[List[int]]]:
+        """Return the inode, modification time and size of each file.
+
+        Hard links stay valid as long as the source file keeps its inode, so these
+        are the inputs of the linking phases.
+        """
+        stats: Dict[str, Optional[List[int]]] = {}
+        for path in sorted(paths):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stats[path] = None
+            else:
+                stats[path] = [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+        return stats
+
+    def hash_package(self, package_name: str) -> Dict[str, Optional[str]]:
+        """Return the digests of all source files of a package without importing it."""
+        try:
+            spec = importlib.util.find_spec(package_name)
+        except (ImportError, ValueError):
+            spec = None
+
+        if spec is None:
+            return {}
+
+        if spec.submodule_search_locations:
+            paths = []
+            for location in spec.submodule_search_locations:
+                for dir_path, dir_names, filenames in os.walk(location):
+                    dir_names[:] = [name for name in dir_names if name != "__pycache__"]
+                    for filename in filenames:
+                        if filename.endswith(".py"):
+                            paths.append(os.path.join(dir_path, filename))
+            return self.hash_files(paths)
+
+        if spec.origin and os.path.isfile(spec.origin):
+            return self.hash_files([spec.origin])
+
+        return {}
+
+    def fingerprint(self, *inputs: Any) -> str:
+        """Combine phase inputs and the Luma version into a single digest."""
+        data = json.dumps([self._version, *inputs], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def is_fresh(self, phase: str, fingerprint: str) -> bool:
+        return self._phases.get(phase) == fingerprint
+
+    def record(self, phase: str, fingerprint: str) -> None:
+        self._phases[phase] = fingerprint
+
+    def save(self) -> None:
+        os.makedirs(self._root, exist_ok=True)
+        manifest = {
+            "version": self._version,
+            "phases": self._phases,
+            # Drop files that weren't inputs of this run, like deleted pages.
+            "files": {
+                path: entry
+                for path, entry in self._files.items()
+                if path in self._hashed_paths
+            },
+        }
+        if write_if_changed(self._path, json.dumps(manifest)):
+            logger.debug(f"Wrote build cache manifest to '{self._path}'")
+
+
+class PageMetadata(NamedTuple):
+    title: Optional[str]
+    metadata: Dict[str, Any]
+    headings: List[Heading]
+
+
+class PageCache:
+    """The titles, frontmatter and headings of pages.
+
+    Entries are keyed by path, modification time and size, so a page is only read
+    again after it changed. Frontmatter values that JSON can't represent, like
+    dates, are stored as strings.
+    """
+
+    def __init__(self, project_root: str):
+        self._path = os.path.join(get_cache_root(project_root), PAGE_CACHE_FILENAME)
+        self._version = get_cli_version()
+        self._entries: Dict[str, List[Any]] = self._load()
+        self._used_paths: Set[str] = set()
+
+    def _load(self) -> Dict[str, List[Any]]:
+        try:
+            with open(self._path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable page cache '{self._path}': {e}")
+            return {}
+
+        # The metadata might have been extracted differently by another version.
+        if data.get("version") != self._version:
+            return {}
+
+        return data.get("pages", {})
+
+    def get(self, path: str) -> Optional[PageMetadata]:
+        """Return the metadata of a page, or `None` if the page doesn't exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        self._used_paths.add(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            title, metadata, headings = entry[2:]
+            return PageMetadata(title, metadata, [Heading(*item) for item in headings])
+
+        page = scan_markdown_file(path)
+        self._entries[path] = [
+            stat.st_mtime_ns,
+            stat.st_size,
+            page.title,
+            page.metadata,
+            page.headings,
+        ]
+        return PageMetadata(page.title, page.metadata, page.headings)
+
+    def save(self) -> None:
+        # Drop pages that weren't read during this run, like deleted pages.
+        pages = {
+            path: entry
+            for path, entry in self._entries.items()
+            if path in self._used_paths
+        }
+        data = json.dumps({"version": self._version, "pages": pages}, default=str)
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            if write_if_changed(self._path, data):
+                logger.debug(f"Wrote page cache to '{self._path}'")
+        except OSError as e:
+            logger.debug(f"Couldn't write page cache '{self._path}': {e}")
+
+
+class RenderCache:
+    """Content-addressed cache of rendered APIs.
+
+    Each entry is a JSON file in '.luma/cache/render' named after the digest of its
+    key. Keys include the Luma version and the converter settings, so entries written
+    by an older converter are never read. Several processes can share the cache.
+    """
+
+    def __init__(self, root: str):
+        self._root = root
+        self._salt = [
+            get_cli_version(),
+            # The formatting of defaults and annotations depends on the interpreter.
+            sys.version,
+            CONVERTER_VERSION,
+            SETTINGS_OVERRIDES,
+        ]
+
+    def key(self, *inputs: Any) -> str:
+        data = json.dumps([*self._salt, *inputs], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(key)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable render cache entry '{key}': {e}")
+            return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self._root, exist_ok=True)
+        # Write to a temporary file first so that concurrent readers never see a
+        # partially written entry.
+        fd, temp_path = tempfile.mkstemp(dir=self._root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry, file)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def prune(self, keys: Iterable[str]) -> None:
+        """Delete all entries except the ones with the given keys."""
+        filenames = {f"{key}.json" for key in keys}
+        try:
+            existing = os.listdir(self._root)
+        except FileNotFoundError:
+            return
+
+        for filename in existing:
+            if filename not in filenames:
+                logger.debug(f"Removing stale render cache entry '{filename}'")
+                os.unlink(os.path.join(self._root, filename))
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._root, f"{key}.json")
@@ -17,6 +17,7 @@ from .user_config import (
     Page,
     Reference,
     Section,
+    Tab,
     create_or_update_config,
     load_config,
 )
@@ -30,6 +31,7 @@ __all__ = [
     "Page",
     "Reference",
     "Section",
+    "Tab",
     "create_or_update_config",
     "load_config",
     # Resolved config
@@ -5,11 +5,10 @@ resolved paths, and validated references.
 """
 
 import os
-import re
-from typing import Optional
-
-import frontmatter
+from typing import Optional, Union
 
+from ..cache import PageCache, PageMetadata
+from ..markdown import MarkdownPage, scan_markdown_file
 from .resolved_config import (
     ResolvedConfig,
     ResolvedLink,
@@ -34,6 +33,9 @@ from .user_config import (
 def resolve_config(config: Config, project_root: str) -> ResolvedConfig:
     """Convert user config to resolved config.
 
+    The titles of pages are cached in the project's '.luma/cache', so only the pages
+    that changed since the previous resolution are read.
+
     Args:
         config: The user-facing config
         project_root: The project root directory
@@ -41,10 +43,12 @@ def resolve_config(config: Config, project_root: str) -> ResolvedConfig:
     Returns:
         The resolved config with inferred titles and validated references
     """
+    page_cache = PageCache(project_root)
     resolved_navigation = [
-        _resolve_navigation_item(item, project_root, section=None)
+        _resolve_navigation_item(item, project_root, None, page_cache)
         for item in config.navigation
     ]
+    page_cache.save()
 
     resolved_socials = None
     if config.socials is not None:
@@ -59,7 +63,10 @@ def resolve_config(config: Config, project_root: str) -> ResolvedConfig:
 
 
 def _resolve_navigation_item(
-    item: NavigationItem, project_root: str, section: Optional[str]
+    item: NavigationItem,
+    project_root: str,
+    section: Optional[str],
+    page_cache: PageCache,
 ):
     """Resolve a single navigation item.
 
@@ -67,20 +74,21 @@ def _resolve_navigation_item(
         item: The navigation item to resolve
         project_root: The project root directory
         section: The section name if this item is inside a section, None otherwise
+        page_cache: The cache to read the titles of pages from
 
     Returns:
         The resolved navigation item
     """
     if isinstance(item, Page):
-        return resolve_page(item, project_root, section=section)
+        return resolve_page(item, project_root, section=section, page_cache=page_cache)
     elif isinstance(item, Link):
         return _resolve_link(item)
     elif isinstance(item, Section):
-        return _resolve_section(item, project_root)
+        return _resolve_section(item, project_root, page_cache)
     elif isinstance(item, Reference):
         return _resolve_reference(item, section=section)
     elif isinstance(item, Tab):
-        return _resolve_tab(item, project_root)
+        return _resolve_tab(item, project_root, page_cache)
     else:
         assert False, item
 
@@ -103,35 +111,39 @@ def _resolve_link(link: Link) -> ResolvedLink:
     return ResolvedLink(href=href, title=title)
 
 
-def _resolve_section(section: Section, project_root: str) -> ResolvedSection:
+def _resolve_section(
+    section: Section, project_root: str, page_cache: PageCache
+) -> ResolvedSection:
     """Resolve a section navigation item.
 
     Args:
         section: The section to resolve
         project_root: The project root directory
+        page_cache: The cache to read the titles of pages from
 
     Returns:
         The resolved section with resolved contents
     """
     resolved_contents = [
-        _resolve_navigation_item(item, project_root, section=section.section)
+        _resolve_navigation_item(item, project_root, section.section, page_cache)
         for item in section.contents
     ]
     return ResolvedSection(title=section.section, contents=resolved_contents)
 
 
-def _resolve_tab(tab: Tab, project_root: str) -> ResolvedTab:
+def _resolve_tab(tab: Tab, project_root: str, page_cache: PageCache) -> ResolvedTab:
     """Resolve a tab navigation item.
 
     Args:
         tab: The tab to resolve
         project_root: The project root directory
+        page_cache: The cache to read the titles of pages from
 
     Returns:
         The resolved tab with resolved contents
     """
     resolved_contents = [
-        _resolve_navigation_item(item, project_root, section=None)
+        _resolve_navigation_item(item, project_root, None, page_cache)
         for item in tab.contents
     ]
     return ResolvedTab(title=tab.tab, contents=resolved_contents)
@@ -155,11 +167,16 @@ def _resolve_reference(
         relative_path=relative_path,
         apis=reference.apis,
         section=section,
+        split=reference.split,
     )
 
 
 def resolve_page(
-    relative_path: str, project_root: str, *, section: Optional[str] = None
+    relative_path: str,
+    project_root: str,
+    *,
+    section: Optional[str] = None,
+    page_cache: Optional[PageCache] = None,
 ) -> ResolvedPage:
     """Resolve a page navigation item.
 
@@ -167,6 +184,7 @@ def resolve_page(
         relative_path: The relative path to the page
         project_root: The project root directory
         section: The section name if this page is inside a section, None otherwise
+        page_cache: The cache to read the title from. By default, the page is read.
 
     Returns:
         The resolved page with inferred title
@@ -175,29 +193,32 @@ def resolve_page(
         ValueError: If the page doesn't exist
     """
     local_path = os.path.join(project_root, relative_path)
-    if not os.path.exists(local_path):
+    if page_cache is not None:
+        page = page_cache.get(local_path)
+    elif os.path.exists(local_path):
+        page = scan_markdown_file(local_path)
+    else:
+        page = None
+
+    if page is None:
         raise ValueError(
             f"Page at '{relative_path}' doesn't exist in project root '{project_root}'"
         )
 
-    title = _infer_title(local_path)
+    title = _infer_title(page)
     return ResolvedPage(title=title, path=relative_path, section=section)
 
 
-def _infer_title(local_path: str) -> str:
+def _infer_title(page: Union[MarkdownPage, PageMetadata]) -> str:
     """Infer the title of a page from its frontmatter or first heading.
 
     Args:
-        local_path: The local path to the page
+        page: The scanned page or its cached metadata
 
     Returns:
         The inferred title, or "Untitled Page" if no title is found
     """
-    post = frontmatter.load(local_path)
-    title = post.metadata.get("title", None)
-
-    if title is None:
-        title = _get_first_heading(local_path)
+    title = page.title
 
     if title is None:
         title = "Untitled Page"
@@ -205,23 +226,6 @@ def _infer_title(local_path: str) -> str:
     return title
 
 
-def _get_first_heading(local_path: str) -> Optional[str]:
-    """Get the first heading from a markdown file.
-
-    Args:
-        local_path: The local path to the markdown file
-
-    Returns:
-        The first heading text, or None if no heading is found
-    """
-    with open(local_path, "r", encoding="utf-8") as f:
-        for line in f:
-            match = re.match(r"^(#{1,6})\s+(.*)", line.strip())
-            if match:
-                return match.group(2)  # the heading text
-    return None
-
-
 def _resolve_socials(socials: list[Social]) -> list[ResolvedSocial]:
     """Convert user-provided socials to resolved socials.
 
@@ -33,6 +33,21 @@ class ResolvedReference(BaseModel):
     relative_path: str
     apis: List[str]
     section: Optional[str] = None
+    # If true, each API gets its own page under the reference's path, and the
+    # reference's page lists them.
+    split: bool = False
+
+    def get_api_path(self, qualname: str) -> str:
+        """Return the relative path of the page that documents an API."""
+        if not self.split:
+            return self.relative_path
+        return f"{self.relative_path[:-3]}/{qualname}.md"
+
+    def list_page_paths(self) -> List[str]:
+        """Return the relative paths of the pages Luma generates for the reference."""
+        if not self.split:
+            return [self.relative_path]
+        return [self.relative_path] + [self.get_api_path(api) for api in self.apis]
 
 
 class ResolvedSection(BaseModel):
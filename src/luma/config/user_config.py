@@ -3,13 +3,17 @@
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 import yaml
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, ValidationInfo, model_validator
 
+from ..profiling import profile_phase
 from .validation import validate_favicon_exists, validate_page_exists
 
+if TYPE_CHECKING:
+    from ..scanner import ProjectInventory
+
 CONFIG_FILENAME = "luma.yaml"
 SUPPORTED_SOCIAL_PLATFORMS = {"discord", "github", "twitter", "slack"}
 
@@ -23,6 +27,10 @@ Social = Dict[str, str]  # Maps platform name to URL
 class Reference(BaseModel):
     reference: str
     apis: List[str]
+    # Whether to give each API its own page. Large references load faster split,
+    # because Next.js compiles and ships each page as a unit, but splitting changes
+    # the URLs of the APIs, so it's opt-in.
+    split: bool = False
 
 
 class Link(BaseModel):
@@ -48,6 +56,10 @@ class Config(BaseModel):
     favicon: Optional[str] = None
     navigation: List[NavigationItem]
     socials: Optional[List[Social]] = None
+    # If true, Luma reads API references from source code instead of importing the
+    # package. This is faster for packages with heavy imports, but can't see
+    # inherited or dynamically created members.
+    static_analysis: bool = False
 
     # We manually add this field when we read the config file. The user can't specify
     # it.
@@ -62,14 +74,17 @@ class Config(BaseModel):
         return self
 
     @model_validator(mode="after")
-    def validate_pages_exist(self):
+    def validate_pages_exist(self, info: ValidationInfo):
+        # `load_config` passes the project inventory through the validation context
+        # when it has one, so that we don't need to check every page on disk.
+        inventory = info.context.get("inventory") if info.context else None
         for item in self.navigation:
             if isinstance(item, str):
-                validate_page_exists(item, self.project_root)
+                validate_page_exists(item, self.project_root, inventory)
             elif isinstance(item, Section):
                 for subitem in item.contents:
                     if isinstance(subitem, str):
-                        validate_page_exists(subitem, self.project_root)
+                        validate_page_exists(subitem, self.project_root, inventory)
 
         return self
 
@@ -95,7 +110,24 @@ class Config(BaseModel):
         return self
 
 
-def load_config(dir: str) -> Config:
+def load_config(
+    dir: str,
+    inventory: Optional["ProjectInventory"] = None,
+    persistent_worker: bool = False,
+) -> Config:
+    """Load and validate the config of the project that contains a directory.
+
+    Args:
+        dir: The project root or one of its subdirectories
+        inventory: The scanned project files. If provided, Luma uses it to validate
+            that pages exist instead of checking each one on disk.
+        persistent_worker: Whether to import API references in the project's
+            persistent worker instead of in this process. This process then never
+            imports the documented package.
+
+    Returns:
+        The validated config
+    """
     assert os.path.isdir(dir), f"'dir' must be a directory: '{dir}'"
 
     project_root = _discover_project_root(dir)
@@ -115,12 +147,13 @@ def load_config(dir: str) -> Config:
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing config file: {e}")
 
-    config = Config.model_validate(config_data)
+    with profile_phase("validation"):
+        config = Config.model_validate(config_data, context={"inventory": inventory})
 
-    # Perform validation after Pydantic parsing
-    from .validation import validate_config
+        # Perform validation after Pydantic parsing
+        from .validation import validate_config
 
-    validate_config(config)
+        validate_config(config, inventory, persistent_worker)
 
     return config
 
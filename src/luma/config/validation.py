@@ -2,11 +2,13 @@
 
 import logging
 import os
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from ..scanner import classify_path, load_ignore_spec
 from ..utils import get_module_and_relative_name, get_obj
 
 if TYPE_CHECKING:
+    from ..scanner import ProjectInventory
     from .user_config import Config
 
 logger = logging.getLogger(__name__)
@@ -14,19 +16,27 @@ logger = logging.getLogger(__name__)
 SUPPORTED_SOCIAL_PLATFORMS = {"discord", "github", "twitter", "slack"}
 
 
-def validate_page_exists(path: str, project_root: str) -> None:
+def validate_page_exists(
+    path: str, project_root: str, inventory: Optional["ProjectInventory"] = None
+) -> None:
     """Validate that a page file exists and is a markdown file.
 
     Args:
         path: The relative path to the page
         project_root: The project root directory
+        inventory: The scanned project files. If the scan found the page, Luma
+            doesn't need to check the file system.
 
     Raises:
-        ValueError: If the page doesn't exist or isn't a markdown file
+        ValueError: If the page doesn't exist, isn't a markdown file, or is in a
+            directory that the scan skips
     """
     if path.startswith(("http://", "https://")):
         return
 
+    if inventory is not None and inventory.has_page(path):
+        return
+
     local_path = os.path.join(project_root, path)
     if not os.path.exists(local_path):
         raise ValueError(
@@ -40,6 +50,14 @@ def validate_page_exists(path: str, project_root: str) -> None:
             "Markdown file. Luma only supports Markdown files."
         )
 
+    # The page exists but the scan skipped it, so it would never be linked.
+    if classify_path(load_ignore_spec(project_root), path) != "page":
+        raise ValueError(
+            f"Your config references a page at '{path}', but the page is in a "
+            "directory that '.gitignore' ignores, so Luma doesn't publish it. Move the "
+            "page or stop ignoring its directory."
+        )
+
 
 def validate_favicon_exists(favicon_path: str, project_root: str) -> None:
     """Validate that a favicon file exists.
@@ -80,7 +98,7 @@ def validate_api_reference(qualname: str) -> None:
 
     try:
         get_obj(module, relative_name)
-    except AttributeError:
+    except (AttributeError, ValueError):
         raise ValueError(
             f"Your config references '{qualname}'. Luma imported the module "
             f"'{module.__name__}', but couldn't get the object '{relative_name}'. Are "
@@ -88,6 +106,27 @@ def validate_api_reference(qualname: str) -> None:
         )
 
 
+def validate_api_reference_statically(qualname: str) -> None:
+    """Validate that the module of an API reference exists, without importing it.
+
+    Args:
+        qualname: The fully qualified name of the API object
+
+    Raises:
+        ValueError: If no module in the qualified name can be found
+    """
+    # Import here to avoid circular imports
+    from ..static_parser import split_qualname
+
+    if split_qualname(qualname) is None:
+        package_name = qualname.split(".")[0]
+        raise ValueError(
+            f"Your config references '{qualname}', but Luma couldn't find the source "
+            f"code of the package '{package_name}'. Make sure the module is installed "
+            "in the current environment."
+        )
+
+
 def validate_socials(socials: List[Dict[str, str]]) -> None:
     """Validate social media platform entries.
 
@@ -112,25 +151,65 @@ def validate_socials(socials: List[Dict[str, str]]) -> None:
             )
 
 
-def validate_references(apis: List[str]) -> None:
+def validate_references(
+    apis: List[str], static: bool = False, worker_root: Optional[str] = None
+) -> None:
     """Validate a list of API references.
 
     Args:
         apis: List of fully qualified API names
+        static: Whether to validate the references without importing them
+        worker_root: If given, import the references in the persistent worker of
+            this project instead of in this process
 
     Raises:
         ValueError: If any API reference is invalid
     """
+    if worker_root is not None and not static:
+        _validate_references_in_worker(apis, worker_root)
+        return
+
     for qualname in apis:
-        validate_api_reference(qualname)
+        if static:
+            validate_api_reference_statically(qualname)
+        else:
+            validate_api_reference(qualname)
+
+
+def _validate_references_in_worker(apis: List[str], project_root: str) -> None:
+    # Imported here because only the persistent worker needs it.
+    from ..worker import WorkerError, validate_in_worker
+
+    try:
+        errors = validate_in_worker(project_root, apis)
+    except WorkerError as e:
+        # Importing the package here is what the worker is meant to avoid.
+        logger.warning(f"{e} Checking API references without importing them instead.")
+        for qualname in apis:
+            validate_api_reference_statically(qualname)
+        return
+
+    for error in errors:
+        if error is not None:
+            raise ValueError(error)
 
 
-def validate_navigation(navigation: List[Any], project_root: str) -> None:
+def validate_navigation(
+    navigation: List[Any],
+    project_root: str,
+    static: bool = False,
+    inventory: Optional["ProjectInventory"] = None,
+    persistent_worker: bool = False,
+) -> None:
     """Validate all navigation items.
 
     Args:
         navigation: List of navigation items (can be strings, Sections, References, or Links)
         project_root: The project root directory
+        static: Whether to validate API references without importing them
+        inventory: The scanned project files, if available
+        persistent_worker: Whether to import API references in the project's
+            persistent worker instead of in this process
 
     Raises:
         ValueError: If any navigation item is invalid
@@ -138,24 +217,32 @@ def validate_navigation(navigation: List[Any], project_root: str) -> None:
     # Import here to avoid circular imports
     from .user_config import Reference, Section
 
+    worker_root = project_root if persistent_worker else None
     for item in navigation:
         if isinstance(item, str):
-            validate_page_exists(item, project_root)
+            validate_page_exists(item, project_root, inventory)
         elif isinstance(item, Section):
             for subitem in item.contents:
                 if isinstance(subitem, str):
-                    validate_page_exists(subitem, project_root)
+                    validate_page_exists(subitem, project_root, inventory)
                 elif isinstance(subitem, Reference):
-                    validate_references(subitem.apis)
+                    validate_references(subitem.apis, static, worker_root)
         elif isinstance(item, Reference):
-            validate_references(item.apis)
+            validate_references(item.apis, static, worker_root)
 
 
-def validate_config(config: "Config") -> None:
+def validate_config(
+    config: "Config",
+    inventory: Optional["ProjectInventory"] = None,
+    persistent_worker: bool = False,
+) -> None:
     """Validate an entire config object.
 
     Args:
         config: The config object to validate
+        inventory: The scanned project files, if available
+        persistent_worker: Whether to import API references in the project's
+            persistent worker instead of in this process
 
     Raises:
         ValueError: If any part of the config is invalid
@@ -165,7 +252,13 @@ def validate_config(config: "Config") -> None:
         validate_favicon_exists(config.favicon, config.project_root)
 
     # Validate navigation
-    validate_navigation(config.navigation, config.project_root)
+    validate_navigation(
+        config.navigation,
+        config.project_root,
+        config.static_analysis,
+        inventory,
+        persistent_worker,
+    )
 
     # Validate socials if present
     if config.socials is not None:
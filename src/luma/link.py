@@ -1,113 +1,229 @@
 import json
 import logging
 import os
-from pathlib import Path
-
-from pathspec import PathSpec
-from watchdog.events import FileSystemEventHandler
-from watchdog.observers import Observer
+import threading
+from typing import Dict, List, Optional
 
+from .cache import get_cache_root
 from .config import ResolvedConfig
 from .node import get_node_root
+from .scanner import scan_project
+from .utils import write_if_changed
+
+# Lives in the cache directory, next to the build cache manifest.
+LINK_MANIFEST_FILENAME = "links.json"
 
-STATIC_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".ico", ".svg")
 logger = logging.getLogger(__name__)
 
+# Pages are linked from the pipeline's threads and from the file watcher.
+_manifest_lock = threading.Lock()
+
 
 def link_config(resolved_config: ResolvedConfig, project_root: str):
     dst = os.path.join(get_node_root(project_root), "data", "config.json")
     data = resolved_config.model_dump()
-    with open(dst, "w") as file:
-        logger.debug(f"Writing `ResolvedConfig` object to {dst!r}")
-        file.write(json.dumps(data, sort_keys=False))
-
-
-def link_existing_pages(project_root: str):
-    for dir_path, _, filenames in os.walk(project_root):
-        for filename in filenames:
-            if not filename.endswith(".md"):
+    if write_if_changed(dst, json.dumps(data, sort_keys=False)):
+        logger.debug(f"Wrote `ResolvedConfig` object to {dst!r}")
+
+
+def link_existing_pages(project_root: str, pages: Optional[List[str]] = None):
+    """Hard link the project's pages into the Next.js app.
+
+    Links that are still valid are left alone, and links to pages that no longer
+    exist are removed.
+
+    Args:
+        project_root: The project root directory
+        pages: The paths of all pages relative to the project root. If `None`, Luma
+            scans the project for them.
+    """
+    if pages is None:
+        pages = scan_project(project_root).pages
+
+    _sync_links(project_root, "pages", {os.path.join("pages", p): p for p in pages})
+
+
+def link_page(project_root: str, relative_path: str):
+    """Hard link a single page into the Next.js app if it isn't linked already."""
+    _sync_links(
+        project_root,
+        "pages",
+        {os.path.join("pages", relative_path): relative_path},
+        prune=False,
+    )
+
+
+def unlink_page(project_root: str, relative_path: str):
+    """Remove the link to a page that was deleted or moved."""
+    _remove_links(project_root, "pages", [os.path.join("pages", relative_path)])
+
+
+def link_static_assets(project_root: str, assets: Optional[List[str]] = None):
+    """Hard link the project's static assets into the Next.js app's public directory.
+
+    Args:
+        project_root: The project root directory
+        assets: The paths of all static assets relative to the project root. If
+            `None`, Luma scans the project for them.
+    """
+    if assets is None:
+        assets = scan_project(project_root).assets
+
+    _sync_links(project_root, "public", {os.path.join("public", a): a for a in assets})
+
+
+def link_static_asset(project_root: str, relative_path: str):
+    """Hard link a single static asset into the Next.js app if it isn't linked yet."""
+    _sync_links(
+        project_root,
+        "public",
+        {os.path.join("public", relative_path): relative_path},
+        prune=False,
+    )
+
+
+def unlink_static_asset(project_root: str, relative_path: str):
+    """Remove the link to a static asset that was deleted or moved."""
+    _remove_links(project_root, "public", [os.path.join("public", relative_path)])
+
+
+def _sync_links(
+    project_root: str, group: str, links: Dict[str, str], prune: bool = True
+) -> None:
+    """Create the hard links that are missing or stale, and remove the ones that aren't
+    wanted anymore.
+
+    Relinking a file that's already linked triggers a rebuild in Next.js, so Luma
+    records the links it creates in a manifest and only touches the ones that changed.
+
+    Args:
+        project_root: The project root directory
+        group: The manifest section for the links. Pruning only removes links from
+            the same group.
+        links: Maps each destination, relative to the Node root, to its source,
+            relative to the project root
+        prune: Whether to remove the group's links that aren't in `links`
+    """
+    node_root = get_node_root(project_root)
+    with _manifest_lock:
+        manifest = _load_link_manifest(project_root)
+        previous = manifest.get(group, {})
+        current = {} if prune else dict(previous)
+
+        created = 0
+        for relative_dst, relative_src in links.items():
+            src = os.path.join(project_root, relative_src)
+            dst = os.path.join(node_root, relative_dst)
+            try:
+                src_stat = os.stat(src)
+            except FileNotFoundError:
+                logger.warning(f"Can't link '{src}' because it doesn't exist.")
                 continue
 
-            file_path = os.path.join(dir_path, filename)
-            relative_path = os.path.relpath(file_path, project_root)
-            if relative_path.startswith(".luma"):
-                continue
-
-            _link_page(project_root, relative_path)
-
-
-def _link_page(project_root: str, relative_path: str):
-    src = os.path.join(project_root, relative_path)
-    dst = os.path.join(get_node_root(project_root), "pages", relative_path)
-
+            # A hard link shares its content with the source, so edits don't
+            # invalidate it. Only a new inode, like after an editor replaces the file,
+            # does.
+            if not _is_linked(dst, src_stat):
+                _link(src, dst)
+                created += 1
+            current[relative_dst] = [
+                relative_src,
+                src_stat.st_ino,
+                src_stat.st_mtime_ns,
+            ]
+
+        removed = 0
+        if prune:
+            for relative_dst, (_, inode, _) in previous.items():
+                if relative_dst not in current and _remove_link(
+                    os.path.join(node_root, relative_dst), inode
+                ):
+                    removed += 1
+
+        manifest[group] = current
+        if current != previous:
+            _save_link_manifest(project_root, manifest)
+
+    logger.debug(
+        f"Linked {created} and removed {removed} files in '{group}'. "
+        f"{len(links) - created} links were already up to date."
+    )
+
+
+def _remove_links(project_root: str, group: str, relative_dsts: List[str]) -> None:
+    node_root = get_node_root(project_root)
+    with _manifest_lock:
+        manifest = _load_link_manifest(project_root)
+        links = manifest.get(group, {})
+        removed = [dst for dst in relative_dsts if dst in links]
+        for relative_dst in removed:
+            _, inode, _ = links.pop(relative_dst)
+            _remove_link(os.path.join(node_root, relative_dst), inode)
+
+        if removed:
+            _save_link_manifest(project_root, manifest)
+
+
+def _is_linked(dst: str, src_stat: os.stat_result) -> bool:
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    return (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino)
+
+
+def _link(src: str, dst: str) -> None:
     if os.path.exists(dst):
         os.remove(dst)
 
-    logger.debug(f"Linking page from '{src}' to '{dst}'")
+    logger.debug(f"Linking file from '{src}' to '{dst}'")
     os.makedirs(os.path.dirname(dst), exist_ok=True)
     os.link(src, dst)
 
 
-def link_static_assets(project_root: str):
-    ignore_spec = _load_ignore_spec(project_root)
-
-    for dir_path, _, filenames in os.walk(project_root):
-        for filename in filenames:
-            if not filename.endswith(STATIC_EXTENSIONS):
-                continue
+def _remove_link(dst: str, inode: int) -> bool:
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
 
-            file_path = os.path.join(dir_path, filename)
-            relative_path = os.path.relpath(file_path, project_root)
-            if relative_path.startswith(".luma"):
-                continue
+    # Leave the file alone if something else, like reference generation, has written
+    # to the same path since Luma linked it.
+    if dst_stat.st_ino != inode:
+        return False
 
-            if not ignore_spec or not ignore_spec.match_file(relative_path):
-                _link_static_asset(project_root, relative_path)
+    logger.debug(f"Removing stale link '{dst}'")
+    os.remove(dst)
+    return True
 
 
-def _load_ignore_spec(project_root: str):
-    ignore_path = os.path.join(project_root, ".gitignore")
+def _get_link_manifest_path(project_root: str) -> str:
+    return os.path.join(get_cache_root(project_root), LINK_MANIFEST_FILENAME)
 
-    if not os.path.exists(ignore_path):
-        logger.debug("No .gitignore found")
-        return None
 
-    with open(ignore_path, "r") as file:
-        return PathSpec.from_lines("gitwildmatch", file)
+def _load_link_manifest(project_root: str) -> Dict[str, Dict[str, List]]:
+    path = _get_link_manifest_path(project_root)
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable link manifest '{path}': {e}")
+        return {}
 
 
-def _link_static_asset(project_root: str, relative_path: str):
-    src = os.path.join(project_root, relative_path)
-    dst = os.path.join(get_node_root(project_root), "public", relative_path)
-
-    if os.path.exists(dst):
-        os.remove(dst)
-
-    logger.debug(f"Linking file from '{src}' to '{dst}'")
-    os.makedirs(os.path.dirname(dst), exist_ok=True)
-    os.link(src, dst)
-
-
-def link_page_on_creation(project_root: str):
-    event_handler = _FileLinker(project_root)
-    observer = Observer()
-    observer.daemon = True
-    observer.schedule(event_handler, path=project_root, recursive=True)
-    observer.start()
+def _save_link_manifest(
+    project_root: str, manifest: Dict[str, Dict[str, List]]
+) -> None:
+    path = _get_link_manifest_path(project_root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_if_changed(path, json.dumps(manifest))
 
 
 def link_first_page_to_index(project_root: str, config: ResolvedConfig):
     first_page = _get_first_page_path(config.navigation)
-
-    src = os.path.join(project_root, first_page)
-    dst = os.path.join(get_node_root(project_root), "pages", "index.md")
-
-    if os.path.exists(dst):
-        os.remove(dst)
-
-    logger.debug(f"Linking page from '{src}' to '{dst}'")
-    os.makedirs(os.path.dirname(dst), exist_ok=True)
-    os.link(src, dst)
+    _sync_links(project_root, "index", {os.path.join("pages", "index.md"): first_page})
 
 
 def _get_first_page_path(items):
@@ -120,17 +236,3 @@ def _get_first_page_path(items):
             return _get_first_page_path(item.contents)
         elif item.type == "reference":
             return item.relative_path
-
-
-class _FileLinker(FileSystemEventHandler):
-    def __init__(self, project_root: str):
-        self._project_root = Path(project_root)
-
-    def on_created(self, event):
-        if not event.is_directory:
-            relative_path = Path(event.src_path).relative_to(self._project_root)
-            if str(relative_path).startswith(".luma") or not str(
-                relative_path
-            ).endswith(".md"):
-                return
-            _link_page(self._project_root, relative_path)
@@ -8,11 +8,8 @@ from typing_extensions import Annotated
 from rich.console import Console
 
 from .bootstrap import download_or_update_scaffold, download_starter_files
-from .config import (
-    create_or_update_config,
-    load_config,
-    resolve_config,
-)
+from .build import prepare_project
+from .config import create_or_update_config, resolve_config
 from .deploy import (
     build_project,
     cleanup_build,
@@ -22,21 +19,22 @@ from .deploy import (
 from .link import (
     link_config,
     link_existing_pages,
-    link_first_page_to_index,
-    link_page_on_creation,
     link_static_assets,
 )
 from .node import get_node_root, is_node_installed, run_node_dev
-from .parser import prepare_references
+from .profiling import profile_phase, profiling
+from .scanner import scan_project
 from .search import build_search_index
 from .utils import get_project_root
+from .watcher import watch_project
+from .worker import stop_worker
 
 app = typer.Typer()
 logger = logging.getLogger(__name__)
 
 
 @app.command()
-def init():
+def init(profile: Annotated[bool, typer.Option("--profile")] = False):
     if not is_node_installed():
         logger.error(
             "Luma depends on Node.js. Make sure it's installed in the current "
@@ -46,76 +44,98 @@ def init():
 
     package_name = typer.prompt("What's the name of your package?")
 
-    try:
-        importlib.import_module(package_name)
-    except ImportError:
-        logger.error(
-            f"Luma couldn't import a package named '{package_name}'. Make sure it's "
-            "installed in the current environment."
-        )
-        raise typer.Exit(1)
-
-    project_root = os.path.join(os.getcwd(), "docs/")
-    node_root = get_node_root(project_root)
-
-    logger.info(f"Initializing project directory to '{project_root}'.")
-    download_starter_files(project_root)
-    download_or_update_scaffold(node_root)
-
-    config = create_or_update_config(project_root, package_name)
-    resolved_config = resolve_config(config, project_root=project_root)
-    link_config(resolved_config, project_root)
-    link_existing_pages(project_root)
-    link_static_assets(project_root)
-    build_search_index(project_root, resolved_config)
+    with profiling(profile, os.getcwd()):
+        try:
+            with profile_phase("import package"):
+                importlib.import_module(package_name)
+        except ImportError:
+            logger.error(
+                f"Luma couldn't import a package named '{package_name}'. Make sure "
+                "it's installed in the current environment."
+            )
+            raise typer.Exit(1)
+
+        project_root = os.path.join(os.getcwd(), "docs/")
+        node_root = get_node_root(project_root)
+
+        logger.info(f"Initializing project directory to '{project_root}'.")
+        with profile_phase("starter files"):
+            download_starter_files(project_root)
+        with profile_phase("scaffold"):
+            download_or_update_scaffold(node_root)
+
+        with profile_phase("config"):
+            config = create_or_update_config(project_root, package_name)
+        with profile_phase("resolution"):
+            resolved_config = resolve_config(config, project_root=project_root)
+        with profile_phase("linking"):
+            inventory = scan_project(project_root)
+            link_config(resolved_config, project_root)
+            link_existing_pages(project_root, inventory.pages)
+            link_static_assets(project_root, inventory.assets)
+        with profile_phase("search index"):
+            build_search_index(project_root, resolved_config)
 
 
 @app.command()
-def dev(port: Annotated[Optional[int], typer.Option()] = None):
+def dev(
+    port: Annotated[Optional[int], typer.Option()] = None,
+    profile: Annotated[bool, typer.Option("--profile")] = False,
+    workers: Annotated[Optional[int], typer.Option("--workers", min=1)] = None,
+    persistent_worker: Annotated[bool, typer.Option("--persistent-worker")] = False,
+):
     project_root = get_project_root()
 
-    node_root = get_node_root(project_root)
-    download_or_update_scaffold(node_root)
-
-    config = load_config(project_root)
-    resolved_config = resolve_config(config, project_root=project_root)
-    link_config(resolved_config, project_root)
-    prepare_references(project_root, resolved_config)
-
-    link_existing_pages(project_root)
-    link_static_assets(project_root)
-    link_first_page_to_index(project_root, resolved_config)
-    build_search_index(project_root, resolved_config)
-    link_page_on_creation(project_root)
+    with profiling(profile, project_root):
+        config, resolved_config = prepare_project(
+            project_root,
+            reference_workers=workers,
+            persistent_worker=persistent_worker,
+        )
+        watch_project(
+            project_root,
+            config,
+            resolved_config,
+            persistent_worker=persistent_worker,
+        )
 
     run_node_dev(project_root, port)
 
 
 @app.command()
-def deploy(version: Annotated[Optional[str], typer.Option("--version", "-v")] = None):
+def deploy(
+    version: Annotated[Optional[str], typer.Option("--version", "-v")] = None,
+    profile: Annotated[bool, typer.Option("--profile")] = False,
+    workers: Annotated[Optional[int], typer.Option("--workers", min=1)] = None,
+    persistent_worker: Annotated[bool, typer.Option("--persistent-worker")] = False,
+):
     project_root = get_project_root()
 
-    node_root = get_node_root(project_root)
-    download_or_update_scaffold(node_root)
-
-    config = load_config(os.getcwd())
-    resolved_config = resolve_config(config, project_root=project_root)
-    prepare_references(project_root, resolved_config)
-
-    link_config(resolved_config, project_root)
-    link_existing_pages(project_root)
-    link_static_assets(project_root)
-    link_first_page_to_index(project_root, resolved_config)
-    build_search_index(project_root, resolved_config)
+    with profiling(profile, project_root):
+        node_root = get_node_root(project_root)
+        config, _ = prepare_project(
+            project_root,
+            reference_workers=workers,
+            persistent_worker=persistent_worker,
+        )
 
-    console = Console()
-    with console.status("Deploying project..."):
-        try:
-            build_path = build_project(node_root)
-            deploy_project(build_path, config.name, version)
-            monitor_deployment(config.name, console)
-        finally:
-            cleanup_build(build_path)
+        console = Console()
+        with console.status("Deploying project..."):
+            try:
+                with profile_phase("zip build"):
+                    build_path = build_project(node_root)
+                with profile_phase("upload"):
+                    deploy_project(build_path, config.name, version)
+                with profile_phase("polling"):
+                    monitor_deployment(config.name, console)
+            finally:
+                cleanup_build(build_path)
+
+
+@app.command("stop-worker")
+def stop_persistent_worker():
+    """Stop the worker that `--persistent-worker` started for this project."""
+    stop_worker(get_project_root())
 
 
 def main():
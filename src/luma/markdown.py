@@ -0,0 +1,183 @@
+"""Scan Markdown pages in a single pass.
+
+Title inference, search indexing and the table of contents all need the frontmatter,
+headings and text of every page. `scan_markdown_file` extracts all of them while it
+reads the page one line at a time, and it tracks code fences so that a `# comment` in
+a code block isn't a heading.
+"""
+
+import itertools
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from frontmatter.default_handlers import YAMLHandler
+
+# Up to three spaces of indentation are allowed before fences and headings.
+_FENCE_PATTERN = re.compile(r" {0,3}(`{3,}|~{3,})")
+_HEADING_PATTERN = re.compile(r" {0,3}(#{1,6})[ \t]+(.*\S)")
+# Inline code is removed first, and then links and emphasis are replaced with their
+# text.
+_INLINE_CODE_PATTERN = re.compile(r"`[^`]+`")
+_INLINE_MARKUP_PATTERN = re.compile(
+    r"\[([^\]]+)\]\([^\)]+\)|[*_]{1,2}([^*_]+)[*_]{1,2}"
+)
+_SLUG_REMOVED_PATTERN = re.compile(r"[^\w\s.-]")
+_SLUG_SEPARATOR_PATTERN = re.compile(r"[\s_-]+")
+_FRONTMATTER_HANDLER = YAMLHandler()
+# The levels of the headings that the app's table of contents lists.
+TABLE_OF_CONTENTS_LEVELS = (2, 3)
+
+
+class Heading(NamedTuple):
+    level: int
+    text: str
+    # Not unique within the page. Search indexing numbers the repeated slugs of the
+    # headings it indexes.
+    slug: str
+
+
+class MarkdownPage(NamedTuple):
+    metadata: Dict[str, Any]
+    headings: List[Heading]
+    # The prose of the page, without frontmatter, headings, code or inline markup.
+    text: str
+
+    @property
+    def title(self) -> Optional[str]:
+        """The title from the frontmatter, or else the text of the first heading."""
+        title = self.metadata.get("title")
+        if title is None and self.headings:
+            title = self.headings[0].text
+        return title
+
+    @property
+    def table_of_contents(self) -> List[Heading]:
+        """The headings that the app's table of contents lists."""
+        return [
+            heading
+            for heading in self.headings
+            if heading.level in TABLE_OF_CONTENTS_LEVELS
+        ]
+
+
+def scan_markdown(content: str) -> MarkdownPage:
+    """Extract the frontmatter, headings and text of a Markdown page.
+
+    Args:
+        content: The content of the page, including any frontmatter.
+
+    Returns:
+        The scanned page.
+    """
+    return _scan_lines(content.splitlines(keepends=True))
+
+
+def scan_markdown_file(path: str) -> MarkdownPage:
+    """Read and scan a Markdown page one line at a time.
+
+    Args:
+        path: The path of the page.
+
+    Returns:
+        The scanned page.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return _scan_lines(f)
+
+
+def _scan_lines(lines: Iterable[str]) -> MarkdownPage:
+    # The lines keep their line breaks, which the patterns allow for.
+    lines = iter(lines)
+    metadata, body_start = _read_frontmatter(lines)
+
+    headings: List[Heading] = []
+    words: List[str] = []
+    # Links and emphasis can wrap across lines, but not across paragraphs, so the
+    # markup is removed a paragraph at a time.
+    paragraph: List[str] = []
+    fence: Optional[str] = None
+    for line in itertools.chain(body_start, lines):
+        if fence is not None:
+            # A fence is closed by at least as many of the same characters.
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+            continue
+
+        match = _FENCE_PATTERN.match(line)
+        if match:
+            words += _get_words(paragraph)
+            paragraph = []
+            fence = match.group(1)
+            continue
+
+        match = _HEADING_PATTERN.match(line)
+        if match:
+            words += _get_words(paragraph)
+            paragraph = []
+            text = match.group(2).strip()
+            headings.append(Heading(len(match.group(1)), text, slugify(text)))
+            continue
+
+        if line.strip():
+            paragraph.append(line)
+        else:
+            words += _get_words(paragraph)
+            paragraph = []
+
+    words += _get_words(paragraph)
+    return MarkdownPage(metadata, headings, " ".join(words))
+
+
+def _get_words(paragraph: List[str]) -> List[str]:
+    """Return the words of a paragraph without inline code and markup."""
+    text = "".join(paragraph)
+    # Most paragraphs have no markup, so only substitute when they might.
+    if "`" in text:
+        text = _INLINE_CODE_PATTERN.sub("", text)
+    if "[" in text or "*" in text or "_" in text:
+        text = _INLINE_MARKUP_PATTERN.sub(_replace_inline_markup, text)
+    return text.split()
+
+
+def _read_frontmatter(lines: Iterator[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Consume the frontmatter, and return it with the lines of the body read so far.
+
+    Like `frontmatter.parse`, the frontmatter must come first, between two lines of
+    dashes. Without a closing line, the lines are part of the body.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        if not _FRONTMATTER_HANDLER.FM_BOUNDARY.fullmatch(line):
+            return {}, [line]
+
+        frontmatter_lines: List[str] = []
+        for frontmatter_line in lines:
+            if _FRONTMATTER_HANDLER.FM_BOUNDARY.fullmatch(frontmatter_line):
+                metadata = _FRONTMATTER_HANDLER.load("".join(frontmatter_lines))
+                return (metadata if isinstance(metadata, dict) else {}), []
+            frontmatter_lines.append(frontmatter_line)
+        return {}, [line, *frontmatter_lines]
+    return {}, []
+
+
+def slugify(text: str) -> str:
+    """Convert heading text to a URL-friendly slug.
+
+    Args:
+        text: The heading text to slugify.
+
+    Returns:
+        The lowercase words of the text separated by hyphens, without punctuation
+        other than dots.
+    """
+    text = _SLUG_REMOVED_PATTERN.sub("", text.lower())
+    return "-".join(part for part in _SLUG_SEPARATOR_PATTERN.split(text) if part)
+
+
+def _replace_inline_markup(match: "re.Match[str]") -> str:
+    link_text, emphasized_text = match.groups()
+    # Links can be emphasized, and emphasis can contain links.
+    text = link_text if link_text is not None else emphasized_text
+    return _INLINE_MARKUP_PATTERN.sub(_replace_inline_markup, text)
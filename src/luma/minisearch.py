@@ -0,0 +1,166 @@
+"""Build MiniSearch indexes in Python.
+
+The search bar uses MiniSearch (https://github.com/lucaong/minisearch). Indexing every
+document in the visitor's browser takes hundreds of milliseconds for large sites, so
+Luma builds the index at build time instead, and the browser only loads it with
+`MiniSearch.loadJS`.
+
+`build_index` mirrors `MiniSearch.addAll` with the default tokenizer and term
+processing, and returns the same object as `MiniSearch.toJSON` (serialization version
+2 of MiniSearch 7). Search options like boosts aren't part of the index; the frontend
+passes them when it loads the index.
+"""
+
+import functools
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+SERIALIZATION_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+# MiniSearch's default tokenizer splits on `/[\n\r\p{Z}\p{P}]+/u`.
+_SEPARATOR_CATEGORIES = frozenset(
+    {"Zs", "Zl", "Zp", "Pc", "Pd", "Ps", "Pe", "Pi", "Pf", "Po"}
+)
+# No code point above the Supplementary Multilingual Plane is a separator.
+_MAX_SEPARATOR_CODE_POINT = 0x1FFFF
+
+
+@functools.lru_cache(maxsize=None)
+def _get_separator_patterns() -> Tuple["re.Pattern[str]", "re.Pattern[str]"]:
+    """Return the separator patterns for ASCII text and for any text."""
+    # Python's `re` doesn't support Unicode property classes, so list the ranges of
+    # separators. Listing them takes about 30 ms, so only do it when it's needed.
+    ranges: List[List[int]] = []
+    for code_point in range(_MAX_SEPARATOR_CODE_POINT + 1):
+        if unicodedata.category(chr(code_point)) in _SEPARATOR_CATEGORIES:
+            if ranges and ranges[-1][1] == code_point - 1:
+                ranges[-1][1] = code_point
+            else:
+                ranges.append([code_point, code_point])
+
+    def compile_class(ranges: List[List[int]]) -> "re.Pattern[str]":
+        items = "".join(
+            re.escape(chr(start)) + ("-" + re.escape(chr(end)) if end > start else "")
+            for start, end in ranges
+        )
+        return re.compile(f"[\n\r{items}]+")
+
+    # Most documentation is ASCII, and splitting with the small class of ASCII
+    # separators is several times faster than with the full one.
+    ascii_ranges = [[start, min(end, 0x7F)] for start, end in ranges if start <= 0x7F]
+    return compile_class(ascii_ranges), compile_class(ranges)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into terms like MiniSearch's default tokenizer.
+
+    Like JavaScript's `String.prototype.split`, the result can start or end with an
+    empty string, which MiniSearch counts towards the field length.
+    """
+    ascii_pattern, pattern = _get_separator_patterns()
+    return (ascii_pattern if text.isascii() else pattern).split(text)
+
+
+def build_index(
+    documents: Sequence[Dict[str, Any]],
+    *,
+    fields: List[str],
+    store_fields: List[str],
+    id_field: str = "id",
+) -> Dict[str, Any]:
+    """Index documents, and return the index as `MiniSearch.toJSON` would.
+
+    Args:
+        documents: The documents to index.
+        fields: The fields to index, in the same order as the frontend's `fields`
+            option.
+        store_fields: The fields to return with search results.
+        id_field: The field that uniquely identifies each document. Documents whose
+            ID was already indexed are skipped.
+
+    Returns:
+        An object that `MiniSearch.loadJS` accepts with the same `fields` and
+        `storeFields` options.
+
+    Raises:
+        ValueError: If a document has no ID.
+    """
+    field_ids = {field: field_id for field_id, field in enumerate(fields)}
+    # MiniSearch uses the keys of its maps as object keys, which are strings.
+    field_keys = [str(field_id) for field_id in range(len(fields))]
+    document_ids: Dict[str, Any] = {}
+    seen_ids: Set[Any] = set()
+    field_lengths: Dict[str, List[int]] = {}
+    average_field_lengths = [0.0] * len(fields)
+    stored_fields: Dict[str, Dict[str, Any]] = {}
+    # Maps each term to its postings: field ID -> short document ID -> frequency.
+    index: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    for document in documents:
+        document_id = document.get(id_field)
+        if document_id is None:
+            raise ValueError(f"Document has no '{id_field}' field: {document}")
+        if document_id in seen_ids:
+            # MiniSearch refuses to load an index with duplicate IDs.
+            logger.warning(f"Skipping document with duplicate ID {document_id!r}")
+            continue
+        count = len(seen_ids)
+        seen_ids.add(document_id)
+
+        short_id = str(count)
+        document_ids[short_id] = document_id
+        if store_fields:
+            stored_fields[short_id] = {
+                field: document[field] for field in store_fields if field in document
+            }
+
+        lengths: List[Any] = [None] * len(fields)
+        for field in fields:
+            value = document.get(field)
+            if value is None:
+                continue
+
+            field_id = field_ids[field]
+            tokens = tokenize(str(value))
+            lengths[field_id] = len(set(tokens))
+            # Update the running average the same way MiniSearch does, so that the
+            # floating-point result is identical.
+            average_field_lengths[field_id] = (
+                average_field_lengths[field_id] * count + lengths[field_id]
+            ) / (count + 1)
+
+            field_key = field_keys[field_id]
+            for token in tokens:
+                term = token.lower()
+                if not term:
+                    continue
+                postings = index.get(term)
+                if postings is None:
+                    index[term] = {field_key: {short_id: 1}}
+                    continue
+                frequencies = postings.get(field_key)
+                if frequencies is None:
+                    postings[field_key] = {short_id: 1}
+                else:
+                    frequencies[short_id] = frequencies.get(short_id, 0) + 1
+        # JavaScript arrays don't have trailing holes.
+        while lengths and lengths[-1] is None:
+            lengths.pop()
+        field_lengths[short_id] = lengths
+
+    return {
+        "documentCount": len(document_ids),
+        "nextId": len(document_ids),
+        "documentIds": document_ids,
+        "fieldIds": field_ids,
+        "fieldLength": field_lengths,
+        "averageFieldLength": average_field_lengths,
+        "storedFields": stored_fields,
+        "dirtCount": 0,
+        "index": [[term, postings] for term, postings in index.items()],
+        "serializationVersion": SERIALIZATION_VERSION,
+    }
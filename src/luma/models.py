@@ -1,10 +1,10 @@
 import abc
 from enum import Enum
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from pydantic import BaseModel
 
-from .rst_converter import convert_rst_to_markdown
+from .rst_converter import convert_rst_batch
 
 
 class PyObjType(str, Enum):
@@ -30,8 +30,20 @@ class PyObj(BaseModel, abc.ABC):
     desc: Optional[str]
     examples: List[DocstringExample]
 
+    def to_markdown(self) -> str:
+        return self.render_markdown(convert_rst_batch(self.rst_fragments()))
+
+    @abc.abstractmethod
+    def rst_fragments(self) -> List[Optional[str]]:
+        """Return the reStructuredText fragments that the Markdown includes.
+
+        Converting the fragments of many objects in one batch is much faster than
+        converting them one at a time.
+        """
+
     @abc.abstractmethod
-    def to_markdown(self) -> str: ...
+    def render_markdown(self, fragments: List[Optional[str]]) -> str:
+        """Render the Markdown, given the converted `rst_fragments`."""
 
 
 class PyFunc(PyObj):
@@ -40,37 +52,25 @@ class PyFunc(PyObj):
     args: List[PyArg]
     returns: Optional[str]
 
-    def to_markdown(self) -> str:
-        markdown = f"## {self.name}\n"
-        markdown += f"\n```python\n{self.signature}\n```\n"
-
-        summary_md = convert_rst_to_markdown(self.summary)
-        if summary_md:
-            markdown += f"\n{summary_md}\n"
-
-        desc_md = convert_rst_to_markdown(self.desc)
-        if desc_md:
-            markdown += f"\n{desc_md}\n"
-
-        if self.args:
-            markdown += "\n**Arguments**\n\n"
-            for arg in self.args:
-                desc_md = convert_rst_to_markdown(arg.desc) or arg.desc
-                if arg.type:
-                    markdown += f"- **{arg.name}** ({arg.type}): {desc_md}\n"
-                else:
-                    markdown += f"- **{arg.name}**: {desc_md}\n"
-
-        returns_md = convert_rst_to_markdown(self.returns)
-        if returns_md:
-            markdown += f"\n**Returns**\n\n{returns_md}\n"
+    def rst_fragments(self) -> List[Optional[str]]:
+        return [
+            self.summary,
+            self.desc,
+            *(arg.desc for arg in self.args),
+            self.returns,
+        ]
+
+    def render_markdown(self, fragments: List[Optional[str]]) -> str:
+        converted = iter(fragments)
+        parts = _render_header(self.name, self.signature, converted)
+        parts += _render_args(self.args, converted)
 
-        if self.examples:
-            markdown += "\n**Examples**\n"
-            for example in self.examples:
-                markdown += f"\n```python\n{example.code}\n```"
+        returns_md = next(converted)
+        if returns_md:
+            parts.append(f"\n**Returns**\n\n{returns_md}\n")
 
-        return markdown
+        parts += _render_examples(self.examples)
+        return "".join(parts)
 
 
 class PyClass(PyObj):
@@ -79,30 +79,54 @@ class PyClass(PyObj):
     args: List[PyArg]
     methods: List[PyFunc]
 
-    def to_markdown(self) -> str:
-        markdown = f"## {self.name}\n"
-        markdown += f"\n```python\n{self.signature}\n```\n"
-
-        summary_md = convert_rst_to_markdown(self.summary)
-        if summary_md:
-            markdown += f"\n{summary_md}\n"
-
-        desc_md = convert_rst_to_markdown(self.desc)
-        if desc_md:
-            markdown += f"\n{desc_md}\n"
-
-        if self.args:
-            markdown += "\n**Arguments**\n\n"
-            for arg in self.args:
-                desc_md = convert_rst_to_markdown(arg.desc) or arg.desc
-                if arg.type:
-                    markdown += f"- **{arg.name}** ({arg.type}): {desc_md}\n"
-                else:
-                    markdown += f"- **{arg.name}**: {desc_md}\n"
-
-        if self.examples:
-            markdown += "\n**Examples**\n"
-            for example in self.examples:
-                markdown += f"\n```python\n{example.code}\n```"
-
-        return markdown
+    def rst_fragments(self) -> List[Optional[str]]:
+        return [self.summary, self.desc, *(arg.desc for arg in self.args)]
+
+    def render_markdown(self, fragments: List[Optional[str]]) -> str:
+        converted = iter(fragments)
+        parts = _render_header(self.name, self.signature, converted)
+        parts += _render_args(self.args, converted)
+        parts += _render_examples(self.examples)
+        return "".join(parts)
+
+
+def _render_header(
+    name: str, signature: str, converted: Iterator[Optional[str]]
+) -> List[str]:
+    # Rendering into a list and joining it once avoids copying the Markdown rendered
+    # so far on every addition.
+    parts = [f"## {name}\n", f"\n```python\n{signature}\n```\n"]
+
+    summary_md = next(converted)
+    if summary_md:
+        parts.append(f"\n{summary_md}\n")
+
+    desc_md = next(converted)
+    if desc_md:
+        parts.append(f"\n{desc_md}\n")
+
+    return parts
+
+
+def _render_args(args: List[PyArg], converted: Iterator[Optional[str]]) -> List[str]:
+    if not args:
+        return []
+
+    parts = ["\n**Arguments**\n\n"]
+    for arg in args:
+        desc_md = next(converted) or arg.desc
+        if arg.type:
+            parts.append(f"- **{arg.name}** ({arg.type}): {desc_md}\n")
+        else:
+            parts.append(f"- **{arg.name}**: {desc_md}\n")
+    return parts
+
+
+def _render_examples(examples: List[DocstringExample]) -> List[str]:
+    if not examples:
+        return []
+
+    parts = ["\n**Examples**\n"]
+    for example in examples:
+        parts.append(f"\n```python\n{example.code}\n```")
+    return parts
@@ -1,62 +1,828 @@
+import collections
+import functools
 import inspect
 import json
 import logging
+import math
 import os
 import typing
+from concurrent.futures import Future
 from types import FunctionType
-from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from docstring_parser import Docstring, parse
+from pydantic import BaseModel
 
+from .cache import RenderCache, get_cache_root
 from .config import ResolvedConfig, ResolvedReference, ResolvedSection, ResolvedTab
 from .models import DocstringExample, PyArg, PyClass, PyFunc, PyObj
 from .node import get_node_root
-from .utils import get_module_and_relative_name, get_obj
+from .rst_converter import convert_rst_batch
+from .utils import (
+    AtomicWriter,
+    create_process_pool,
+    get_module_and_relative_name,
+    get_obj,
+    write_if_changed,
+)
+from .worker import WorkerError, render_in_worker
 
 logger = logging.getLogger(__name__)
 
 MAX_FORMATTED_SIGNATURE_LENGTH = 80
+# Maps each source file to the APIs that depend on it. Lives in the cache directory.
+REFERENCE_SOURCES_FILENAME = "reference-sources.json"
+# The pages that the last run generated, so that pages of removed references and APIs
+# can be deleted.
+REFERENCE_PAGES_FILENAME = "reference-pages.json"
+
+# Starting a worker process and importing the package costs about as much as rendering
+# a few APIs, so each worker should render at least this many.
+MIN_APIS_PER_WORKER = 8
+# Rendered APIs are written to their pages chunk by chunk, so this bounds the Markdown
+# that is held in memory at once.
+MAX_APIS_PER_CHUNK = 100
+# Chunks are submitted to worker processes as the rendered ones are written, so that
+# the results waiting to be written don't pile up.
+MAX_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def prepare_references(
+    project_root: str,
+    config: ResolvedConfig,
+    *,
+    static: bool = False,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    fresh_interpreter: bool = False,
+    persistent_worker: bool = False,
+) -> None:
+    """Write the pages of each reference in the config, and the 'apis.json' file.
+
+    Split references get a page per API and an index page that links to them. Pages
+    that previous runs generated for removed references or APIs are deleted.
+
+    Also record which source files each API depends on, so that `update_references`
+    can regenerate the affected pages when a source file changes.
 
-
-def prepare_references(project_root: str, config: ResolvedConfig) -> None:
+    Args:
+        project_root: The project root directory.
+        config: The resolved config.
+        static: If `True`, parse APIs from source code instead of importing them.
+        max_workers: The maximum number of processes to render APIs with. If `None`,
+            use one process per CPU.
+        cache_dir: The directory of the render cache. If `None`, don't cache renders.
+        fresh_interpreter: If `True`, always render in worker processes, for when
+            this process might have imported an outdated version of the package.
+        persistent_worker: If `True`, render in the project's persistent worker, which
+            keeps the package imported between commands. See `luma.worker`.
+    """
     node_path = get_node_root(project_root)
+    references = list(list_references_in_config(config))
+
+    # Several references can include the same API, so render each API once.
+    qualnames = list(
+        dict.fromkeys(
+            qualname for reference in references for qualname in reference.apis
+        )
+    )
+    fragments = _RenderedFragments(
+        _render_apis(
+            qualnames,
+            static=static,
+            max_workers=max_workers,
+            cache_dir=cache_dir,
+            fresh_interpreter=fresh_interpreter,
+            worker_root=project_root if persistent_worker else None,
+        )
+    )
+    page_paths = _write_references(node_path, references, fragments)
 
     qualname_to_path = {}
-    for reference in _list_references_in_config(config):
-        markdown = f"# {reference.title}"
+    for reference in references:
+        for qualname in reference.apis:
+            if qualname in fragments.rendered:
+                qualname_to_path[qualname] = _get_api_url(reference, qualname)
+
+    _write_apis_json(node_path, qualname_to_path)
+    _save_reference_sources(project_root, fragments.sources)
+    _prune_reference_pages(project_root, page_paths)
+    if cache_dir is not None:
+        RenderCache(cache_dir).prune(fragments.cache_keys)
+
+
+def update_references(
+    project_root: str,
+    config: ResolvedConfig,
+    qualnames: Iterable[str],
+    *,
+    static: bool = False,
+    cache_dir: Optional[str] = None,
+    persistent_worker: bool = False,
+) -> List[str]:
+    """Rewrite the reference pages that include any of the given APIs.
+
+    The APIs are rendered in a fresh interpreter, or in the persistent worker, which
+    reloads changed modules, because this process might have imported an outdated
+    version of the documented package.
 
+    Args:
+        project_root: The project root directory.
+        config: The resolved config.
+        qualnames: The fully qualified names of the APIs whose source changed.
+        static: If `True`, parse APIs from source code instead of importing them.
+        cache_dir: The directory of the render cache. If `None`, don't cache renders.
+            With a cache, the unchanged APIs on the affected pages aren't parsed
+            again.
+        persistent_worker: If `True`, render in the project's persistent worker.
+
+    Returns:
+        The relative paths of the rewritten reference pages. For split references,
+        only the pages of the changed APIs are rewritten, along with the index if the
+        set of rendered APIs changed. Pages of changed APIs that can no longer be
+        rendered are removed, and their paths are included.
+    """
+    node_path = get_node_root(project_root)
+    changed = set(qualnames)
+    references = [
+        reference
+        for reference in list_references_in_config(config)
+        if changed.intersection(reference.apis)
+    ]
+    if not references:
+        return []
+
+    # The page of a split reference only includes its own API.
+    to_render = list(
+        dict.fromkeys(
+            qualname
+            for reference in references
+            for qualname in reference.apis
+            if not reference.split or qualname in changed
+        )
+    )
+    # The indexes of split references only link to rendered APIs, and 'apis.json'
+    # lists the APIs that the last run rendered.
+    qualname_to_path = _load_apis_json(node_path)
+    fragments = _RenderedFragments(
+        _render_apis(
+            to_render,
+            static=static,
+            max_workers=1,
+            cache_dir=cache_dir,
+            fresh_interpreter=True,
+            worker_root=project_root if persistent_worker else None,
+        ),
+        rendered=set(qualname_to_path) - changed,
+    )
+    page_paths = _write_references(node_path, references, fragments, changed)
+
+    # Every reference that includes a changed API is rewritten above, so the entries
+    # of the changed APIs can be recomputed from those references alone.
+    for qualname in changed:
+        qualname_to_path.pop(qualname, None)
+    for reference in references:
         for qualname in reference.apis:
-            markdown += "\n\n---\n\n"
+            if qualname in changed and qualname in fragments.rendered:
+                qualname_to_path[qualname] = _get_api_url(reference, qualname)
+    _write_apis_json(node_path, qualname_to_path)
+
+    sources = load_reference_sources(project_root)
+    sources_by_qualname: Dict[str, List[str]] = {}
+    for path, dependents in sources.items():
+        for qualname in dependents:
+            sources_by_qualname.setdefault(qualname, []).append(path)
+    sources_by_qualname.update(fragments.sources)
+    _save_reference_sources(project_root, sources_by_qualname)
+
+    return page_paths
+
+
+def load_reference_sources(project_root: str) -> Dict[str, List[str]]:
+    """Return a map from each source file to the APIs that depend on it.
+
+    Returns:
+        The map that the last `prepare_references` or `update_references` call
+        recorded, or an empty dictionary if there isn't one.
+    """
+    path = os.path.join(get_cache_root(project_root), REFERENCE_SOURCES_FILENAME)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable reference sources '{path}': {e}")
+        return {}
+
+
+def _save_reference_sources(
+    project_root: str, sources_by_qualname: Dict[str, List[str]]
+) -> None:
+    sources: Dict[str, List[str]] = {}
+    for qualname, paths in sources_by_qualname.items():
+        for path in paths:
+            sources.setdefault(path, []).append(qualname)
+
+    path = os.path.join(get_cache_root(project_root), REFERENCE_SOURCES_FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    content = json.dumps({path: sorted(names) for path, names in sources.items()})
+    if write_if_changed(path, content):
+        logger.debug(f"Wrote '{path}'")
+
+
+def _write_references(
+    node_path: str,
+    references: List[ResolvedReference],
+    fragments: "_RenderedFragments",
+    qualnames: Optional[Set[str]] = None,
+) -> List[str]:
+    """Write the pages of each reference, and return their relative paths.
+
+    The references are written in the order that their APIs are rendered, and each
+    fragment is released after the last reference that includes it.
+    """
+    last_use = {
+        qualname: index
+        for index, reference in enumerate(references)
+        for qualname in reference.apis
+    }
+    written = []
+    for index, reference in enumerate(references):
+        written += _write_reference(node_path, reference, fragments, qualnames)
+        fragments.release(
+            qualname for qualname in reference.apis if last_use[qualname] == index
+        )
+    # Consume any remaining results so that the worker processes are shut down.
+    fragments.finish()
+    return written
+
+
+def _write_reference(
+    node_path: str,
+    reference: ResolvedReference,
+    fragments: "_RenderedFragments",
+    qualnames: Optional[Set[str]] = None,
+) -> List[str]:
+    """Write the pages of a reference, and return their relative paths.
+
+    If `qualnames` is given, only write the pages that include those APIs, and the
+    index of a split reference if it changed. The pages of those APIs that couldn't
+    be rendered are removed, and their paths are returned too.
+    """
+    if not reference.split:
+        _write_reference_page(node_path, reference, fragments)
+        return [reference.relative_path]
+
+    written = []
+    os.makedirs(
+        os.path.join(node_path, "pages", reference.relative_path[:-3]), exist_ok=True
+    )
+    for qualname in reference.apis:
+        if qualnames is not None and qualname not in qualnames:
+            continue
+        path = os.path.join(node_path, "pages", reference.get_api_path(qualname))
+        fragment = fragments[qualname]
+        if fragment is None:
+            # APIs that couldn't be rendered don't get a page.
             try:
-                module, relative_name = get_module_and_relative_name(qualname)
-            except ImportError:
-                logger.warning(f"Couldn't import '{qualname}'")
+                os.remove(path)
+            except FileNotFoundError:
                 continue
+            logger.debug(f"Removed '{path}'")
+            if qualnames is not None:
+                written.append(reference.get_api_path(qualname))
+            continue
+        if write_if_changed(path, fragment):
+            logger.debug(f"Wrote '{path}'")
+        written.append(reference.get_api_path(qualname))
+
+    # Written after the API pages, because it only links to the rendered APIs.
+    if _write_reference_index(node_path, reference, fragments.rendered):
+        written.append(reference.relative_path)
+    elif qualnames is None:
+        written.append(reference.relative_path)
+    return written
+
+
+def _write_reference_index(
+    node_path: str, reference: ResolvedReference, rendered: Set[str]
+) -> bool:
+    lines = [f"# {reference.title}", ""]
+    for qualname in reference.apis:
+        if qualname in rendered:
+            url = "/" + reference.get_api_path(qualname)[:-3]
+            lines.append(f"- [`{qualname}`]({url})")
+
+    path = os.path.join(node_path, "pages", reference.relative_path)
+    changed = write_if_changed(path, "\n".join(lines) + "\n")
+    if changed:
+        logger.debug(f"Wrote '{path}'")
+    return changed
+
+
+def _prune_reference_pages(project_root: str, page_paths: List[str]) -> None:
+    manifest_path = os.path.join(get_cache_root(project_root), REFERENCE_PAGES_FILENAME)
+    try:
+        with open(manifest_path) as f:
+            previous_paths = json.load(f)
+    except (OSError, ValueError):
+        previous_paths = []
+
+    pages_path = os.path.join(get_node_root(project_root), "pages")
+    for relative_path in set(previous_paths) - set(page_paths):
+        path = os.path.join(pages_path, relative_path)
+        try:
+            # Generated pages have a single link. If the path has more, it's one of
+            # the project's own pages now.
+            if os.stat(path).st_nlink == 1:
+                logger.debug(f"Removing stale reference page '{path}'")
+                os.remove(path)
+        except OSError:
+            continue
+        if os.path.dirname(relative_path):
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                # The directory still contains other pages.
+                pass
+
+    write_if_changed(manifest_path, json.dumps(sorted(page_paths)))
+
+
+def _write_reference_page(
+    node_path: str, reference: ResolvedReference, fragments: "_RenderedFragments"
+) -> None:
+    path = os.path.join(node_path, "pages", reference.relative_path)
+    # A reference can include hundreds of APIs, so stream the page to the file
+    # instead of building it in memory.
+    with AtomicWriter(path) as writer:
+        writer.write(f"# {reference.title}")
+        for qualname in reference.apis:
+            fragment = fragments[qualname]
+            if fragment is not None:
+                writer.write("\n\n---\n\n")
+                writer.write(fragment)
+    if writer.changed:
+        logger.debug(f"Wrote '{path}'")
+
+
+def _get_api_url(reference: ResolvedReference, qualname: str) -> str:
+    # HACK
+    return f"{reference.get_api_path(qualname).removesuffix('.md')}#{qualname}"
+
+
+def _load_apis_json(node_path: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(node_path, "data", "apis.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_apis_json(node_path: str, qualname_to_path: Dict[str, str]) -> None:
+    path = os.path.join(node_path, "data", "apis.json")
+    if write_if_changed(path, json.dumps(qualname_to_path)):
+        logger.debug(f"Wrote '{path}'")
+
+
+class _RenderedApi(BaseModel):
+    qualname: str
+    markdown: Optional[str]
+    warning: Optional[str] = None
+    cache_key: Optional[str] = None
+    # The source files that the rendered Markdown depends on.
+    sources: List[str] = []
+
+
+def render_apis(
+    qualnames: List[str],
+    *,
+    static: bool = False,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Optional[str]]:
+    """Render the Markdown for each API, in parallel across processes.
+
+    Each worker process imports the documented package once and renders a contiguous
+    chunk of the APIs. The results don't depend on the number of workers.
+
+    Args:
+        qualnames: The fully qualified names of the APIs to render.
+        static: If `True`, parse APIs from source code instead of importing them.
+        max_workers: The maximum number of processes. If `None`, use one process per
+            CPU. If 1, render in this process.
+        cache_dir: The directory of the render cache. If `None`, don't cache renders.
+            Otherwise, APIs whose source hasn't changed are read from the cache, and
+            entries for APIs that weren't rendered are deleted.
+
+    Returns:
+        A dictionary that maps each fully qualified name to its Markdown, or to `None`
+        if the API couldn't be parsed.
+    """
+    results = list(
+        _render_apis(
+            qualnames, static=static, max_workers=max_workers, cache_dir=cache_dir
+        )
+    )
+    if cache_dir is not None:
+        RenderCache(cache_dir).prune(
+            result.cache_key for result in results if result.cache_key is not None
+        )
+    return {result.qualname: result.markdown for result in results}
+
 
+class _RenderedFragments:
+    """The Markdown of rendered APIs, read from the render results as pages need it.
+
+    The results arrive in the order of the pages, so each page can be written as soon
+    as its APIs are rendered. Only the fragments that later pages still need are
+    kept.
+    """
+
+    def __init__(
+        self, results: Iterator[_RenderedApi], rendered: Iterable[str] = ()
+    ) -> None:
+        self._results = results
+        self._fragments: Dict[str, Optional[str]] = {}
+        # The APIs that were rendered successfully, including those that an earlier
+        # run rendered and that aren't rendered again.
+        self.rendered: Set[str] = set(rendered)
+        self.sources: Dict[str, List[str]] = {}
+        self.cache_keys: List[str] = []
+
+    def __getitem__(self, qualname: str) -> Optional[str]:
+        """Return the Markdown of an API, or `None` if it couldn't be rendered."""
+        while qualname not in self._fragments:
             try:
-                obj = get_obj(module, relative_name)
-            except AttributeError:
-                logger.warning(
-                    f"Failed to get '{relative_name}' from '{module.__name__}'"
+                result = next(self._results)
+            except StopIteration:
+                raise KeyError(qualname) from None
+            self._add(result)
+            self._fragments[result.qualname] = result.markdown
+        return self._fragments[qualname]
+
+    def release(self, qualnames: Iterable[str]) -> None:
+        """Drop the Markdown of APIs that no later page includes."""
+        for qualname in qualnames:
+            self._fragments.pop(qualname, None)
+
+    def finish(self) -> None:
+        """Consume the remaining results without keeping their Markdown."""
+        for result in self._results:
+            self._add(result)
+
+    def _add(self, result: _RenderedApi) -> None:
+        if result.markdown is not None:
+            self.rendered.add(result.qualname)
+        self.sources[result.qualname] = result.sources
+        if result.cache_key is not None:
+            self.cache_keys.append(result.cache_key)
+
+
+def _render_apis(
+    qualnames: List[str],
+    *,
+    static: bool,
+    max_workers: Optional[int],
+    cache_dir: Optional[str],
+    fresh_interpreter: bool = False,
+    worker_root: Optional[str] = None,
+) -> Iterator[_RenderedApi]:
+    """Render APIs in chunks, and yield the results in the order of the names."""
+    for results in _render_api_chunks(
+        qualnames,
+        static=static,
+        max_workers=max_workers,
+        cache_dir=cache_dir,
+        fresh_interpreter=fresh_interpreter,
+        worker_root=worker_root,
+    ):
+        for result in results:
+            # Workers don't inherit the CLI's logging configuration, so they return
+            # their warnings instead of logging them.
+            if result.warning is not None:
+                logger.warning(result.warning)
+            yield result
+
+
+def _render_api_chunks(
+    qualnames: List[str],
+    *,
+    static: bool,
+    max_workers: Optional[int],
+    cache_dir: Optional[str],
+    fresh_interpreter: bool,
+    worker_root: Optional[str],
+) -> Iterator[List[_RenderedApi]]:
+    num_workers = min(
+        max_workers or os.cpu_count() or 1, len(qualnames) // MIN_APIS_PER_WORKER
+    )
+    render = functools.partial(_render_api_chunk, static=static, cache_dir=cache_dir)
+
+    chunk_size = MAX_APIS_PER_CHUNK
+    if num_workers > 1:
+        # Use more chunks than workers so that a chunk of slow APIs doesn't leave the
+        # other workers idle.
+        chunk_size = min(
+            math.ceil(len(qualnames) / (num_workers * 4)), MAX_APIS_PER_CHUNK
+        )
+    chunks = [
+        qualnames[start : start + chunk_size]
+        for start in range(0, len(qualnames), chunk_size)
+    ]
+
+    if worker_root is not None:
+        # The worker renders serially, but it has usually imported the package
+        # already, and the render cache covers the unchanged APIs.
+        for index, chunk in enumerate(chunks):
+            results = _try_render_in_worker(
+                worker_root, chunk, static=static, cache_dir=cache_dir
+            )
+            if results is None:
+                chunks = chunks[index:]
+                break
+            yield results
+        else:
+            return
+
+    if num_workers <= 1 and not fresh_interpreter:
+        yield from map(render, chunks)
+        return
+
+    # Worker processes start with an empty module resolver, so resolve the names here
+    # once and send the module of each name with its chunk.
+    module_names: Dict[str, str] = {}
+    if not static:
+        module_names = _resolve_module_names(
+            qualnames, import_modules=not fresh_interpreter and worker_root is None
+        )
+    num_workers = max(num_workers, 1)
+    with create_process_pool(num_workers) as executor:
+        in_flight: Deque["Future[List[_RenderedApi]]"] = collections.deque()
+        for chunk in chunks:
+            if len(in_flight) >= num_workers * MAX_CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield in_flight.popleft().result()
+            chunk_module_names = {
+                qualname: module_names[qualname]
+                for qualname in chunk
+                if qualname in module_names
+            }
+            in_flight.append(executor.submit(render, chunk, chunk_module_names))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _resolve_module_names(
+    qualnames: List[str], *, import_modules: bool
+) -> Dict[str, str]:
+    """Return the name of the module of each API that can be resolved.
+
+    If `import_modules` is `False`, the modules are found from their source files,
+    because this process might have imported an outdated version of the package, or
+    shouldn't import it at all.
+    """
+    # Imported here because the static parser depends on this module.
+    from .static_parser import split_qualname
+
+    module_names = {}
+    for qualname in qualnames:
+        if import_modules:
+            try:
+                _, relative_name = get_module_and_relative_name(qualname)
+            except ImportError:
+                continue
+            module_names[qualname] = qualname[: -len(relative_name) - 1]
+        else:
+            split = split_qualname(qualname)
+            if split is not None:
+                module_names[qualname] = split[0]
+    return module_names
+
+
+def _try_render_in_worker(
+    project_root: str, qualnames: List[str], *, static: bool, cache_dir: Optional[str]
+) -> Optional[List[_RenderedApi]]:
+    try:
+        return render_in_worker(
+            project_root, qualnames, static=static, cache_dir=cache_dir
+        )
+    except WorkerError as e:
+        logger.warning(f"{e} Rendering without the persistent worker instead.")
+        return None
+
+
+def _render_api_chunk(
+    qualnames: List[str],
+    module_names: Optional[Dict[str, str]] = None,
+    *,
+    static: bool,
+    cache_dir: Optional[str],
+) -> List[_RenderedApi]:
+    """Render a chunk of APIs.
+
+    `module_names` maps names to the modules that another process resolved them to,
+    so that this process doesn't have to look for the modules again.
+    """
+    module_names = module_names or {}
+    cache = RenderCache(cache_dir) if cache_dir is not None else None
+
+    if static:
+        # Imported here because the static parser depends on this module.
+        from .static_parser import parse_static
+
+        parsed_objs = parse_static(qualnames, max_workers=1)
+
+    results = []
+    pending: List[Tuple[_RenderedApi, PyObj]] = []
+    for qualname in qualnames:
+        if static:
+            obj_info = parsed_objs[qualname]
+            sources = _get_module_sources(qualname)
+            if obj_info is None:
+                warning = f"Couldn't find '{qualname}' in the source code"
+                results.append(
+                    _RenderedApi(
+                        qualname=qualname,
+                        markdown=None,
+                        warning=warning,
+                        sources=sources,
+                    )
+                )
+                continue
+        else:
+            obj_info = None
+            try:
+                obj = _get_api(qualname, module_names.get(qualname))
+            except ValueError as e:
+                # Adding the API to one of these modules fixes the warning.
+                results.append(
+                    _RenderedApi(
+                        qualname=qualname,
+                        markdown=None,
+                        warning=str(e),
+                        sources=_get_module_sources(qualname),
+                    )
+                )
+                continue
+            sources = _get_object_sources(obj, qualname)
+
+        cache_key = None
+        if cache is not None:
+            if static:
+                # Static parsing is cheap, so key the entry by the parsed model and
+                # only save the Markdown conversion.
+                cache_key = cache.key(qualname, obj_info.model_dump(mode="json"))
+            else:
+                cache_key = cache.key(qualname, _fingerprint_source(obj))
+
+            entry = cache.get(cache_key)
+            if entry is not None:
+                logger.debug(f"Using cached render of '{qualname}'")
+                results.append(
+                    _RenderedApi(
+                        qualname=qualname,
+                        markdown=entry["markdown"],
+                        cache_key=cache_key,
+                        sources=sources,
+                    )
                 )
                 continue
 
+        if obj_info is None:
             obj_info = parse_obj(obj, qualname)
-            markdown += obj_info.to_markdown()
-            # HACK
-            qualname_to_path[qualname] = (
-                f"{reference.relative_path.replace('.md', '')}#{qualname}"
+        result = _RenderedApi(
+            qualname=qualname, markdown=None, cache_key=cache_key, sources=sources
+        )
+        results.append(result)
+        pending.append((result, obj_info))
+
+    # Convert the docstrings of all APIs that weren't cached in a single batch.
+    fragments = [obj_info.rst_fragments() for _, obj_info in pending]
+    converted = iter(convert_rst_batch([text for texts in fragments for text in texts]))
+    for (result, obj_info), texts in zip(pending, fragments):
+        result.markdown = obj_info.render_markdown(
+            [next(converted) for _ in range(len(texts))]
+        )
+        if cache is not None:
+            cache.put(
+                result.cache_key,
+                {
+                    "model": obj_info.model_dump(mode="json"),
+                    "markdown": result.markdown,
+                },
             )
 
-        path = os.path.join(node_path, "pages", reference.relative_path)
-        with open(path, "w") as f:
-            logger.debug(f"Writing '{f.name}'")
-            f.write(markdown)
+    return results
+
+
+def _get_api(qualname: str, module_name: Optional[str] = None) -> Any:
+    try:
+        module, relative_name = get_module_and_relative_name(qualname, module_name)
+    except ImportError:
+        raise ValueError(f"Couldn't import '{qualname}'")
+
+    try:
+        return get_obj(module, relative_name)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Failed to get '{relative_name}' from '{module.__name__}'")
+
+
+def _get_object_sources(obj: Any, qualname: str) -> List[str]:
+    """Return the source files of an API, and of the classes it inherits from.
+
+    Only files in the API's top-level package are included, so that classes that
+    inherit from the standard library don't depend on it.
+    """
+    package_root = _get_package_root(qualname)
+    if package_root is None:
+        return []
+
+    objs = inspect.getmro(obj)[:-1] if isinstance(obj, type) else (obj,)
+    sources = []
+    for obj in objs:
+        try:
+            path = inspect.getsourcefile(inspect.unwrap(obj))
+        except TypeError:
+            # Built-in objects don't have source files.
+            path = None
+        if path is None:
+            continue
+
+        path = os.path.abspath(path)
+        if path == package_root or path.startswith(package_root + os.sep):
+            sources.append(path)
+    return list(dict.fromkeys(sources))
+
+
+def _get_module_sources(qualname: str) -> List[str]:
+    """Return the source files of the modules that a fully qualified name could be in.
+
+    Used when Luma doesn't know where the API is defined, like for static parsing or
+    for APIs that don't exist yet.
+    """
+    # Imported here because the static parser depends on this module.
+    from .static_parser import find_module_path
+
+    segments = qualname.split(".")
+    paths = (
+        find_module_path(".".join(segments[:end])) for end in range(1, len(segments))
+    )
+    return [os.path.abspath(path) for path in paths if path is not None]
 
-    path = os.path.join(node_path, "data", "apis.json")
-    with open(path, "w") as f:
-        logger.debug(f"Writing '{f.name}'")
-        f.write(json.dumps(qualname_to_path))
+
+def _get_package_root(qualname: str) -> Optional[str]:
+    from .static_parser import find_module_path
+
+    path = find_module_path(qualname.split(".")[0])
+    if path is None:
+        return None
+
+    path = os.path.abspath(path)
+    if os.path.basename(path) == "__init__.py":
+        return os.path.dirname(path)
+    return path
+
+
+def _fingerprint_source(obj: Any) -> List[List[Optional[str]]]:
+    """Return the source and docstring of an API, and of the classes it inherits from.
+
+    A class's rendered reference includes the methods it inherits, so a change to a
+    base class must invalidate the class's cached render.
+    """
+    if isinstance(obj, type):
+        # Every class inherits from `object`, which never changes.
+        objs = inspect.getmro(obj)[:-1]
+    else:
+        objs = (obj,)
+
+    fingerprint = []
+    for obj in objs:
+        try:
+            source = inspect.getsource(obj)
+        except (OSError, TypeError):
+            # Built-in and dynamically created objects don't have source code.
+            source = None
+        fingerprint.append(
+            [
+                getattr(obj, "__module__", None),
+                getattr(obj, "__qualname__", None),
+                source,
+                obj.__doc__,
+            ]
+        )
+    return fingerprint
 
 
 def parse_obj(obj: Any, qualname: str) -> PyObj:
@@ -68,7 +834,7 @@ def parse_obj(obj: Any, qualname: str) -> PyObj:
         raise NotImplementedError(f"Unsupported API type: {type(obj)}")
 
 
-def _list_references_in_config(config: ResolvedConfig) -> Iterable[ResolvedReference]:
+def list_references_in_config(config: ResolvedConfig) -> Iterable[ResolvedReference]:
     for item in config.navigation:
         if isinstance(item, ResolvedReference):
             yield item
@@ -202,39 +968,78 @@ def format_signature(obj: Union[FunctionType, type], name: str) -> str:
 
     signature = inspect.signature(init_or_func)
 
+    parameters = []
+    for parameter in signature.parameters.values():
+        annotation = None
+        if parameter.annotation != inspect.Signature.empty:
+            annotation = format_annotation(parameter.annotation)
+
+        default = None
+        if parameter.default != inspect.Parameter.empty:
+            default = repr(parameter.default)
+
+        parameters.append((parameter.name, parameter.kind, annotation, default))
+
+    return_annotation = None
+    if signature.return_annotation != inspect.Signature.empty:
+        return_annotation = format_annotation(signature.return_annotation)
+
+    return join_signature(name, parameters, return_annotation)
+
+
+def join_signature(
+    name: str,
+    parameters: List[Tuple[str, inspect._ParameterKind, Optional[str], Optional[str]]],
+    return_annotation: Optional[str],
+) -> str:
+    """Format a signature from its parts.
+
+    Args:
+        name: The name to display for the function or class.
+        parameters: A list of (name, kind, annotation, default) tuples. The annotation
+            and default are already formatted, or `None` if they aren't specified.
+        return_annotation: The formatted return annotation, or `None`.
+
+    Returns:
+        The formatted signature, wrapped at the commas if it's too long.
+    """
     # Build list of formatted parameters, excluding 'self'. Each element is a string
     # of the form 'name: type' or 'name' if no annotation is specified.
     formatted_parameters: list[str] = []
     previous_kind = None
-    for parameter in signature.parameters.values():
-        if parameter.name == "self":
+    for parameter_name, kind, annotation, default in parameters:
+        if parameter_name == "self":
             continue
 
-        if parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD and previous_kind == inspect.Parameter.POSITIONAL_ONLY:
+        if (
+            kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+            and previous_kind == inspect.Parameter.POSITIONAL_ONLY
+        ):
             formatted_parameters.append("/")
-        elif parameter.kind == inspect.Parameter.KEYWORD_ONLY and previous_kind != inspect.Parameter.KEYWORD_ONLY:
+        elif (
+            kind == inspect.Parameter.KEYWORD_ONLY
+            and previous_kind != inspect.Parameter.KEYWORD_ONLY
+        ):
             if previous_kind == inspect.Parameter.POSITIONAL_ONLY:
                 formatted_parameters.append("/")
             formatted_parameters.append("*")
-            
-        previous_kind = parameter.kind
 
-        if parameter.annotation != inspect.Signature.empty:
-            formatted_parameter = (
-                f"{parameter.name}: {format_annotation(parameter.annotation)}"
-            )
+        previous_kind = kind
+
+        if annotation is not None:
+            formatted_parameter = f"{parameter_name}: {annotation}"
         else:
-            formatted_parameter = parameter.name
+            formatted_parameter = parameter_name
 
-        if parameter.default != inspect.Parameter.empty:
-            formatted_parameter += " = " + repr(parameter.default)
+        if default is not None:
+            formatted_parameter += " = " + default
 
         formatted_parameters.append(formatted_parameter)
 
     # Try single-line signature first.
     formatted_signature = f"{name}({', '.join(formatted_parameters)})"
-    if signature.return_annotation != inspect.Signature.empty:
-        formatted_signature += f" -> {format_annotation(signature.return_annotation)}"
+    if return_annotation is not None:
+        formatted_signature += f" -> {return_annotation}"
 
     # If the signature is too long, wrap it at the commas.
     if len(formatted_signature) > MAX_FORMATTED_SIGNATURE_LENGTH:
@@ -243,10 +1048,8 @@ def format_signature(obj: Union[FunctionType, type], name: str) -> str:
             formatted_signature += f"    {formatted_parameter},\n"
         formatted_signature += ")"
 
-        if signature.return_annotation != inspect.Signature.empty:
-            formatted_signature += (
-                f" -> {format_annotation(signature.return_annotation)}"
-            )
+        if return_annotation is not None:
+            formatted_signature += f" -> {return_annotation}"
 
     return formatted_signature
 
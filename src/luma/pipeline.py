@@ -0,0 +1,105 @@
+"""Dependency-aware scheduler for the steps of a CLI command.
+
+Steps form a DAG. Each step runs on a thread pool as soon as all of the steps it
+depends on have finished, so independent steps (for example, `npm install` and
+reference generation) overlap. While profiling, steps run one at a time instead, so
+that the profile can report the peak memory of each step.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .profiling import is_profiling, profile_phase
+
+logger = logging.getLogger(__name__)
+
+
+class _Step:
+    def __init__(self, name: str, fn: Callable[..., Any], after: Sequence[str]):
+        self.name = name
+        self.fn = fn
+        self.after = list(after)
+
+
+class Pipeline:
+    """A DAG of named steps.
+
+    Each step is called with the results of the steps it depends on, in the order
+    they're listed in `after`.
+
+    Examples:
+        >>> pipeline = Pipeline()
+        >>> pipeline.add_step("a", lambda: 1)
+        >>> pipeline.add_step("b", lambda: 2)
+        >>> pipeline.add_step("sum", lambda a, b: a + b, after=["a", "b"])
+        >>> pipeline.run()["sum"]
+        3
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, _Step] = {}
+
+    def add_step(
+        self, name: str, fn: Callable[..., Any], *, after: Sequence[str] = ()
+    ) -> None:
+        assert name not in self._steps, f"Duplicate step: {name}"
+        for dependency in after:
+            # Requiring dependencies to be added first also rules out cycles.
+            assert dependency in self._steps, f"Unknown dependency: {dependency}"
+
+        self._steps[name] = _Step(name, fn, after)
+
+    def run(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Run all steps and return their results by name.
+
+        If a step raises an exception, the pipeline doesn't start any new steps,
+        waits for the running steps to finish, and re-raises the exception.
+
+        While profiling, steps run one at a time regardless of `max_workers`.
+        """
+        if is_profiling():
+            # `tracemalloc` can't attribute memory to steps that overlap.
+            max_workers = 1
+
+        results: Dict[str, Any] = {}
+        pending = dict(self._steps)
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for step in self._pop_ready_steps(pending, results):
+                    args = [results[dependency] for dependency in step.after]
+                    future = executor.submit(self._run_step, step, args)
+                    running[future] = step.name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    exception = future.exception()
+                    if exception is not None:
+                        pending.clear()
+                        wait(running)
+                        raise exception
+
+                    results[name] = future.result()
+
+        return results
+
+    def _pop_ready_steps(
+        self, pending: Dict[str, _Step], results: Dict[str, Any]
+    ) -> List[_Step]:
+        ready = [
+            step
+            for step in pending.values()
+            if all(dependency in results for dependency in step.after)
+        ]
+        for step in ready:
+            del pending[step.name]
+        return ready
+
+    @staticmethod
+    def _run_step(step: _Step, args: List[Any]) -> Any:
+        logger.debug(f"Starting step '{step.name}'")
+        with profile_phase(step.name):
+            return step.fn(*args)
@@ -0,0 +1,255 @@
+"""Phase-level profiling for the CLI pipeline.
+
+When profiling is enabled with `--profile`, each `profile_phase` block records its wall
+time, CPU time and the peak memory it allocated, as traced by `tracemalloc`. At the end
+of the command, Luma writes the phases as a Chrome trace (open it in chrome://tracing
+or https://ui.perfetto.dev) and prints a summary table.
+
+`tracemalloc` traces the whole process, so the peak memory of a phase that overlaps
+with phases on other threads can't be attributed to it. To report the peak memory of
+each step, pipelines run their steps one at a time while profiling. Any phases that
+still overlap only report their times, and the summary reports the peak of the whole
+run.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+from rich.console import Console
+from rich.table import Table
+
+PROFILE_FILENAME = "luma-profile.json"
+
+logger = logging.getLogger(__name__)
+
+_active_profiler: Optional["Profiler"] = None
+
+
+class PhaseRecord(BaseModel):
+    name: str
+    depth: int
+    thread_id: int
+    start: float
+    wall_time: float
+    cpu_time: float
+    # `None` if the phase overlapped with phases on other threads.
+    peak_memory: Optional[int]
+
+
+class _OpenPhase:
+    def __init__(self, name: str, baseline_memory: int):
+        self.name = name
+        self.thread_id = threading.get_ident()
+        self.baseline_memory = baseline_memory
+        self.peak_memory = baseline_memory
+        # Whether a phase on another thread was open at the same time.
+        self.overlaps = False
+
+
+class Profiler:
+    """Records the phases of a single CLI command."""
+
+    def __init__(self):
+        self.records: List[PhaseRecord] = []
+        # The peak memory of the whole run, which overlapping phases don't affect.
+        self.peak_memory = 0
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open_phases: List[_OpenPhase] = []
+
+    def _stack(self) -> List[_OpenPhase]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+
+        with self._lock:
+            # `tracemalloc` only tracks a single peak, so we fold the peak seen so far
+            # into the enclosing phase and the run before resetting it for this one.
+            current_memory, peak = self._get_traced_memory()
+            current = _OpenPhase(name, current_memory)
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, peak)
+            tracemalloc.reset_peak()
+
+            # Resetting the peak also resets it for phases on other threads.
+            for open_phase in self._open_phases:
+                if open_phase.thread_id != current.thread_id:
+                    open_phase.overlaps = current.overlaps = True
+            self._open_phases.append(current)
+
+        stack.append(current)
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start
+            cpu_time = time.thread_time() - cpu_start
+            stack.pop()
+
+            with self._lock:
+                self._open_phases.remove(current)
+                _, peak = self._get_traced_memory()
+            current.peak_memory = max(current.peak_memory, peak)
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, current.peak_memory)
+                stack[-1].overlaps = stack[-1].overlaps or current.overlaps
+
+            record = PhaseRecord(
+                name=name,
+                depth=len(stack),
+                thread_id=threading.get_ident(),
+                start=start - self._origin,
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                # Report the memory allocated on top of what was already in use
+                # when the phase started.
+                peak_memory=(
+                    None
+                    if current.overlaps
+                    else current.peak_memory - current.baseline_memory
+                ),
+            )
+            with self._lock:
+                self.records.append(record)
+
+    def _get_traced_memory(self) -> Tuple[int, int]:
+        current_memory, peak = tracemalloc.get_traced_memory()
+        self.peak_memory = max(self.peak_memory, peak)
+        return current_memory, peak
+
+    def finish(self) -> None:
+        """Record the peak memory since the last phase started or ended."""
+        with self._lock:
+            self._get_traced_memory()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return the recorded phases in the Chrome trace event format."""
+        events = []
+        for record in sorted(self.records, key=lambda record: record.start):
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": "luma",
+                    "ph": "X",
+                    "ts": record.start * 1e6,
+                    "dur": record.wall_time * 1e6,
+                    "pid": os.getpid(),
+                    "tid": record.thread_id,
+                    "args": {
+                        "cpu_time_ms": round(record.cpu_time * 1e3, 3),
+                        "peak_memory_bytes": record.peak_memory,
+                        "overlaps_other_threads": record.peak_memory is None,
+                    },
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as file:
+            logger.debug(f"Writing profile to '{path}'")
+            json.dump(self.to_chrome_trace(), file)
+
+    def _records_in_tree_order(self) -> List[PhaseRecord]:
+        # Phases can run concurrently on different threads, so sorting by start time
+        # alone could separate a nested phase from its parent.
+        root_starts: Dict[int, float] = {}
+        keys = {}
+        for index, record in sorted(
+            enumerate(self.records), key=lambda item: item[1].start
+        ):
+            if record.depth == 0:
+                root_starts[record.thread_id] = record.start
+            keys[index] = (
+                root_starts.get(record.thread_id, record.start),
+                record.start,
+            )
+
+        return [self.records[index] for index in sorted(keys, key=lambda i: keys[i])]
+
+    def print_summary(self, console: Console) -> None:
+        table = Table(
+            title="Profile",
+            caption=(
+                "Peak memory is shown as '-' for phases that overlapped with phases "
+                "on other threads, because it can't be attributed to them. Peak "
+                f"allocated during the whole run: {self.peak_memory / 2**20:.1f} MB."
+            ),
+        )
+        table.add_column("Phase")
+        table.add_column("Wall time (s)", justify="right")
+        table.add_column("CPU time (s)", justify="right")
+        table.add_column("Peak allocated (MB)", justify="right")
+
+        for record in self._records_in_tree_order():
+            table.add_row(
+                "  " * record.depth + record.name,
+                f"{record.wall_time:.3f}",
+                f"{record.cpu_time:.3f}",
+                (
+                    "-"
+                    if record.peak_memory is None
+                    else f"{record.peak_memory / 2**20:.1f}"
+                ),
+            )
+
+        console.print(table)
+
+
+def is_profiling() -> bool:
+    """Whether profiling is enabled for the current CLI command."""
+    return _active_profiler is not None
+
+
+@contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """Record a phase if profiling is enabled. Otherwise, do nothing."""
+    if _active_profiler is None:
+        yield
+        return
+
+    with _active_profiler.phase(name):
+        yield
+
+
+@contextmanager
+def profiling(enabled: bool, output_dir: str) -> Iterator[Optional[Profiler]]:
+    """Enable profiling for the duration of a CLI command.
+
+    Args:
+        enabled: Whether to profile. If `False`, this context manager does nothing.
+        output_dir: The directory to write the Chrome trace to.
+    """
+    global _active_profiler
+
+    if not enabled:
+        yield None
+        return
+
+    assert _active_profiler is None, "Profiling is already enabled."
+    profiler = Profiler()
+    _active_profiler = profiler
+    tracemalloc.start()
+    try:
+        yield profiler
+    finally:
+        profiler.finish()
+        tracemalloc.stop()
+        _active_profiler = None
+
+        output_path = os.path.join(output_dir, PROFILE_FILENAME)
+        profiler.write_chrome_trace(output_path)
+        profiler.print_summary(Console())
+        logger.info(f"Wrote profile to '{output_path}'.")
@@ -4,11 +4,64 @@ This module provides utilities for converting RST-formatted text (commonly found
 Python docstrings) to Markdown format suitable for rendering in documentation.
 """
 
-from typing import List, Optional
-
-from docutils import nodes
-from docutils.core import publish_doctree
-from docutils.utils import SystemMessage
+import logging
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from docutils import io, nodes
+from docutils.core import Publisher
+from docutils.frontend import Values
+from docutils.parsers.rst import Parser, states
+
+logger = logging.getLogger(__name__)
+
+# Bump this whenever a change to the converter changes its output. Cached renders are
+# keyed by this version and the settings below.
+CONVERTER_VERSION = 1
+SETTINGS_OVERRIDES = {
+    "report_level": 1,  # Suppress warnings
+    "halt_level": 5,  # Don't halt on errors
+}
+
+# Text that matches this pattern might contain markup. Everything else is plain text,
+# which docutils turns into paragraphs without changing the text. The checks are
+# deliberately conservative: a false positive only costs a docutils parse.
+_POSSIBLE_MARKUP = re.compile(
+    r"""
+    [*`|\\@]                                      # Inline markup, escapes, emails
+    | (?<![^\W_])_ | _(?![^\W_])                  # Underscores outside of words
+    | :(?!\s|$)                                   # Roles, field lists, URIs and '::'
+    | [\t\r\v\f\x00\x1c-\x1e\x85\u2028\u2029]     # Tabs, line breaks and nulls
+    | ^[^\S\n]                                    # Block quotes and definitions
+    | ^[-+*/>#•‣⁃]                                # Bullets, options and doctests
+    | ^\.\.                                       # Directives, comments, targets
+    | ^\(?(?:\d+|[A-Za-z]|[IVXLCDM]+|[ivxlcdm]+|\#)[.)](?:\s|$)  # Enumerated lists
+    | ^[^\w\n]+$                                  # Section adornments, transitions
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# Batches separate fragments with comments like '.. luma-fragment-0'.
+FRAGMENT_MARKER = "luma-fragment"
+
+# Fragments that match this pattern can affect, or be affected by, other fragments in
+# the same document. For example, docutils numbers footnotes and reports unknown
+# targets per document, and the error for an unknown directive quotes the source up to
+# the next block. Batches convert these fragments separately.
+_DOCUMENT_SCOPED_MARKUP = re.compile(
+    r"""
+    (?<![^\W_])_ | _(?![^\W_])                    # Targets, references and footnotes
+    | \|                                          # Substitutions
+    | ^[^\w\n]+$                                  # Sections, transitions and tables
+    | \A:                                         # Bibliographic fields
+    | ^[^\S\n]*\.\.(?![^\S\n]+(?:note|warning|tip|important|caution|attention|danger
+        |error|hint)::)                           # Explicit markup except admonitions
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
 
 
 def convert_rst_to_markdown(rst_text: Optional[str]) -> Optional[str]:
@@ -20,77 +73,229 @@ def convert_rst_to_markdown(rst_text: Optional[str]) -> Optional[str]:
     Returns:
         Markdown-formatted text, or None if input was None.
     """
-    if rst_text is None:
-        return None
+    global _default_converter
 
-    # Check if input contains newlines before stripping
-    has_newlines = "\n" in rst_text
-    rst_text = rst_text.strip()
-    if not rst_text:
-        # Empty/whitespace without newlines returns "", with newlines returns None
-        return None if has_newlines else ""
+    if _default_converter is None:
+        _default_converter = RstConverter()
 
-    try:
-        # Parse RST into docutils document tree
-        import sys
-
-        from docutils.parsers.rst import roles
-
-        # Register Sphinx cross-reference roles
-        def sphinx_ref_role(
-            role, rawtext, text, lineno, inliner, options={}, content=[]
-        ):
-            """Convert Sphinx cross-references to reference nodes.
-
-            :class:`module.MyClass` → [module.MyClass](module.MyClass)
-            :class:`Custom <module.MyClass>` → [Custom](module.MyClass)
-            """
-            # Extract the actual reference text (handle `text <target>` syntax)
-            if "<" in text and ">" in text:
-                # Handle :class:`Custom Text <module.MyClass>`
-                display_text = text[: text.index("<")].strip()
-                target = text[text.index("<") + 1 : text.index(">")].strip()
-            else:
-                # Simple case: :class:`module.MyClass`
-                display_text = text
-                target = text
-
-            # Create a reference node
-            ref_node = nodes.reference(rawtext, display_text, refuri=target)
-            return [ref_node], []
-
-        # Register common Sphinx roles
-        sphinx_roles_list = [
-            "class",
-            "func",
-            "meth",
-            "mod",
-            "attr",
-            "exc",
-            "obj",
-            "data",
-            "const",
-            "py:class",
-            "py:func",
-            "py:meth",
-            "py:mod",
-            "py:attr",
-            "py:exc",
-            "py:obj",
-            "py:data",
-            "py:const",
-        ]
-        for role_name in sphinx_roles_list:
-            roles.register_local_role(role_name, sphinx_ref_role)
-
-        doctree = publish_doctree(
-            rst_text,
-            settings_overrides={
-                "report_level": 1,  # Suppress warnings
-                "halt_level": 5,  # Don't halt on errors
-                "Warning_stream": sys.stdout,
-            },
+    return _default_converter.convert(rst_text)
+
+
+def convert_rst_batch(rst_texts: Sequence[Optional[str]]) -> List[Optional[str]]:
+    """Convert several reStructuredText fragments to Markdown in one docutils parse.
+
+    Args:
+        rst_texts: RST-formatted fragments to convert. Each can be None.
+
+    Returns:
+        The Markdown for each fragment, as `convert_rst_to_markdown` would return it.
+    """
+    global _default_converter
+
+    if _default_converter is None:
+        _default_converter = RstConverter()
+
+    return _default_converter.convert_batch(rst_texts)
+
+
+def sphinx_ref_role(role, rawtext, text, lineno, inliner, options={}, content=[]):
+    """Convert Sphinx cross-references to reference nodes.
+
+    :class:`module.MyClass` → [module.MyClass](module.MyClass)
+    :class:`Custom <module.MyClass>` → [Custom](module.MyClass)
+    """
+    # Extract the actual reference text (handle `text <target>` syntax)
+    if "<" in text and ">" in text:
+        # Handle :class:`Custom Text <module.MyClass>`
+        display_text = text[: text.index("<")].strip()
+        target = text[text.index("<") + 1 : text.index(">")].strip()
+    else:
+        # Simple case: :class:`module.MyClass`
+        display_text = text
+        target = text
+
+    # Create a reference node
+    ref_node = nodes.reference(rawtext, display_text, refuri=target)
+    return [ref_node], []
+
+
+# Common Sphinx roles
+SPHINX_ROLES = [
+    "class",
+    "func",
+    "meth",
+    "mod",
+    "attr",
+    "exc",
+    "obj",
+    "data",
+    "const",
+    "py:class",
+    "py:func",
+    "py:meth",
+    "py:mod",
+    "py:attr",
+    "py:exc",
+    "py:obj",
+    "py:data",
+    "py:const",
+]
+
+
+class RstConverter:
+    """Converts reStructuredText to Markdown.
+
+    Setting up docutils (building the option parser, reading config files and
+    instantiating the reader and parser) costs much more than parsing a typical
+    docstring. The converter does it once and reuses the same settings, reader and
+    parser for every conversion.
+
+    The converter is thread-safe. Each thread parses with its own publisher and a copy
+    of the settings, and the Sphinx roles are resolved from a table that belongs to
+    the converter, so converting doesn't change docutils' global role registry.
+
+    Examples:
+        >>> converter = RstConverter()
+        >>> converter.convert("Use **bold** for emphasis")
+        'Use **bold** for emphasis'
+    """
+
+    def __init__(self):
+        self._roles = {role_name: sphinx_ref_role for role_name in SPHINX_ROLES}
+
+        # This is the same setup as `publish_doctree`.
+        publisher = Publisher(
+            source_class=io.StringInput, destination_class=io.NullOutput
+        )
+        publisher.set_components("standalone", "restructuredtext", "null")
+        publisher.process_programmatic_settings(
+            settings_spec=None,
+            settings_overrides={**SETTINGS_OVERRIDES, "Warning_stream": sys.stdout},
+            config_section=None,
         )
+        self._settings = publisher.settings
+        self._local = threading.local()
+
+    @property
+    def settings(self) -> Values:
+        """The docutils runtime settings. Don't modify them."""
+        return self._settings
+
+    def _get_publisher(self) -> Publisher:
+        publisher = getattr(self._local, "publisher", None)
+        if publisher is None:
+            # Docutils writes to the settings while it parses, so each thread needs
+            # its own copy.
+            publisher = Publisher(
+                parser=Parser(),
+                settings=self._settings.copy(),
+                source_class=io.StringInput,
+                destination_class=io.NullOutput,
+            )
+            publisher.set_components("standalone", "restructuredtext", "null")
+            publisher.set_destination()
+            self._local.publisher = publisher
+        return publisher
+
+    def convert(self, rst_text: Optional[str]) -> Optional[str]:
+        """Convert reStructuredText to Markdown.
+
+        Args:
+            rst_text: RST-formatted text to convert. Can be None.
+
+        Returns:
+            Markdown-formatted text, or None if input was None.
+        """
+        if rst_text is None:
+            return None
+
+        # Check if input contains newlines before stripping
+        has_newlines = "\n" in rst_text
+        rst_text = rst_text.strip()
+        if not rst_text:
+            # Empty/whitespace without newlines returns "", with newlines returns None
+            return None if has_newlines else ""
+
+        # Most summaries and argument descriptions don't contain any markup, so skip
+        # docutils for them.
+        if is_plain_text(rst_text):
+            return _convert_plain_text(rst_text)
+
+        return self._convert_with_docutils(rst_text)
+
+    def convert_batch(self, rst_texts: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """Convert several reStructuredText fragments to Markdown.
+
+        The fragments that need docutils are joined into a single document, separated
+        by marker comments, so that docutils parses them all at once. The Markdown
+        writer then splits the output at the markers.
+
+        Args:
+            rst_texts: RST-formatted fragments to convert. Each can be None.
+
+        Returns:
+            The Markdown for each fragment, as `convert` would return it.
+        """
+        results: List[Optional[str]] = [None] * len(rst_texts)
+        batch: List[Tuple[int, str]] = []
+        for index, rst_text in enumerate(rst_texts):
+            stripped = rst_text.strip() if rst_text is not None else ""
+            if (
+                not stripped
+                or is_plain_text(stripped)
+                or _DOCUMENT_SCOPED_MARKUP.search(stripped)
+            ):
+                results[index] = self.convert(rst_text)
+            else:
+                batch.append((index, stripped))
+
+        if len(batch) == 1:
+            [(index, rst_text)] = batch
+            results[index] = self._convert_with_docutils(rst_text)
+        elif batch:
+            source = "\n\n".join(
+                f".. {FRAGMENT_MARKER}-{number}\n\n{rst_text}"
+                for number, (_, rst_text) in enumerate(batch)
+            )
+            doctree = self._parse(source)
+            visitor = _FragmentWriter(doctree)
+            doctree.walkabout(visitor)
+
+            if len(visitor.fragments) == len(batch):
+                for (index, _), output in zip(batch, visitor.fragments):
+                    result = "".join(output).strip()
+                    results[index] = result if result else None
+            else:
+                # A fragment swallowed the marker after it, for example by leaving a
+                # construct open. Fall back to converting the fragments one by one.
+                logger.debug("Couldn't split batch. Converting fragments separately.")
+                for index, rst_text in batch:
+                    results[index] = self._convert_with_docutils(rst_text)
+
+        return results
+
+    def convert_many(
+        self, rst_texts: Sequence[Optional[str]], max_workers: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """Convert reStructuredText fragments to Markdown on a thread pool.
+
+        Docutils is pure Python, so threads mostly help when the caller is already
+        multi-threaded or the fragments are few and large. For many small fragments
+        in one thread, `convert_batch` is usually faster.
+
+        Args:
+            rst_texts: RST-formatted fragments to convert. Each can be None.
+            max_workers: The maximum number of threads.
+
+        Returns:
+            The Markdown for each fragment, in the same order as `rst_texts`.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.convert, rst_texts))
+
+    def _convert_with_docutils(self, rst_text: str) -> Optional[str]:
+        # Parse RST into docutils document tree
+        doctree = self._parse(rst_text)
 
         # Convert document tree to Markdown
         visitor = MarkdownWriter(doctree)
@@ -99,10 +304,50 @@ def convert_rst_to_markdown(rst_text: Optional[str]) -> Optional[str]:
         result = "".join(visitor.output).strip()
         return result if result else None
 
-    except SystemMessage:
-        # If RST parsing fails, return the original text
-        raise
-        return rst_text
+    def _parse(self, rst_text: str) -> nodes.document:
+        publisher = self._get_publisher()
+        # The inline parser accumulates state across documents, so like docutils, use
+        # a new one for each document.
+        publisher.parser.inliner = _create_inliner(self._roles)
+        publisher.set_source(rst_text)
+        publisher.publish()
+        return publisher.document
+
+
+_default_converter: Optional[RstConverter] = None
+
+
+def is_plain_text(rst_text: str) -> bool:
+    """Return whether docutils would render text as plain paragraphs.
+
+    Args:
+        rst_text: Stripped RST-formatted text.
+
+    Returns:
+        `True` if the text can't contain markup, or `False` if it might.
+    """
+    return _POSSIBLE_MARKUP.search(rst_text) is None
+
+
+def _convert_plain_text(text: str) -> str:
+    """Convert text without markup the same way docutils and `MarkdownWriter` would.
+
+    Docutils strips trailing whitespace from each line, and each run of non-blank
+    lines becomes a paragraph.
+    """
+    paragraphs = []
+    lines: List[str] = []
+    for line in text.split("\n"):
+        line = line.rstrip()
+        if line:
+            lines.append(line)
+        elif lines:
+            paragraphs.append("\n".join(lines))
+            lines = []
+    if lines:
+        paragraphs.append("\n".join(lines))
+
+    return "\n\n".join(paragraphs)
 
 
 class MarkdownWriter(nodes.NodeVisitor):
@@ -312,3 +557,41 @@ class MarkdownWriter(nodes.NodeVisitor):
             self.output.append(f"> {line}\n")
         self.output.append("\n")
         raise nodes.SkipNode
+
+
+class _FragmentWriter(MarkdownWriter):
+    """Markdown writer that splits a batch document at its marker comments."""
+
+    def __init__(self, document: nodes.document):
+        super().__init__(document)
+        self.fragments: List[List[str]] = []
+
+    def visit_comment(self, node: nodes.Node) -> None:
+        marker = f"{FRAGMENT_MARKER}-{len(self.fragments)}"
+        if node.parent is not self.document or node.astext() != marker:
+            # Other comments render like they do in `MarkdownWriter`.
+            return
+
+        # Start a fresh output, so each fragment renders as if it were a document.
+        self.output = []
+        self.fragments.append(self.output)
+        raise nodes.SkipNode
+
+
+def _create_inliner(local_roles: Dict[str, Callable]) -> states.Inliner:
+    """Return an inline parser that resolves roles from a table before the registry."""
+    # `Inliner` builds its patterns from the attributes of its own class, so override
+    # the method on the instance rather than in a subclass.
+    inliner = states.Inliner()
+    resolve_with_registry = inliner.interpreted
+
+    def interpreted(rawsource, text, role, lineno):
+        # Docutils' registry lowercases role names, so do the same.
+        role_fn = local_roles.get(role.lower())
+        if role_fn is None:
+            return resolve_with_registry(rawsource, text, role, lineno)
+
+        return role_fn(role, rawsource, text, lineno, inliner)
+
+    inliner.interpreted = interpreted
+    return inliner
@@ -0,0 +1,124 @@
+"""Find the pages and static assets of a project in a single directory walk."""
+
+import logging
+import os
+from typing import List, Optional, Set
+
+from pathspec import PathSpec
+from pydantic import BaseModel, PrivateAttr
+
+STATIC_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".ico", ".svg")
+# Luma's own scaffold and version control internals never contain project content.
+PRUNED_DIRECTORIES = {".luma", ".git"}
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectInventory(BaseModel):
+    """The files of a project, as paths relative to the project root."""
+
+    pages: List[str]
+    assets: List[str]
+    directories: List[str]
+
+    _page_set: Set[str] = PrivateAttr(default_factory=set)
+
+    def model_post_init(self, __context) -> None:
+        self._page_set = set(self.pages)
+
+    def has_page(self, relative_path: str) -> bool:
+        """Return whether the scan found a page at the given relative path."""
+        return os.path.normpath(relative_path) in self._page_set
+
+
+def scan_project(project_root: str) -> ProjectInventory:
+    """Walk the project once and classify its files into pages and static assets.
+
+    The walk doesn't descend into '.luma', '.git' or directories that the project's
+    '.gitignore' ignores. Static assets that '.gitignore' ignores are skipped too.
+
+    Args:
+        project_root: The project root directory.
+
+    Returns:
+        The pages, static assets and directories of the project, sorted by path.
+    """
+    ignore_spec = load_ignore_spec(project_root)
+
+    pages = []
+    assets = []
+    directories = []
+    for dir_path, dir_names, filenames in os.walk(project_root):
+        relative_dir = os.path.relpath(dir_path, project_root)
+        if relative_dir == os.curdir:
+            relative_dir = ""
+        directories.append(relative_dir)
+
+        # Prune in place so that `os.walk` doesn't descend into these directories.
+        dir_names[:] = sorted(
+            name
+            for name in dir_names
+            if name not in PRUNED_DIRECTORIES
+            and not _is_ignored(ignore_spec, os.path.join(relative_dir, name) + "/")
+        )
+
+        for filename in sorted(filenames):
+            relative_path = os.path.join(relative_dir, filename)
+            kind = _classify_file(ignore_spec, relative_path)
+            if kind == "page":
+                pages.append(relative_path)
+            elif kind == "asset":
+                assets.append(relative_path)
+
+    logger.debug(
+        f"Found {len(pages)} pages and {len(assets)} static assets in "
+        f"{len(directories)} directories"
+    )
+    return ProjectInventory(pages=pages, assets=assets, directories=directories)
+
+
+def classify_path(ignore_spec: Optional[PathSpec], relative_path: str) -> Optional[str]:
+    """Classify a single file the way `scan_project` would.
+
+    Args:
+        ignore_spec: The project's '.gitignore' rules, from `load_ignore_spec`
+        relative_path: The path of the file relative to the project root
+
+    Returns:
+        "page", "asset", or `None` if the scan would skip the file
+    """
+    directories = os.path.normpath(relative_path).split(os.sep)[:-1]
+    for index, name in enumerate(directories):
+        if name in PRUNED_DIRECTORIES or _is_ignored(
+            ignore_spec, os.path.join(*directories[: index + 1]) + "/"
+        ):
+            return None
+
+    return _classify_file(ignore_spec, relative_path)
+
+
+def _classify_file(
+    ignore_spec: Optional[PathSpec], relative_path: str
+) -> Optional[str]:
+    if relative_path.endswith(".md"):
+        return "page"
+    if relative_path.endswith(STATIC_EXTENSIONS) and not _is_ignored(
+        ignore_spec, relative_path
+    ):
+        return "asset"
+    return None
+
+
+def load_ignore_spec(project_root: str) -> Optional[PathSpec]:
+    ignore_path = os.path.join(project_root, ".gitignore")
+
+    if not os.path.exists(ignore_path):
+        logger.debug("No .gitignore found")
+        return None
+
+    with open(ignore_path, "r") as file:
+        return PathSpec.from_lines("gitwildmatch", file)
+
+
+def _is_ignored(ignore_spec: Optional[PathSpec], relative_path: str) -> bool:
+    return ignore_spec is not None and ignore_spec.match_file(relative_path)
@@ -1,8 +1,10 @@
+import functools
+import gzip
+import hashlib
 import json
 import logging
 import os
-import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 
 from .config import (
     ResolvedConfig,
@@ -11,7 +13,29 @@ from .config import (
     ResolvedSection,
     ResolvedTab,
 )
+from .cache import get_cache_root
+from .markdown import scan_markdown
+from .minisearch import SERIALIZATION_VERSION, build_index
 from .node import get_node_root
+from .utils import write_if_changed
+
+# These must match the options that 'SearchBar.tsx' loads the index with.
+SEARCH_FIELDS = ["title", "heading", "content"]
+STORED_FIELDS = ["title", "path", "section", "heading", "headingLevel", "type"]
+# The documents the index was built from, so that `update_search_index` can reuse
+# the entries of unchanged pages.
+SEARCH_DOCUMENTS_FILENAME = "search-documents.json"
+# The index is split into shards in 'public/', which the search bar fetches the first
+# time it gets focus, so that the index isn't part of every page's JavaScript.
+SEARCH_SHARDS_DIRNAME = "search-index"
+# Each tab, or each section in sites without tabs, gets its own shards, and groups
+# with more documents than this are split further.
+MAX_DOCUMENTS_PER_SHARD = 2000
+# Page entries store the start of the page's text, and heading entries none.
+CONTENT_PREVIEW_LENGTH = 300
+MAX_INDEXED_HEADING_LEVEL = 3
+# The version of the compact shard format that `decodeShard` in 'SearchBar.tsx' reads.
+SHARD_FORMAT_VERSION = 1
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +43,10 @@ logger = logging.getLogger(__name__)
 def build_search_index(project_root: str, config: ResolvedConfig) -> None:
     """Build a search index from all documentation pages.
 
+    The index is written in MiniSearch's serialized format, so the browser only has to
+    load it instead of indexing every document. It's split into shards named after the
+    hash of their content, and 'data/search-index.json' lists their URLs.
+
     Args:
         project_root: The root directory of the documentation project.
         config: The resolved configuration object.
@@ -26,79 +54,329 @@ def build_search_index(project_root: str, config: ResolvedConfig) -> None:
     node_path = get_node_root(project_root)
     pages_path = os.path.join(node_path, "pages")
 
-    search_docs = []
-
-    # Index regular documentation pages
-    for item in _flatten_navigation(config.navigation):
-        if isinstance(item, ResolvedPage):
-            page_path = os.path.join(pages_path, item.path)
-            if os.path.exists(page_path):
-                docs = _extract_page_content(
-                    page_path, item.path, item.title, item.section, doc_type="page"
-                )
-                search_docs.extend(docs)
-        elif isinstance(item, ResolvedReference):
-            # Index API reference pages
-            page_path = os.path.join(pages_path, item.relative_path)
-            if os.path.exists(page_path):
-                docs = _extract_page_content(
-                    page_path,
-                    item.relative_path,
-                    item.title,
-                    item.section,
-                    doc_type="reference",
-                )
-                search_docs.extend(docs)
+    indexed_pages = [
+        (page, _index_page(pages_path, page))
+        for page in _list_search_pages(config.navigation)
+    ]
+    _write_search_index(project_root, indexed_pages)
 
-    # Write search index
-    output_path = os.path.join(node_path, "data", "search-index.json")
-    with open(output_path, "w") as f:
-        logger.debug(f"Writing search index to '{output_path}'")
-        json.dump(search_docs, f)
 
+def update_search_index(
+    project_root: str, config: ResolvedConfig, changed_paths: Set[str]
+) -> None:
+    """Update the search index after some pages changed.
 
-def _flatten_navigation(items: List[Any]) -> List[Any]:
-    """Flatten the navigation tree into a list of pages and references.
+    Entries of unchanged pages are copied from the existing index, so only the changed
+    pages are read again. The result is the same as rebuilding the whole index.
 
     Args:
-        items: List of navigation items (pages, sections, tabs, references).
+        project_root: The root directory of the documentation project.
+        config: The resolved configuration object.
+        changed_paths: The relative paths of the pages and references whose content
+            changed.
+    """
+    node_path = get_node_root(project_root)
+    pages_path = os.path.join(node_path, "pages")
 
-    Returns:
-        Flattened list of ResolvedPage and ResolvedReference objects.
+    try:
+        with open(_get_search_documents_path(project_root)) as f:
+            existing_docs = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Rebuilding unreadable search index: {e}")
+        build_search_index(project_root, config)
+        return
+
+    docs_by_page: Dict[str, List[Dict[str, Any]]] = {}
+    for doc in existing_docs:
+        docs_by_page.setdefault(doc["id"].split("#")[0], []).append(doc)
+
+    indexed_pages = []
+    reindexed = 0
+    for page in _list_search_pages(config.navigation):
+        docs = docs_by_page.get(_get_url_path(page.relative_path))
+        # The entries also embed the title and section, which can change without the
+        # page content changing.
+        if (
+            page.relative_path in changed_paths
+            or not docs
+            or docs[0]["title"] != page.title
+            or docs[0]["section"] != (page.section or "")
+        ):
+            docs = _index_page(pages_path, page)
+            reindexed += 1
+        indexed_pages.append((page, docs))
+
+    logger.debug(f"Reindexed {reindexed} pages")
+    _write_search_index(project_root, indexed_pages)
+
+
+def search_index_exists(project_root: str) -> bool:
+    """Check that the manifest and every shard it lists exist.
+
+    The precompressed siblings of the shards must exist too.
+
+    Args:
+        project_root: The root directory of the documentation project.
     """
-    result = []
+    try:
+        with open(_get_search_index_path(project_root)) as f:
+            urls = json.load(f)["shards"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+    public_path = os.path.join(get_node_root(project_root), "public")
+    return all(
+        os.path.exists(os.path.join(public_path, url.lstrip("/")) + suffix)
+        for url in urls
+        for suffix in ["", *_get_compressors()]
+    )
+
+
+class _SearchPage(NamedTuple):
+    relative_path: str
+    title: str
+    section: Optional[str]
+    doc_type: str
+    # The tab or section whose shards include the page.
+    shard_group: str
+
+
+def _list_search_pages(
+    items: List[Any], shard_group: Optional[str] = None
+) -> List[_SearchPage]:
+    """List the pages to index, including the API pages of split references."""
+    pages = []
     for item in items:
-        if isinstance(item, (ResolvedPage, ResolvedReference)):
-            result.append(item)
+        if isinstance(item, ResolvedTab):
+            pages.extend(_list_search_pages(item.contents, item.title))
         elif isinstance(item, ResolvedSection):
-            result.extend(_flatten_navigation(item.contents))
-        elif isinstance(item, ResolvedTab):
-            result.extend(_flatten_navigation(item.contents))
-    return result
+            group = shard_group if shard_group is not None else item.title
+            pages.extend(_list_search_pages(item.contents, group))
+        elif isinstance(item, ResolvedPage):
+            pages.append(
+                _SearchPage(
+                    item.path, item.title, item.section, "page", shard_group or ""
+                )
+            )
+        elif isinstance(item, ResolvedReference):
+            group = shard_group or ""
+            pages.append(
+                _SearchPage(
+                    item.relative_path, item.title, item.section, "reference", group
+                )
+            )
+            if item.split:
+                # API pages are grouped under their reference, like pages under a
+                # section.
+                pages.extend(
+                    _SearchPage(
+                        item.get_api_path(api), api, item.title, "reference", group
+                    )
+                    for api in item.apis
+                )
+    return pages
 
 
-def _slugify(text: str) -> str:
-    """Convert heading text to URL-friendly slug.
+def _index_page(pages_path: str, page: _SearchPage) -> List[Dict[str, Any]]:
+    page_path = os.path.join(pages_path, page.relative_path)
+    if not os.path.exists(page_path):
+        return []
 
-    Args:
-        text: The heading text to slugify.
+    return _extract_page_content(
+        page_path, page.relative_path, page.title, page.section, doc_type=page.doc_type
+    )
 
-    Returns:
-        URL-friendly slug.
+
+def _get_url_path(relative_path: str) -> str:
+    return "/" + relative_path.replace(".md", "")
+
+
+def _get_search_index_path(project_root: str) -> str:
+    return os.path.join(get_node_root(project_root), "data", "search-index.json")
+
+
+def _get_search_documents_path(project_root: str) -> str:
+    return os.path.join(get_cache_root(project_root), SEARCH_DOCUMENTS_FILENAME)
+
+
+def _write_search_index(
+    project_root: str, indexed_pages: List[Tuple[_SearchPage, List[Dict[str, Any]]]]
+) -> None:
+    # A page can be listed more than once, but MiniSearch needs the IDs within a shard
+    # to be unique, and `update_search_index` groups the stored documents by page.
+    docs_by_id: Dict[str, Dict[str, Any]] = {}
+    docs_by_group: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for page, docs in indexed_pages:
+        group_docs = docs_by_group.setdefault(page.shard_group, {})
+        for doc in docs:
+            docs_by_id.setdefault(doc["id"], doc)
+            group_docs.setdefault(doc["id"], doc)
+
+    search_docs = list(docs_by_id.values())
+    documents_path = _get_search_documents_path(project_root)
+    os.makedirs(os.path.dirname(documents_path), exist_ok=True)
+    # `json.dumps` uses the C encoder, while `json.dump` streams through the much
+    # slower pure-Python one.
+    write_if_changed(documents_path, json.dumps(search_docs))
+
+    shards_path = os.path.join(
+        get_node_root(project_root), "public", SEARCH_SHARDS_DIRNAME
+    )
+    os.makedirs(shards_path, exist_ok=True)
+    filenames = []
+    for group_docs in docs_by_group.values():
+        docs = list(group_docs.values())
+        for start in range(0, len(docs), MAX_DOCUMENTS_PER_SHARD):
+            filenames.append(
+                _write_search_shard(
+                    shards_path, docs[start : start + MAX_DOCUMENTS_PER_SHARD]
+                )
+            )
+
+    # Keep the precompressed siblings of the current shards.
+    current = {
+        filename + suffix
+        for filename in filenames
+        for suffix in ["", *_get_compressors()]
+    }
+    for filename in os.listdir(shards_path):
+        if filename not in current:
+            logger.debug(f"Removing stale search index shard '{filename}'")
+            os.remove(os.path.join(shards_path, filename))
+
+    output_path = _get_search_index_path(project_root)
+    manifest = {
+        "shards": [f"/{SEARCH_SHARDS_DIRNAME}/{filename}" for filename in filenames]
+    }
+    if write_if_changed(output_path, json.dumps(manifest)):
+        logger.debug(f"Wrote search index manifest to '{output_path}'")
+
+    _log_search_index_size(shards_path, filenames, documents_path)
+
+
+def _write_search_shard(shards_path: str, docs: List[Dict[str, Any]]) -> str:
+    """Write a shard of the index unless it exists, and return its filename."""
+    # The index only depends on the documents and the options, so name the shard
+    # after them. Unchanged shards then don't have to be indexed again.
+    digest = hashlib.sha256(
+        json.dumps(
+            [
+                SHARD_FORMAT_VERSION,
+                SERIALIZATION_VERSION,
+                SEARCH_FIELDS,
+                STORED_FIELDS,
+                docs,
+            ]
+        ).encode()
+    ).hexdigest()[:16]
+    filename = f"{digest}.json"
+    path = os.path.join(shards_path, filename)
+
+    data = None
+    if not os.path.exists(path):
+        data = json.dumps(_encode_shard(docs), separators=(",", ":")).encode()
+        write_if_changed(path, data)
+        logger.debug(f"Wrote search index shard '{filename}'")
+
+    # Static hosts like Nginx's `gzip_static` serve these instead of compressing the
+    # shard on every request.
+    for suffix, compress in _get_compressors().items():
+        if not os.path.exists(path + suffix):
+            if data is None:
+                with open(path, "rb") as f:
+                    data = f.read()
+            write_if_changed(path + suffix, compress(data))
+    return filename
+
+
+def _encode_shard(docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Index documents, and encode the index in Luma's compact shard format.
+
+    `MiniSearch.toJSON` stores every field of every document, so a page with 40
+    headings repeats its title, section and path 41 times. Instead, the strings are
+    interned in one table, and the fields of a page are stored once:
+
+    - `strings`: Every distinct path, title, section and type.
+    - `pages`: Columns of indices into `strings`, one row per page.
+    - `documents`: The page of each document, and the anchor, heading and heading
+      level of the documents of headings. Other documents have no heading.
+    - `index`: `MiniSearch.toJSON` without the IDs and stored fields, which
+      `decodeShard` in 'SearchBar.tsx' derives from the other tables.
     """
-    # Convert to lowercase
-    slug = text.lower()
-    # Remove inline code backticks
-    slug = re.sub(r"`([^`]+)`", r"\1", slug)
-    # Replace spaces and underscores with hyphens
-    slug = re.sub(r"[\s_]+", "-", slug)
-    # Remove non-alphanumeric chars except hyphens and dots
-    slug = re.sub(r"[^\w.-]", "", slug)
-    # Replace multiple consecutive hyphens with single hyphen
-    slug = re.sub(r"-+", "-", slug)
-    # Remove leading/trailing hyphens
-    slug = slug.strip("-")
-    return slug
+    index = build_index(docs, fields=SEARCH_FIELDS, store_fields=[])
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    pages: Dict[str, List[int]] = {"path": [], "title": [], "section": [], "type": []}
+    page_ids: Dict[Tuple[str, str, str, str], int] = {}
+    document_pages = []
+    headings: Dict[str, List[Any]] = {}
+    for short_id, doc in enumerate(docs):
+        page_path, _, anchor = doc["path"].partition("#")
+        key = (page_path, doc["title"], doc["section"], doc["type"])
+        page_id = page_ids.get(key)
+        if page_id is None:
+            page_id = page_ids[key] = len(page_ids)
+            for column, value in zip(pages.values(), key):
+                column.append(intern(value))
+        document_pages.append(page_id)
+        if doc["heading"]:
+            headings[str(short_id)] = [anchor, doc["heading"], doc["headingLevel"]]
+
+    # The decoder restores the fields that are implied by the number of documents.
+    for key in ["documentIds", "storedFields", "nextId", "dirtCount"]:
+        del index[key]
+    index["fieldLength"] = [index["fieldLength"][str(i)] for i in range(len(docs))]
+
+    return {
+        "version": SHARD_FORMAT_VERSION,
+        "strings": strings,
+        "pages": pages,
+        "documents": {"page": document_pages, "headings": headings},
+        "index": index,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _get_compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Return the functions to precompress shards with, by file extension."""
+    # `mtime=0` keeps the output deterministic, so rebuilds don't rewrite it.
+    compressors = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        logger.debug("Install 'brotli' to precompress the search index with Brotli.")
+    else:
+        compressors[".br"] = brotli.compress
+    return compressors
+
+
+def _log_search_index_size(
+    shards_path: str, filenames: List[str], documents_path: str
+) -> None:
+    sizes = {
+        suffix: sum(
+            os.path.getsize(os.path.join(shards_path, filename + suffix))
+            for filename in filenames
+        )
+        for suffix in ["", *_get_compressors()]
+    }
+    compressed = ", ".join(
+        f"{size / 1024:.1f} kB as {suffix}" for suffix, size in sizes.items() if suffix
+    )
+    logger.debug(
+        f"Search index: {len(filenames)} shards, {sizes[''] / 1024:.1f} kB "
+        f"({compressed}) for {os.path.getsize(documents_path) / 1024:.1f} kB of "
+        "documents"
+    )
 
 
 def _extract_page_content(
@@ -127,68 +405,54 @@ def _extract_page_content(
         logger.warning(f"Failed to read '{file_path}': {e}")
         return []
 
-    # Generate base URL path
-    url_path = "/" + relative_path.replace(".md", "")
-
-    results = []
+    page = scan_markdown(content)
+    url_path = _get_url_path(relative_path)
 
-    # First, add entry for the page itself
-    # Remove markdown syntax for cleaner content
-    clean_content = re.sub(r"```[\s\S]*?```", "", content)
-    clean_content = re.sub(r"`[^`]+`", "", clean_content)
-    clean_content = re.sub(r"^#+\s+.+$", "", clean_content, flags=re.MULTILINE)
-    clean_content = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", clean_content)
-    clean_content = re.sub(r"[*_]{1,2}([^*_]+)[*_]{1,2}", r"\1", clean_content)
-    clean_content = re.sub(r"\s+", " ", clean_content).strip()
-    content_preview = clean_content[:300] if clean_content else ""
-
-    results.append(
+    results = [
         {
             "id": url_path,
             "title": title,
             "path": url_path,
-            "content": content_preview,
+            "content": page.text[:CONTENT_PREVIEW_LENGTH],
             "section": section or "",
             "heading": "",
             "headingLevel": 0,
             "type": doc_type,
         }
-    )
+    ]
 
-    # Extract individual headings (h1-h3) and create separate entries
-    # Skip the first H1 to avoid duplicating the page-level entry
-    headings = list(re.finditer(r"^(#{1,3})\s+(.+)$", content, re.MULTILINE))
+    # Index H1 to H3 headings, except the first H1, which duplicates the page entry.
+    # Repeated slugs among them get a counter, like 'setup-2', the same way the app
+    # numbers heading IDs in 'markdoc/nodes/document.markdoc.ts'.
     skip_first_h1 = True
-    slug_counts: Dict[str, int] = {}  # Track slug usage to handle duplicates
-
-    for match in headings:
-        heading_level = len(match.group(1))
-        heading_text = match.group(2).strip()
-
-        # Skip the first H1 heading to avoid duplication with page entry
-        if skip_first_h1 and heading_level == 1:
+    slug_counts: Dict[str, int] = {}
+    used_slugs: Set[str] = set()
+    for heading in page.headings:
+        if heading.level > MAX_INDEXED_HEADING_LEVEL:
+            continue
+        if skip_first_h1 and heading.level == 1:
             skip_first_h1 = False
             continue
 
-        heading_slug = _slugify(heading_text)
-
-        # Handle duplicate slugs by appending a counter
-        if heading_slug in slug_counts:
-            slug_counts[heading_slug] += 1
-            unique_slug = f"{heading_slug}-{slug_counts[heading_slug]}"
-        else:
-            slug_counts[heading_slug] = 1
-            unique_slug = heading_slug
+        # The counter skips slugs that are taken, so that 'Setup', 'Setup' and
+        # 'Setup 2' don't all end up as 'setup-2'.
+        slug = heading.slug
+        count = slug_counts.get(heading.slug, 1)
+        while slug in used_slugs:
+            count += 1
+            slug = f"{heading.slug}-{count}"
+        slug_counts[heading.slug] = count
+        used_slugs.add(slug)
 
         results.append(
             {
-                "id": f"{url_path}#{unique_slug}",
+                "id": f"{url_path}#{slug}",
                 "title": title,
-                "path": f"{url_path}#{unique_slug}",
+                "path": f"{url_path}#{slug}",
                 "content": "",
                 "section": section or "",
-                "heading": heading_text,
-                "headingLevel": heading_level,
+                "heading": heading.text,
+                "headingLevel": heading.level,
                 "type": doc_type,
             }
         )
@@ -0,0 +1,535 @@
+"""Extract API models from source code without importing the documented package.
+
+The static parser reads signatures, annotations, defaults and docstrings directly from
+the abstract syntax tree of each module. Because it never imports anything, it avoids
+heavy native dependencies and import-time side effects, at the cost of not seeing
+objects that are created dynamically (for example, inherited or generated methods).
+
+Names that a module re-exports (for example, `from .api import get` in an
+`__init__.py`) are followed to the module that defines them. Star imports are
+followed if the target module's `__all__` list exports the name.
+"""
+
+import ast
+import importlib.util
+import inspect
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from docstring_parser import parse
+
+from .models import DocstringExample, PyArg, PyClass, PyFunc, PyObj
+from .parser import _get_summary_and_desc, join_signature
+from .utils import create_process_pool
+
+# Stop following re-exports after this many hops. This guards against import cycles.
+MAX_REEXPORT_DEPTH = 16
+
+logger = logging.getLogger(__name__)
+
+_FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+# A fully qualified name that might define an API, and whether the module must export
+# the name. Star imports only import exported names.
+_Candidate = Tuple[str, bool]
+
+
+class _Reexport:
+    """Marks a name that a module imports from somewhere else."""
+
+    def __init__(self, candidates: List["_Candidate"]):
+        # Fully qualified names to try, in order.
+        self.candidates = candidates
+
+
+def find_module_path(module_name: str) -> Optional[str]:
+    """Return the path to the source file of a module without importing it.
+
+    For packages, this is the path to the package's '__init__.py'. If the module
+    doesn't exist or isn't a Python source file, return `None`.
+    """
+    top_level_name, *segments = module_name.split(".")
+    try:
+        spec = importlib.util.find_spec(top_level_name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None:
+        return None
+
+    path = spec.origin if spec.has_location else None
+    locations = list(spec.submodule_search_locations or [])
+    for segment in segments:
+        path = None
+        next_locations = []
+        for location in locations:
+            package_dir = os.path.join(location, segment)
+            module_path = os.path.join(location, segment + ".py")
+            if os.path.isdir(package_dir):
+                next_locations.append(package_dir)
+                init_path = os.path.join(package_dir, "__init__.py")
+                if os.path.isfile(init_path):
+                    path = init_path
+                    break
+            elif os.path.isfile(module_path):
+                path = module_path
+                break
+        else:
+            # Namespace packages don't have an '__init__.py', but they can still
+            # contain modules.
+            if not next_locations:
+                return None
+
+        locations = next_locations
+
+    if path is None or not path.endswith(".py"):
+        return None
+
+    return path
+
+
+def split_qualname(qualname: str) -> Optional[Tuple[str, str, str]]:
+    """Split a fully qualified name into a module and a name relative to the module.
+
+    This is the static counterpart to `get_module_and_relative_name`. Like that
+    function, it picks the longest prefix that is a module.
+
+    Returns:
+        A tuple of (module name, module path, relative name), or `None` if no prefix
+        of the name is a module.
+    """
+    segments = qualname.split(".")
+    for qualname_start_index in range(len(segments) - 1, 0, -1):
+        module_name = ".".join(segments[:qualname_start_index])
+        path = find_module_path(module_name)
+        if path is not None:
+            return module_name, path, ".".join(segments[qualname_start_index:])
+
+    return None
+
+
+def parse_static(
+    qualnames: Iterable[str], *, max_workers: Optional[int] = None
+) -> Dict[str, Optional[PyObj]]:
+    """Parse APIs from source code without importing them.
+
+    Each round parses every module that still has unresolved names, in parallel
+    across processes. Re-exported names resolve in a later round.
+
+    Args:
+        qualnames: The fully qualified names of the APIs to parse.
+        max_workers: The maximum number of processes. If 1, parse in this process.
+
+    Returns:
+        A dictionary that maps each fully qualified name to its model, or to `None`
+        if the API couldn't be found.
+    """
+    results: Dict[str, Optional[PyObj]] = {}
+    # Maps each requested name to the fully qualified names that might define it. The
+    # next round looks up the first candidate.
+    candidates: Dict[str, List[_Candidate]] = {
+        qualname: [(qualname, False)] for qualname in qualnames
+    }
+
+    executor = None
+    if max_workers != 1:
+        executor = create_process_pool(max_workers)
+
+    try:
+        for _ in range(MAX_REEXPORT_DEPTH):
+            if not candidates:
+                break
+
+            requests: Dict[Tuple[str, str], List[Tuple[str, str, bool]]] = {}
+            for qualname, targets in list(candidates.items()):
+                target, must_be_exported = targets[0]
+                split = split_qualname(target)
+                if split is None:
+                    _drop_candidate(qualname, candidates, results)
+                    continue
+
+                module_name, path, relative_name = split
+                requests.setdefault((module_name, path), []).append(
+                    (relative_name, qualname, must_be_exported)
+                )
+
+            tasks = [
+                (module_name, path, names)
+                for (module_name, path), names in requests.items()
+            ]
+            if executor is not None and len(tasks) > 1:
+                outputs = executor.map(_parse_module_task, tasks)
+            else:
+                outputs = map(_parse_module_task, tasks)
+
+            for output in outputs:
+                for qualname, value in output.items():
+                    if isinstance(value, _Reexport):
+                        candidates[qualname][:1] = value.candidates
+                    elif value is not None:
+                        results[qualname] = value
+                        del candidates[qualname]
+                    else:
+                        _drop_candidate(qualname, candidates, results)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Names left over at this point are part of a re-export cycle.
+    for qualname in candidates:
+        results[qualname] = None
+
+    return results
+
+
+def _drop_candidate(
+    qualname: str,
+    candidates: Dict[str, List[_Candidate]],
+    results: Dict[str, Optional[PyObj]],
+) -> None:
+    candidates[qualname].pop(0)
+    if not candidates[qualname]:
+        del candidates[qualname]
+        results[qualname] = None
+
+
+def _parse_module_task(
+    task: Tuple[str, str, List[Tuple[str, str, bool]]],
+) -> Dict[str, Union[PyObj, _Reexport, None]]:
+    """Look up names in a single module.
+
+    Args:
+        task: A tuple of (module name, module path, names). Each name is a tuple of
+            (name relative to the module, fully qualified name the user requested,
+            whether the module must export the name).
+
+    Returns:
+        A dictionary that maps each requested name to its model, a re-export, or
+        `None` if the module doesn't contain the name.
+    """
+    module_name, path, names = task
+    try:
+        with open(path, "rb") as file:
+            tree = ast.parse(file.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.warning(f"Couldn't parse '{path}': {e}")
+        return {qualname: None for _, qualname, _ in names}
+
+    module = _StaticModule(module_name, path, tree)
+    return {
+        qualname: module.lookup(relative_name, qualname, must_be_exported)
+        for relative_name, qualname, must_be_exported in names
+    }
+
+
+class _StaticModule:
+    def __init__(self, name: str, path: str, tree: ast.Module):
+        self.name = name
+        self.is_package = os.path.basename(path) == "__init__.py"
+        self.definitions: Dict[str, ast.AST] = {}
+        self.imports: Dict[str, str] = {}
+        self.star_imports: List[str] = []
+        self.all: Optional[List[str]] = None
+
+        for node in tree.body:
+            self._visit(node)
+
+    def _visit(self, node: ast.AST) -> None:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            self.definitions[node.name] = node
+        elif isinstance(node, ast.ImportFrom):
+            source = self._resolve_relative_import(node)
+            for alias in node.names:
+                if alias.name == "*":
+                    self.star_imports.append(source)
+                else:
+                    self.imports[alias.asname or alias.name] = f"{source}.{alias.name}"
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname is not None:
+                    self.imports[alias.asname] = alias.name
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id == "__all__":
+                    self.all = _literal_strings(node.value)
+                elif isinstance(node.value, ast.Name):
+                    # Aliases like `request = _request`.
+                    self.imports[target.id] = f"{self.name}.{node.value.id}"
+        elif isinstance(node, ast.If):
+            # Definitions are often guarded by `if TYPE_CHECKING:` or version checks.
+            # Take the first branch, which is the one most type checkers assume.
+            for child in node.body:
+                self._visit(child)
+        elif isinstance(node, ast.Try):
+            for child in node.body:
+                self._visit(child)
+
+    def _resolve_relative_import(self, node: ast.ImportFrom) -> str:
+        if not node.level:
+            return node.module or ""
+
+        package_segments = self.name.split(".")
+        if not self.is_package:
+            package_segments = package_segments[:-1]
+        if node.level > 1:
+            package_segments = package_segments[: -(node.level - 1)]
+
+        if node.module:
+            package_segments.append(node.module)
+        return ".".join(package_segments)
+
+    def lookup(
+        self, relative_name: str, qualname: str, must_be_exported: bool = False
+    ) -> Union[PyObj, _Reexport, None]:
+        """Look up a name defined in or imported by this module.
+
+        Args:
+            relative_name: The name relative to this module.
+            qualname: The name to display in the model. This is the name the user
+                requested, which can differ from where the API is defined.
+            must_be_exported: Whether to ignore names that `from module import *`
+                wouldn't import.
+        """
+        first, *rest = relative_name.split(".")
+        suffix = "".join(f".{segment}" for segment in rest)
+
+        if must_be_exported and not self._exports(first):
+            return None
+
+        if first in self.definitions:
+            node = self.definitions[first]
+            for segment in rest:
+                if not isinstance(node, ast.ClassDef):
+                    return None
+                node = _find_class_member(node, segment)
+                if node is None:
+                    return None
+            return _parse_node(node, qualname)
+
+        if first in self.imports:
+            return _Reexport([(self.imports[first] + suffix, False)])
+
+        if self.star_imports:
+            return _Reexport(
+                [(f"{module}.{relative_name}", True) for module in self.star_imports]
+            )
+
+        return None
+
+    def _exports(self, name: str) -> bool:
+        if self.all is not None:
+            return name in self.all
+        return not name.startswith("_")
+
+
+def _find_class_member(cls: ast.ClassDef, name: str) -> Optional[ast.AST]:
+    member = None
+    for node in cls.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # Like at runtime, the last definition wins. For example, the
+            # implementation comes after the `@overload` stubs.
+            if node.name == name:
+                member = node
+    return member
+
+
+def _literal_strings(node: ast.AST) -> Optional[List[str]]:
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return None
+
+    return [
+        element.value
+        for element in node.elts
+        if isinstance(element, ast.Constant) and isinstance(element.value, str)
+    ]
+
+
+def _parse_node(node: ast.AST, qualname: str) -> Optional[PyObj]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return _parse_func(node, qualname)
+    elif isinstance(node, ast.ClassDef):
+        return _parse_cls(node, qualname)
+    else:
+        return None
+
+
+def _parse_func(func: _FunctionNode, qualname: str) -> PyFunc:
+    signature = _format_signature(func, qualname)
+    parsed = parse(ast.get_docstring(func, clean=False))
+    summary, desc = _get_summary_and_desc(parsed)
+    param_types = _get_param_types(func)
+
+    args = []
+    for param in parsed.params:
+        args.append(
+            PyArg(
+                name=param.arg_name,
+                type=param_types.get(param.arg_name, param.type_name),
+                desc=param.description,
+            )
+        )
+
+    returns = parsed.returns.description if parsed.returns else None
+
+    examples = []
+    for example in parsed.examples:
+        examples.append(DocstringExample(desc=None, code=example.description))
+
+    return PyFunc(
+        name=qualname,
+        signature=signature,
+        summary=summary,
+        desc=desc,
+        args=args,
+        returns=returns,
+        examples=examples,
+    )
+
+
+def _parse_cls(cls: ast.ClassDef, qualname: str) -> PyClass:
+    parsed = parse(ast.get_docstring(cls, clean=False))
+    summary, desc = _get_summary_and_desc(parsed)
+
+    examples = []
+    for example in parsed.examples:
+        examples.append(DocstringExample(desc=None, code=example.description))
+
+    init = _find_class_member(cls, "__init__")
+    if isinstance(init, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        args = _parse_func(init, qualname + ".__init__").args
+        signature = _format_signature(init, qualname)
+    else:
+        # Without an '__init__' in the class body, we can't tell what the inherited
+        # constructor looks like.
+        args = []
+        signature = f"{qualname}()"
+
+    functions = {
+        node.name: node
+        for node in cls.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+    methods = []
+    for _, node in sorted(functions.items()):
+        # Ignore private methods
+        if node.name.startswith("_"):
+            continue
+
+        # `inspect.getmembers(cls, predicate=inspect.isfunction)` doesn't return
+        # properties or class methods, so we skip them too.
+        if _has_decorator(node, ("property", "classmethod", "setter", "deleter")):
+            continue
+
+        methods.append(_parse_func(node, qualname + "." + node.name))
+
+    return PyClass(
+        name=qualname,
+        signature=signature,
+        summary=summary,
+        desc=desc,
+        examples=examples,
+        args=args,
+        methods=methods,
+    )
+
+
+def _has_decorator(node: _FunctionNode, names: Tuple[str, ...]) -> bool:
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Name) and decorator.id in names:
+            return True
+        if isinstance(decorator, ast.Attribute) and decorator.attr in names:
+            return True
+    return False
+
+
+def _format_signature(func: _FunctionNode, name: str) -> str:
+    arguments = func.args
+    parameters = []
+
+    positional = arguments.posonlyargs + arguments.args
+    # Defaults align with the last positional parameters.
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(
+        arguments.defaults
+    )
+    for index, (argument, default) in enumerate(zip(positional, defaults)):
+        kind = (
+            inspect.Parameter.POSITIONAL_ONLY
+            if index < len(arguments.posonlyargs)
+            else inspect.Parameter.POSITIONAL_OR_KEYWORD
+        )
+        parameters.append(_format_parameter(argument, kind, default))
+
+    if arguments.vararg is not None:
+        parameters.append(
+            _format_parameter(arguments.vararg, inspect.Parameter.VAR_POSITIONAL, None)
+        )
+
+    for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        parameters.append(
+            _format_parameter(argument, inspect.Parameter.KEYWORD_ONLY, default)
+        )
+
+    if arguments.kwarg is not None:
+        parameters.append(
+            _format_parameter(arguments.kwarg, inspect.Parameter.VAR_KEYWORD, None)
+        )
+
+    return_annotation = _format_annotation(func.returns)
+    return join_signature(name, parameters, return_annotation)
+
+
+def _format_parameter(
+    argument: ast.arg,
+    kind: inspect._ParameterKind,
+    default: Optional[ast.expr],
+) -> Tuple[str, inspect._ParameterKind, Optional[str], Optional[str]]:
+    return (
+        argument.arg,
+        kind,
+        _format_annotation(argument.annotation),
+        ast.unparse(default) if default is not None else None,
+    )
+
+
+def _format_annotation(annotation: Optional[ast.expr]) -> Optional[str]:
+    if annotation is None:
+        return None
+
+    # If the user provided a quoted type, used that quoted value directly.
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        return annotation.value
+
+    return ast.unparse(annotation)
+
+
+def _get_param_types(func: _FunctionNode) -> Dict[str, Optional[str]]:
+    """Get parameter types from type hints specified in a function signature.
+
+    This mirrors `luma.parser._get_param_types`, which only uses annotations that are
+    strings or classes.
+    """
+    arguments = func.args
+    parameters = {}
+    for argument in (
+        arguments.posonlyargs
+        + arguments.args
+        + [arguments.vararg]
+        + arguments.kwonlyargs
+        + [arguments.kwarg]
+    ):
+        if argument is None or argument.annotation is None:
+            continue
+
+        annotation = argument.annotation
+        if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+            parameters[argument.arg] = annotation.value
+        elif isinstance(annotation, ast.Name):
+            parameters[argument.arg] = annotation.id
+        elif isinstance(annotation, ast.Attribute):
+            parameters[argument.arg] = annotation.attr
+
+    return parameters
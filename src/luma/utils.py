@@ -1,7 +1,14 @@
 import collections
+import hashlib
 import importlib
+import importlib.util
 import logging
+import multiprocessing
 import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from types import ModuleType
 
 import typer
@@ -19,7 +26,9 @@ def get_project_root():
     return project_root
 
 
-def get_module_and_relative_name(fully_qualified_name: str) -> tuple[ModuleType, str]:
+def get_module_and_relative_name(
+    fully_qualified_name: str, module_name: Optional[str] = None
+) -> tuple[ModuleType, str]:
     """Return the module and name of the Python object relative to the module.
 
     This utility is necessary because you don't know which part of a fully qualified
@@ -27,29 +36,104 @@ def get_module_and_relative_name(fully_qualified_name: str) -> tuple[ModuleType,
     don't know if 'spam' or 'spam.ham' is the module ('ham' could be a class in the
     'spam' module with a 'eggs' method).
 
+    Results are cached by a resolver that's shared by the whole process, so config
+    validation and reference generation only resolve each name once. Worker processes
+    have their own resolvers, so the process that starts them passes `module_name`,
+    the module that it resolved the name to, which is tried first.
+
     Examples:
         >>> get_module_and_qualname("luma.examples.Account.deposit")
         (<module 'luma.examples' from '.../examples.py'>, 'Account.deposit')
     """
-    segments = fully_qualified_name.split(".")
-    assert len(segments) > 1, f"Invalid fully qualified name: {fully_qualified_name}"
+    return _module_resolver.resolve(fully_qualified_name, module_name)
 
-    # Iteratively try to import the module until you find the correct module.
-    qualname_start_index = len(segments) - 1
-    while qualname_start_index > 0:
-        module_name = ".".join(segments[:qualname_start_index])
-        try:
-            module = importlib.import_module(module_name)
-        except ImportError:
-            qualname_start_index -= 1
+
+class ModuleResolver:
+    """Resolves fully qualified names to modules, and caches the results.
+
+    The resolver remembers which prefixes are modules and which aren't. Names that
+    aren't modules are ruled out with `importlib.util.find_spec`, which doesn't need
+    to execute anything, so the resolver only imports real modules.
+    """
+
+    def __init__(self):
+        self._modules: Dict[str, Optional[ModuleType]] = {}
+        self._resolved: Dict[str, Tuple[ModuleType, str]] = {}
+
+    def resolve(
+        self, fully_qualified_name: str, module_name: Optional[str] = None
+    ) -> Tuple[ModuleType, str]:
+        """Return the module and name of the Python object relative to the module.
+
+        Args:
+            fully_qualified_name: The fully qualified name of the object.
+            module_name: The module that the name probably belongs to, for example
+                because another process resolved it. It's tried before the other
+                prefixes of the name.
+
+        Raises:
+            ImportError: If no prefix of the name is an importable module.
+        """
+        resolved = self._resolved.get(fully_qualified_name)
+        if resolved is not None:
+            return resolved
+
+        segments = fully_qualified_name.split(".")
+        assert (
+            len(segments) > 1
+        ), f"Invalid fully qualified name: {fully_qualified_name}"
+
+        # Try the longest prefix first, like `import` statements would.
+        start_indices: List[int] = list(range(len(segments) - 1, 0, -1))
+        if module_name is not None and fully_qualified_name.startswith(
+            module_name + "."
+        ):
+            start_indices.insert(0, module_name.count(".") + 1)
+        for qualname_start_index in start_indices:
+            module_name = ".".join(segments[:qualname_start_index])
+            module = self._import_module(module_name)
+            if module is not None:
+                break
         else:
-            break
+            raise ImportError(f"Couldn't import module: {module_name}")
 
-    if qualname_start_index == 0:
-        raise ImportError(f"Couldn't import module: {module_name}")
+        resolved = (module, ".".join(segments[qualname_start_index:]))
+        self._resolved[fully_qualified_name] = resolved
+        return resolved
 
-    qualname = ".".join(segments[qualname_start_index:])
-    return module, qualname
+    def clear(self) -> None:
+        """Forget all results, for example after the documented package changed."""
+        self._modules.clear()
+        self._resolved.clear()
+
+    def _import_module(self, module_name: str) -> Optional[ModuleType]:
+        if module_name in self._modules:
+            return self._modules[module_name]
+
+        module = sys.modules.get(module_name)
+        if module is None:
+            try:
+                # This imports the parent package, but not the module itself.
+                spec = importlib.util.find_spec(module_name)
+            except (ImportError, ValueError):
+                spec = None
+
+            if spec is not None:
+                try:
+                    module = importlib.import_module(module_name)
+                except ImportError:
+                    pass
+
+        self._modules[module_name] = module
+        return module
+
+
+_module_resolver = ModuleResolver()
+
+
+def reset_module_resolver() -> None:
+    """Forget the modules that `get_module_and_relative_name` resolved."""
+    _module_resolver.clear()
 
 
 def get_obj(module: ModuleType, qualname: str) -> object:
@@ -79,3 +163,109 @@ def get_obj(module: ModuleType, qualname: str) -> object:
             raise ValueError(f"Couldn't get attribute: {attr}")
 
     return obj
+
+
+def create_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return a process pool whose workers start from a fresh interpreter.
+
+    The CLI runs build steps on threads, and forking a multi-threaded process can
+    deadlock, so the workers use the 'spawn' start method.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def write_if_changed(path: str, content: Union[str, bytes]) -> bool:
+    """Atomically write a file, unless it already has the given content.
+
+    Next.js recompiles every page that imports a file whose modification time
+    changed, so identical writes are skipped. Otherwise, the content is written to a
+    temporary file that then replaces the original, so Next.js never reads a
+    partially written file.
+
+    Args:
+        path: The path of the file. Its directory must exist.
+        content: The content to write. Text is encoded as UTF-8.
+
+    Returns:
+        Whether the file was written.
+    """
+    data = content.encode() if isinstance(content, str) else content
+    try:
+        # Comparing sizes first avoids reading files that obviously changed.
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as file:
+                if file.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    with AtomicWriter(path) as writer:
+        writer.write(data)
+    return writer.changed
+
+
+class AtomicWriter:
+    """Streams text or bytes into a file that replaces the original once it's complete.
+
+    Like `write_if_changed`, but for content that's too large to build in memory.
+    The fragments go straight to a temporary file, and the content is compared with
+    the original file by hash, so memory use doesn't depend on the file's size.
+
+    Examples:
+        >>> with AtomicWriter("page.md") as writer:
+        ...     for fragment in fragments:
+        ...         writer.write(fragment)
+        >>> writer.changed
+        True
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.changed = False
+        self._file: Optional[BinaryIO] = None
+        self._temp_path: Optional[str] = None
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def __enter__(self) -> "AtomicWriter":
+        directory, filename = os.path.split(self.path)
+        fd, self._temp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{filename}.", suffix=".tmp"
+        )
+        self._file = os.fdopen(fd, "wb")
+        return self
+
+    def write(self, text: Union[str, bytes]) -> None:
+        data = text.encode() if isinstance(text, str) else text
+        self._file.write(data)
+        self._hash.update(data)
+        self._size += len(data)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._file.close()
+        if exc_type is not None or self._is_unchanged():
+            os.unlink(self._temp_path)
+            return
+
+        try:
+            # `mkstemp` creates files that only the owner can read.
+            os.chmod(self._temp_path, 0o644)
+            os.replace(self._temp_path, self.path)
+        except BaseException:
+            os.unlink(self._temp_path)
+            raise
+        self.changed = True
+
+    def _is_unchanged(self) -> bool:
+        try:
+            if os.path.getsize(self.path) != self._size:
+                return False
+            digest = hashlib.sha256()
+            with open(self.path, "rb") as file:
+                while chunk := file.read(1 << 16):
+                    digest.update(chunk)
+        except OSError:
+            return False
+        return digest.digest() == self._hash.digest()
@@ -0,0 +1,452 @@
+"""Incremental updates for `luma dev`.
+
+The watcher collects file system events and, once the project has been quiet for a short
+debounce interval, applies the whole batch at once: it relinks or unlinks the changed
+pages and assets, re-resolves the parts of the config they affect, and patches the
+search index. Saving a page doesn't repeat the cold pipeline. Editing the source of a
+documented API regenerates the reference pages that include it.
+
+Only the directories that `scan_project` finds are watched, one non-recursive watch
+each. Watching the project root recursively would also watch every directory in
+'.luma/node_modules', which can exhaust the system's inotify watches.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
+
+from .cache import RENDER_CACHE_DIRNAME, get_cache_root
+from .config import (
+    CONFIG_FILENAME,
+    Config,
+    ResolvedConfig,
+    ResolvedPage,
+    ResolvedSection,
+    ResolvedTab,
+    load_config,
+    resolve_config,
+    resolve_page,
+)
+from .link import (
+    link_config,
+    link_existing_pages,
+    link_first_page_to_index,
+    link_page,
+    link_static_asset,
+    link_static_assets,
+    unlink_page,
+    unlink_static_asset,
+)
+from .parser import (
+    list_references_in_config,
+    load_reference_sources,
+    prepare_references,
+    update_references,
+)
+from .scanner import (
+    PRUNED_DIRECTORIES,
+    classify_path,
+    load_ignore_spec,
+    scan_project,
+)
+from .search import update_search_index
+
+# Editors often write a file in several steps, like truncate and write, or write a
+# temporary file and rename it. Waiting this long after the last event lets us handle
+# all of them at once while staying well below the time it takes to switch windows.
+DEBOUNCE_SECONDS = 0.05
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectWatcher:
+    """Keeps the Next.js app's data up to date while `luma dev` runs."""
+
+    def __init__(
+        self,
+        project_root: str,
+        config: Config,
+        resolved_config: ResolvedConfig,
+        *,
+        debounce: float = DEBOUNCE_SECONDS,
+        persistent_worker: bool = False,
+    ):
+        self._project_root = project_root
+        self._config = config
+        self._resolved_config = resolved_config
+        self._debounce = debounce
+        self._persistent_worker = persistent_worker
+        self._ignore_spec = load_ignore_spec(project_root)
+        self._inventory = scan_project(project_root)
+        self._pages = set(self._inventory.pages)
+        self._reference_sources = load_reference_sources(project_root)
+
+        self._condition = threading.Condition()
+        self._pending: Set[str] = set()
+        self._pending_sources: Set[str] = set()
+        self._rescan = False
+        self._last_event = 0.0
+        self._stopped = False
+
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._handler = _EventHandler(self)
+        # Maps absolute directory paths to their watches.
+        self._watches: Dict[str, ObservedWatch] = {}
+        self._directories: Set[str] = set()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._update_watches(self._inventory.directories)
+        self._observer.start()
+        self._worker.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._observer.stop()
+
+    def notify(self, path: str, is_directory: bool = False) -> None:
+        """Queue a changed path.
+
+        Paths outside the project are ignored, unless they are source files of the
+        documented APIs.
+        """
+        if os.path.abspath(path) in self._reference_sources:
+            with self._condition:
+                self._pending_sources.add(os.path.abspath(path))
+                self._last_event = time.monotonic()
+                self._condition.notify()
+            return
+
+        relative_path = os.path.relpath(path, self._project_root)
+        # Luma's own outputs live in '.luma', so reacting to them would loop forever.
+        top_level = relative_path.split(os.sep)[0]
+        if top_level == os.pardir or top_level in PRUNED_DIRECTORIES:
+            return
+
+        with self._condition:
+            if is_directory or relative_path == ".gitignore":
+                # Moving or deleting a directory affects every file in it, and a new
+                # '.gitignore' changes which files belong to the project.
+                self._rescan = True
+            else:
+                self._pending.add(relative_path)
+            self._last_event = time.monotonic()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not (
+                    self._pending
+                    or self._pending_sources
+                    or self._rescan
+                    or self._stopped
+                ):
+                    self._condition.wait()
+                # Restart the wait whenever another event arrives, so that a burst of
+                # events is handled as one batch.
+                while not self._stopped:
+                    remaining = self._last_event + self._debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped:
+                    return
+
+                changed_paths, changed_sources = self._pending, self._pending_sources
+                rescan = self._rescan
+                self._pending, self._pending_sources = set(), set()
+                self._rescan = False
+
+            try:
+                self.apply(
+                    changed_paths, rescan=rescan, changed_sources=changed_sources
+                )
+            except Exception:
+                logger.exception("Couldn't apply changes. Restart `luma dev`.")
+
+    def apply(
+        self,
+        changed_paths: Set[str],
+        *,
+        rescan: bool = False,
+        changed_sources: Iterable[str] = (),
+    ) -> None:
+        """Update the Next.js app's data for a batch of changed files.
+
+        Args:
+            changed_paths: Paths relative to the project root of the files that were
+                created, modified or deleted
+            rescan: Whether to scan the whole project again, for example after a
+                directory moved
+            changed_sources: Absolute paths of the changed source files of the
+                documented APIs
+        """
+        start = time.perf_counter()
+        changed_sources = set(changed_sources)
+        changed_pages = self._link(changed_paths, rescan)
+        if not (changed_pages or changed_sources or CONFIG_FILENAME in changed_paths):
+            return
+
+        config = self._config
+        if CONFIG_FILENAME in changed_paths:
+            try:
+                # Validating with a fresh scan doesn't check every page on disk.
+                config = load_config(
+                    self._project_root,
+                    scan_project(self._project_root),
+                    self._persistent_worker,
+                )
+            except ValueError as e:
+                logger.error(f"Ignoring invalid config. {e}")
+
+        resolved_config = self._resolve(config, changed_pages)
+        if resolved_config is None:
+            return
+
+        regenerated = self._update_references(config, resolved_config, changed_sources)
+        if resolved_config != self._resolved_config:
+            link_config(resolved_config, self._project_root)
+
+        # Replacing the first page gives it a new inode, so the index link goes stale.
+        link_first_page_to_index(self._project_root, resolved_config)
+        update_search_index(
+            self._project_root, resolved_config, changed_pages | regenerated
+        )
+
+        self._config = config
+        self._resolved_config = resolved_config
+        logger.debug(
+            f"Applied {len(changed_paths) + len(changed_sources)} changes in "
+            f"{(time.perf_counter() - start) * 1e3:.1f} ms"
+        )
+
+    def _link(self, changed_paths: Set[str], rescan: bool) -> Set[str]:
+        """Relink or unlink the changed files and return the changed pages."""
+        if rescan:
+            self._ignore_spec = load_ignore_spec(self._project_root)
+            inventory = scan_project(self._project_root)
+            if self._update_watches(inventory.directories):
+                # Files created in a new directory before we started watching it
+                # don't have events, so look for them again.
+                inventory = scan_project(self._project_root)
+                self._update_watches(inventory.directories)
+            link_existing_pages(self._project_root, inventory.pages)
+            link_static_assets(self._project_root, inventory.assets)
+
+            pages = set(inventory.pages)
+            changed_paths = changed_paths | (pages ^ self._pages)
+            self._pages = pages
+
+        changed_pages = set()
+        for relative_path in changed_paths:
+            kind = classify_path(self._ignore_spec, relative_path)
+            if kind is None:
+                continue
+
+            exists = os.path.isfile(os.path.join(self._project_root, relative_path))
+            if kind == "page":
+                changed_pages.add(relative_path)
+                if exists:
+                    link_page(self._project_root, relative_path)
+                    self._pages.add(relative_path)
+                else:
+                    unlink_page(self._project_root, relative_path)
+                    self._pages.discard(relative_path)
+            elif exists:
+                link_static_asset(self._project_root, relative_path)
+            else:
+                unlink_static_asset(self._project_root, relative_path)
+
+        return changed_pages
+
+    def _update_watches(self, directories: Optional[List[str]] = None) -> bool:
+        """Watch the project directories and the directories of the API sources.
+
+        Each directory gets its own non-recursive watch, so that '.luma', with its
+        'node_modules' and '.next' directories, and ignored directories are never
+        watched.
+
+        Args:
+            directories: The project directories relative to the project root. If
+                `None`, keep the ones from the last scan.
+
+        Returns:
+            Whether any directories are newly watched
+        """
+        if directories is not None:
+            self._directories = {
+                os.path.normpath(os.path.join(self._project_root, relative_dir))
+                for relative_dir in directories
+            }
+        wanted = self._directories | {
+            os.path.dirname(path) for path in self._reference_sources
+        }
+
+        for path in set(self._watches) - wanted:
+            try:
+                self._observer.unschedule(self._watches.pop(path))
+            except KeyError:
+                # The observer already dropped the watch of a deleted directory.
+                pass
+
+        new_dirs = wanted - set(self._watches)
+        for path in sorted(new_dirs):
+            try:
+                self._watches[path] = self._observer.schedule(
+                    self._handler, path=path, recursive=False
+                )
+            except OSError as e:
+                # The directory was deleted since the scan. The next rescan drops it.
+                logger.debug(f"Couldn't watch '{path}': {e}")
+
+        return bool(new_dirs)
+
+    def _resolve(
+        self, config: Config, changed_pages: Set[str]
+    ) -> Optional[ResolvedConfig]:
+        if config is not self._config:
+            return resolve_config(config, project_root=self._project_root)
+
+        navigation = _reresolve_pages(
+            self._resolved_config.navigation, changed_pages, self._project_root
+        )
+        if navigation is None:
+            return None
+        return self._resolved_config.model_copy(update={"navigation": navigation})
+
+    def _update_references(
+        self, config: Config, resolved_config: ResolvedConfig, changed_sources: Set[str]
+    ) -> Set[str]:
+        """Regenerate the references that changed, and return their paths.
+
+        References change when the config changes them, or when the source files of
+        their APIs change.
+        """
+        cache_dir = os.path.join(
+            get_cache_root(self._project_root), RENDER_CACHE_DIRNAME
+        )
+        references = list(list_references_in_config(resolved_config))
+        previous_references = list(list_references_in_config(self._resolved_config))
+        if _dump(references) != _dump(previous_references) or (
+            config.static_analysis != self._config.static_analysis
+        ):
+            prepare_references(
+                self._project_root,
+                resolved_config,
+                static=config.static_analysis,
+                cache_dir=cache_dir,
+                fresh_interpreter=True,
+                persistent_worker=self._persistent_worker,
+            )
+            regenerated = {
+                path for reference in references for path in reference.list_page_paths()
+            }
+        elif changed_sources:
+            qualnames = {
+                qualname
+                for path in changed_sources
+                for qualname in self._reference_sources.get(path, [])
+            }
+            regenerated = set(
+                update_references(
+                    self._project_root,
+                    resolved_config,
+                    qualnames,
+                    static=config.static_analysis,
+                    cache_dir=cache_dir,
+                    persistent_worker=self._persistent_worker,
+                )
+            )
+        else:
+            return set()
+
+        # APIs can move to other files, for example when a class gets a new base.
+        reference_sources = load_reference_sources(self._project_root)
+        if reference_sources != self._reference_sources:
+            self._reference_sources = reference_sources
+            self._update_watches()
+        return regenerated
+
+
+def watch_project(
+    project_root: str,
+    config: Config,
+    resolved_config: ResolvedConfig,
+    *,
+    persistent_worker: bool = False,
+) -> ProjectWatcher:
+    """Start watching the project and return the running watcher.
+
+    Args:
+        project_root: The project root directory
+        config: The config the project was prepared with
+        resolved_config: The resolved config the project was prepared with
+        persistent_worker: Whether to regenerate references in the project's
+            persistent worker
+    """
+    watcher = ProjectWatcher(
+        project_root, config, resolved_config, persistent_worker=persistent_worker
+    )
+    watcher.start()
+    return watcher
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher: ProjectWatcher):
+        self._watcher = watcher
+
+    def on_any_event(self, event: FileSystemEvent):
+        if event.event_type in ("opened", "closed", "closed_no_write"):
+            return
+        # A modified directory only means that its entries changed, and those entries
+        # get their own events.
+        if event.is_directory and event.event_type == "modified":
+            return
+
+        self._watcher.notify(event.src_path, event.is_directory)
+        if event.event_type == "moved":
+            self._watcher.notify(event.dest_path, event.is_directory)
+
+
+def _reresolve_pages(
+    items: List, changed_pages: Set[str], project_root: str
+) -> Optional[List]:
+    """Resolve the changed pages of a navigation again.
+
+    Returns:
+        The updated navigation, or `None` if the config references a page that no
+        longer exists
+    """
+    updated = []
+    for item in items:
+        if isinstance(item, ResolvedPage) and item.path in changed_pages:
+            try:
+                item = resolve_page(item.path, project_root, section=item.section)
+            except ValueError:
+                logger.error(
+                    f"Your config references a page at '{item.path}', but the file "
+                    "doesn't exist anymore. Restore the file or update the config."
+                )
+                return None
+        elif isinstance(item, (ResolvedSection, ResolvedTab)):
+            contents = _reresolve_pages(item.contents, changed_pages, project_root)
+            if contents is None:
+                return None
+            item = item.model_copy(update={"contents": contents})
+        updated.append(item)
+    return updated
+
+
+def _dump(models: List[BaseModel]) -> List:
+    return [model.model_dump() for model in models]
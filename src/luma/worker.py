@@ -0,0 +1,416 @@
+"""Long-lived process that keeps the documented package imported.
+
+Importing a large package can take several seconds, and every `luma dev` or
+`luma deploy` would pay for it again. With `--persistent-worker`, Luma checks and
+renders API references in a background process that outlives the CLI command instead. The CLI
+talks to it over a local socket that's authenticated with a key only the current user
+can read.
+
+Before each request, the worker reloads the modules whose source files changed. It
+exits after it has been idle for `IDLE_TIMEOUT_SECONDS`. Because the package is only
+imported in the worker, import side effects and crashes stay out of the CLI process.
+`luma stop-worker` stops the worker early.
+"""
+
+import hashlib
+import importlib
+import logging
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Connection, Listener
+from types import ModuleType
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from . import LUMA_DEBUG
+from .bootstrap import get_cli_version
+from .cache import get_cache_root
+
+IDLE_TIMEOUT_SECONDS = 30 * 60
+START_TIMEOUT_SECONDS = 30
+KEY_FILENAME = "worker.key"
+LOG_FILENAME = "worker.log"
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerError(Exception):
+    """Raised if Luma can't start or talk to the worker."""
+
+
+class _RenderRequest(BaseModel):
+    qualnames: List[str]
+    static: bool
+    cache_dir: Optional[str]
+    # The worker imports the package the same way the CLI would.
+    sys_path: List[str]
+
+
+class _ValidateRequest(BaseModel):
+    qualnames: List[str]
+    sys_path: List[str]
+
+
+class _ShutdownRequest(BaseModel):
+    pass
+
+
+class _Response(BaseModel):
+    # `_RenderedApi` objects. They're typed loosely to avoid a circular import.
+    results: List = []
+    # For validation requests, the error of each API, or `None` if it's valid.
+    errors: List[Optional[str]] = []
+    error: Optional[str] = None
+
+
+def render_in_worker(
+    project_root: str,
+    qualnames: List[str],
+    *,
+    static: bool,
+    cache_dir: Optional[str],
+) -> List:
+    """Render APIs in the project's worker, and start the worker if it isn't running.
+
+    Args:
+        project_root: The project root directory.
+        qualnames: The fully qualified names of the APIs to render.
+        static: If `True`, parse APIs from source code instead of importing them.
+        cache_dir: The directory of the render cache. If `None`, don't cache renders.
+
+    Returns:
+        A `_RenderedApi` for each name, in the same order.
+
+    Raises:
+        WorkerError: If the worker couldn't be started, crashed, or failed to render.
+    """
+    request = _RenderRequest(
+        qualnames=qualnames, static=static, cache_dir=cache_dir, sys_path=sys.path
+    )
+    response = _send(_connect(project_root, start=True), request)
+    if response.error is not None:
+        raise WorkerError(f"The worker failed to render the APIs:\n{response.error}")
+    return response.results
+
+
+def validate_in_worker(project_root: str, qualnames: List[str]) -> List[Optional[str]]:
+    """Check that APIs can be imported, in the project's worker.
+
+    Starts the worker if it isn't running.
+
+    Args:
+        project_root: The project root directory.
+        qualnames: The fully qualified names of the APIs to check.
+
+    Returns:
+        For each name, in the same order, the message that `validate_api_reference`
+        raised, or `None` if the API exists.
+
+    Raises:
+        WorkerError: If the worker couldn't be started, crashed, or failed to check
+            the APIs.
+    """
+    request = _ValidateRequest(qualnames=qualnames, sys_path=sys.path)
+    response = _send(_connect(project_root, start=True), request)
+    if response.error is not None:
+        raise WorkerError(f"The worker failed to check the APIs:\n{response.error}")
+    return response.errors
+
+
+def stop_worker(project_root: str) -> None:
+    """Stop the project's worker if it's running."""
+    try:
+        connection = _connect(project_root, start=False)
+    except WorkerError:
+        return
+
+    try:
+        _send(connection, _ShutdownRequest())
+    except WorkerError:
+        # The worker exits before answering.
+        pass
+
+
+def _send(connection: Connection, request: BaseModel) -> _Response:
+    with connection:
+        try:
+            connection.send(request)
+            return connection.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerError(f"Lost the connection to the worker: {e!r}")
+
+
+def _connect(project_root: str, *, start: bool) -> Connection:
+    address = _get_address(project_root)
+    authkey = _load_or_create_key(project_root)
+    try:
+        return Client(address, authkey=authkey)
+    except OSError as e:
+        if not start:
+            raise WorkerError(f"The worker isn't running: {e!r}")
+
+    _start_worker(project_root, address)
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except OSError as e:
+            if time.monotonic() > deadline:
+                log_path = os.path.join(get_cache_root(project_root), LOG_FILENAME)
+                raise WorkerError(
+                    f"The worker didn't start within {START_TIMEOUT_SECONDS} seconds "
+                    f"({e!r}). See '{log_path}' for details."
+                )
+            time.sleep(0.05)
+
+
+def _start_worker(project_root: str, address: str) -> None:
+    cache_root = get_cache_root(project_root)
+    os.makedirs(cache_root, exist_ok=True)
+    logger.debug(f"Starting worker at '{address}'")
+    with open(os.path.join(cache_root, LOG_FILENAME), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "luma.worker", address, project_root],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            # Keep the worker alive when the CLI exits or the user presses Ctrl+C.
+            start_new_session=True,
+        )
+
+
+def _get_address(project_root: str) -> str:
+    # A worker only serves the interpreter and Luma version that started it.
+    digest = hashlib.sha256(
+        "\0".join(
+            [os.path.abspath(project_root), sys.executable, get_cli_version()]
+        ).encode()
+    ).hexdigest()[:16]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\luma-{digest}"
+    # Unix socket paths are limited to about 100 characters, which paths in the
+    # project could exceed.
+    return os.path.join(tempfile.gettempdir(), f"luma-{digest}.sock")
+
+
+def _load_or_create_key(project_root: str) -> bytes:
+    path = os.path.join(get_cache_root(project_root), KEY_FILENAME)
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    key = secrets.token_bytes(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another CLI process created the key first.
+        with open(path, "rb") as file:
+            return file.read()
+    with os.fdopen(fd, "wb") as file:
+        file.write(key)
+    return key
+
+
+class _ModuleReloader:
+    """Reloads the modules of the documented packages whose source files changed."""
+
+    def __init__(self):
+        self._mtimes: Dict[str, int] = {}
+
+    def track(self, package_names: Set[str]) -> None:
+        """Remember the modification times of newly imported modules."""
+        for name, module in self._list_modules(package_names).items():
+            if name not in self._mtimes:
+                self._mtimes[name] = _get_mtime(module)
+
+    def reload_changed(self, package_names: Set[str]) -> None:
+        modules = self._list_modules(package_names)
+        stale = {
+            name
+            for name, module in modules.items()
+            if name in self._mtimes and self._mtimes[name] != _get_mtime(module)
+        }
+
+        # Modules that re-export objects from a stale module, like a package's
+        # '__init__.py', hold references to the old objects, so reload them too.
+        dependencies = {
+            name: _get_dependencies(module, set(modules) - {name})
+            for name, module in modules.items()
+        }
+        while True:
+            dependents = {
+                name
+                for name in modules
+                if name not in stale and dependencies[name] & stale
+            }
+            if not dependents:
+                break
+            stale |= dependents
+
+        if not stale:
+            return
+
+        importlib.invalidate_caches()
+        # Reload each module after the modules it uses, so that it picks up their new
+        # objects. Import cycles are broken arbitrarily.
+        reloaded: Set[str] = set()
+        while stale - reloaded:
+            remaining = sorted(stale - reloaded)
+            ready = [
+                name
+                for name in remaining
+                if not (dependencies[name] & stale) - reloaded
+            ]
+            name = ready[0] if ready else remaining[0]
+            logger.info(f"Reloading '{name}'")
+            try:
+                importlib.reload(modules[name])
+            except Exception:
+                logger.exception(f"Couldn't reload '{name}'")
+            self._mtimes[name] = _get_mtime(modules[name])
+            reloaded.add(name)
+
+        # Imported here so that the CLI doesn't load the parser to start a worker.
+        from .utils import reset_module_resolver
+
+        reset_module_resolver()
+
+    def _list_modules(self, package_names: Set[str]) -> Dict[str, ModuleType]:
+        return {
+            name: module
+            for name, module in list(sys.modules.items())
+            if name.split(".")[0] in package_names and _get_mtime(module) is not None
+        }
+
+
+def _get_dependencies(module: ModuleType, candidates: Set[str]) -> Set[str]:
+    """Return the candidate modules that a module holds objects from."""
+    dependencies = set()
+    for value in list(vars(module).values()):
+        if isinstance(value, ModuleType):
+            name = value.__name__
+        else:
+            name = getattr(value, "__module__", None)
+        if name in candidates:
+            dependencies.add(name)
+    return dependencies
+
+
+def _get_mtime(module: ModuleType) -> Optional[int]:
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def serve(address: str, authkey: bytes, idle_timeout: float) -> None:
+    """Answer requests until the worker is idle for `idle_timeout` seconds."""
+    # Imported here so that the CLI doesn't load the parser to start a worker.
+    from .config.validation import validate_api_reference
+    from .parser import _render_api_chunk
+
+    def validate(qualname: str) -> Optional[str]:
+        try:
+            validate_api_reference(qualname)
+        except ValueError as e:
+            return str(e)
+        return None
+
+    if not address.startswith("\\\\") and os.path.exists(address):
+        # A previous worker crashed without removing its socket.
+        os.unlink(address)
+    listener = Listener(address, authkey=authkey)
+    reloader = _ModuleReloader()
+    lock = threading.Lock()
+    last_activity = time.monotonic()
+
+    def exit_when_idle():
+        while True:
+            time.sleep(min(idle_timeout, 60))
+            with lock:
+                if time.monotonic() - last_activity > idle_timeout:
+                    logger.info("Exiting after being idle.")
+                    listener.close()
+                    os._exit(0)
+
+    threading.Thread(target=exit_when_idle, daemon=True).start()
+    logger.info(f"Listening at '{address}'")
+
+    while True:
+        try:
+            connection = listener.accept()
+        except OSError as e:
+            # For example, a client with the wrong key.
+            logger.warning(f"Rejected a connection: {e!r}")
+            continue
+
+        with connection, lock:
+            try:
+                request = connection.recv()
+            except (EOFError, OSError):
+                continue
+
+            if isinstance(request, _ShutdownRequest):
+                logger.info("Exiting on request.")
+                listener.close()
+                return
+
+            package_names = {qualname.split(".")[0] for qualname in request.qualnames}
+            try:
+                sys.path[:] = request.sys_path
+                reloader.reload_changed(package_names)
+                if isinstance(request, _ValidateRequest):
+                    response = _Response(
+                        errors=[validate(qualname) for qualname in request.qualnames]
+                    )
+                else:
+                    response = _Response(
+                        results=_render_api_chunk(
+                            request.qualnames,
+                            static=request.static,
+                            cache_dir=request.cache_dir,
+                        )
+                    )
+                reloader.track(package_names)
+            except Exception:
+                response = _Response(error=traceback.format_exc())
+
+            try:
+                connection.send(response)
+            except OSError:
+                pass
+            last_activity = time.monotonic()
+
+
+def main() -> None:
+    # The output goes to the log file, so log plain lines with timestamps instead of
+    # using the CLI's Rich handler.
+    logging.getLogger("luma").handlers.clear()
+    logging.basicConfig(
+        level=logging.DEBUG if LUMA_DEBUG else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    address, project_root = sys.argv[1:3]
+    serve(address, _load_or_create_key(project_root), IDLE_TIMEOUT_SECONDS)
+
+
+if __name__ == "__main__":
+    # Run the imported module rather than `__main__`, so that requests unpickle to
+    # the same classes that `serve` checks for.
+    from luma.worker import main as worker_main
+
+    worker_main()
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from luma.config import ResolvedConfig
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project root with the directories that pages and data are written to."""
+    (tmp_path / ".luma" / "pages").mkdir(parents=True)
+    (tmp_path / ".luma" / "data").mkdir()
+    return tmp_path
+
+
+def resolved_config(*navigation):
+    return ResolvedConfig(name="example", navigation=list(navigation))
+
+
+def read_data(project, filename):
+    with open(project / ".luma" / "data" / filename) as file:
+        return json.load(file)
+
+
+def read_search_documents(project):
+    with open(project / ".luma" / "cache" / "search-documents.json") as file:
+        return json.load(file)
+
+
+def read_shards(project):
+    shards = []
+    for url in read_data(project, "search-index.json")["shards"]:
+        with open(project / ".luma" / "public" / url.lstrip("/")) as file:
+            shards.append(json.load(file))
+    return shards
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from luma import parser
+from luma.parser import render_apis
+
+QUALNAMES = [
+    "luma.examples.fib",
+    "luma.examples.Account",
+    "luma.examples.Account.deposit",
+    "luma.examples.Account.withdraw",
+    "luma.examples.Account.get_balance",
+    "luma.examples.missing",
+]
+
+
+def test_parallel_matches_serial(monkeypatch):
+    # Force the pool to start even though there are only a few APIs.
+    monkeypatch.setattr(parser, "MIN_APIS_PER_WORKER", 1)
+
+    parallel = render_apis(QUALNAMES, max_workers=2)
+    serial = render_apis(QUALNAMES, max_workers=1)
+
+    assert parallel == serial
+    assert list(parallel) == QUALNAMES
+
+
+def test_bounds_chunks_in_flight(monkeypatch):
+    monkeypatch.setattr(parser, "MIN_APIS_PER_WORKER", 1)
+    monkeypatch.setattr(parser, "MAX_APIS_PER_CHUNK", 1)
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, chunk, *args, **kwargs):
+            submitted.append(chunk)
+            return super().submit(fn, chunk, *args, **kwargs)
+
+    monkeypatch.setattr(parser, "create_process_pool", RecordingExecutor)
+    in_flight = []
+    rendered = []
+    for consumed, results in enumerate(
+        parser._render_api_chunks(
+            QUALNAMES,
+            static=False,
+            max_workers=2,
+            cache_dir=None,
+            fresh_interpreter=False,
+            worker_root=None,
+        )
+    ):
+        in_flight.append(len(submitted) - consumed)
+        rendered.extend(result.qualname for result in results)
+
+    assert max(in_flight) == 2 * parser.MAX_CHUNKS_IN_FLIGHT_PER_WORKER
+    assert rendered == QUALNAMES
+
+
+def test_missing_api_warns(caplog):
+    fragments = render_apis(["luma.examples.missing"], max_workers=1)
+
+    assert fragments == {"luma.examples.missing": None}
+    assert "Failed to get 'missing' from 'luma.examples'" in caplog.text
+
+
+def test_cached_render_skips_parsing(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    expected = render_apis(QUALNAMES, max_workers=1, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Cached APIs shouldn't be parsed again")
+
+    monkeypatch.setattr(parser, "parse_obj", fail)
+
+    assert render_apis(QUALNAMES, max_workers=1, cache_dir=cache_dir) == expected
+
+
+def test_render_cache_drops_unused_entries(tmp_path):
+    cache_dir = str(tmp_path)
+    render_apis(QUALNAMES, max_workers=1, cache_dir=cache_dir)
+    render_apis(["luma.examples.fib"], max_workers=1, cache_dir=cache_dir)
+
+    assert len(list(tmp_path.iterdir())) == 1
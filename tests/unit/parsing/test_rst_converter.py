@@ -1,6 +1,6 @@
 """Tests for RST to Markdown conversion."""
 
-from luma.rst_converter import convert_rst_to_markdown
+from luma.rst_converter import RstConverter, convert_rst_to_markdown
 
 
 class TestBasicText:
@@ -237,3 +237,48 @@ class TestEdgeCases:
         result = convert_rst_to_markdown(rst)
         expected = "Use & and < and > symbols."
         assert result == expected
+
+
+class TestRstConverter:
+    """Test reusing a single converter."""
+
+    def test_reuse_matches_fresh_converter(self):
+        """Earlier conversions shouldn't affect later ones."""
+        texts = [
+            "Title\n=====\n\nBody with :class:`pkg.Cls`.",
+            "See the `link`_.\n\n.. _link: https://example.com",
+            ".. note::\n\n   A note.",
+            "Plain text.",
+        ]
+        converter = RstConverter()
+
+        reused = [converter.convert(text) for text in texts]
+        fresh = [RstConverter().convert(text) for text in texts]
+
+        assert reused == fresh
+
+    def test_no_global_roles(self):
+        """Converting shouldn't register roles in docutils' global registry."""
+        from docutils.parsers.rst import roles
+
+        result = RstConverter().convert("See :class:`pkg.Cls`.")
+
+        assert result == "See [pkg.Cls](pkg.Cls)."
+        assert "class" not in roles._roles
+
+    def test_concurrent_conversions_match_serial(self):
+        """Conversions on many threads should match conversions on one thread."""
+        texts = [
+            "Use **bold**, *italic* and ``code``.",
+            "See :class:`Custom <pkg.Cls>` and :func:`pkg.func`.",
+            "- One\n- Two\n\n  - Nested",
+            ".. warning::\n\n   Be *careful*.",
+            "Example::\n\n    print('hi')",
+            "Plain text.",
+            None,
+        ] * 50
+        converter = RstConverter()
+        expected = [converter.convert(text) for text in texts]
+
+        for _ in range(3):
+            assert converter.convert_many(texts, max_workers=8) == expected
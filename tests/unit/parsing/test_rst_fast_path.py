@@ -0,0 +1,134 @@
+"""Differential tests for the fast paths of the RST converter."""
+
+import ast
+import pathlib
+
+import pytest
+from docstring_parser import parse
+
+from luma.rst_converter import RstConverter, is_plain_text
+
+REQUESTS_SOURCE = (
+    pathlib.Path(__file__).parents[3] / "examples" / "requests" / "src" / "requests"
+)
+
+
+def _load_fragments():
+    """Return the docstring fragments that Luma converts for `examples/requests`."""
+    fragments = set()
+    for path in sorted(REQUESTS_SOURCE.glob("**/*.py")):
+        tree = ast.parse(path.read_text())
+        for node in ast.walk(tree):
+            if not isinstance(
+                node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+                continue
+
+            docstring = ast.get_docstring(node)
+            if docstring is None:
+                continue
+
+            parsed = parse(docstring)
+            fragments.add(docstring)
+            fragments.update(docstring.split("\n\n"))
+            fragments.add(parsed.short_description)
+            fragments.add(parsed.long_description)
+            fragments.update(param.description for param in parsed.params)
+            if parsed.returns is not None:
+                fragments.add(parsed.returns.description)
+
+    return sorted(fragment.strip() for fragment in fragments if fragment)
+
+
+FRAGMENTS = _load_fragments()
+
+
+@pytest.fixture(scope="module")
+def converter():
+    return RstConverter()
+
+
+def test_corpus_exercises_fast_path():
+    plain_fragments = [fragment for fragment in FRAGMENTS if is_plain_text(fragment)]
+
+    # Sanity-check that the corpus covers both paths.
+    assert len(FRAGMENTS) > 100
+    assert 0 < len(plain_fragments) < len(FRAGMENTS)
+
+
+@pytest.mark.parametrize("text", FRAGMENTS)
+def test_fast_path_matches_docutils(converter, text):
+    assert converter.convert(text) == converter._convert_with_docutils(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "The request timeout in seconds.",
+        "First line\nsecond line   \n\n\nSecond paragraph.",
+        "Snake_case names and a: colon are fine.",
+        "Use & and < and > symbols.",
+        "Unicode text: naïve café — ok.",
+        "Ends with a colon:",
+        "(optional) A parameter. See [Request](requests.Request).",
+        "Python. It works.",
+        "e.g. an abbreviation at the start of a line.",
+    ],
+)
+def test_plain_text(converter, text):
+    assert is_plain_text(text)
+    assert converter.convert(text) == converter._convert_with_docutils(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Use *emphasis*.",
+        "See :class:`requests.Session`.",
+        "A link_ to somewhere.",
+        "_private target",
+        "Example::\n\n    code",
+        "Visit https://example.com for details.",
+        "Contact me@example.com.",
+        "- A bullet",
+        "1. An enumerated item",
+        "(a) An enumerated item",
+        "Title\n=====",
+        "Term\n    Definition",
+        ">>> 1 + 1",
+        ".. note:: A note",
+        "A |substitution|.",
+        "A footnote [1]_.",
+        "i. A roman numeral",
+        "#. An auto-numbered item",
+        "An escaped \\*star.",
+        "A\ttab.",
+        "-v  An option",
+    ],
+)
+def test_possible_markup(text):
+    assert not is_plain_text(text)
+
+
+def test_batch_matches_individual_conversions(converter):
+    # Reverse the corpus too, so that each fragment follows a different neighbor.
+    for fragments in [FRAGMENTS, FRAGMENTS[::-1]]:
+        assert converter.convert_batch(fragments) == [
+            converter.convert(fragment) for fragment in fragments
+        ]
+
+
+@pytest.mark.parametrize(
+    "fragments",
+    [
+        [None, "", "Plain.", "Use *emphasis*.", "\n"],
+        ["Some *text*.\n\n.. seealso:: Other", "More *text*."],
+        ["A footnote [#]_.\n\n.. [#] Note.", "Another [#]_.\n\n.. [#] Note."],
+        ["A `link`_.\n\n.. _link: https://example.com", "Same `link`_."],
+        [".. note::\n\n   *Note*.", "- *One*\n- Two", "Title\n=====\n\n*Body*."],
+    ],
+)
+def test_batch_isolates_fragments(converter, fragments):
+    assert converter.convert_batch(fragments) == [
+        converter.convert(fragment) for fragment in fragments
+    ]
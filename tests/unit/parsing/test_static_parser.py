@@ -0,0 +1,128 @@
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+from luma.models import PyClass, PyFunc
+from luma.parser import parse_obj
+from luma.static_parser import parse_static
+
+MODULE_SOURCE = '''
+def greet(name: str, greeting: str = "Hello", *, loud: bool = False) -> str:
+    """Greet someone.
+
+    Args:
+        name: The name of the person.
+        greeting: The greeting to use.
+        loud: Whether to shout.
+
+    Returns:
+        The greeting.
+    """
+    return f"{greeting}, {name}"
+
+
+class Account:
+    """A bank account.
+
+    Args:
+        owner: The owner of the account.
+    """
+
+    def __init__(self, owner: str, balance: int = 0):
+        self.owner = owner
+        self.balance = balance
+
+    def deposit(self, amount: int) -> None:
+        """Deposit money.
+
+        Args:
+            amount: The amount to deposit.
+        """
+        self.balance += amount
+
+    def _audit(self):
+        pass
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    package_dir = tmp_path / "staticpkg"
+    (package_dir / "sub").mkdir(parents=True)
+    (package_dir / "core.py").write_text(textwrap.dedent(MODULE_SOURCE))
+    (package_dir / "__init__.py").write_text(
+        "from .core import Account, greet as hello\n"
+        "from .sub import *\n"
+        "__all__ = ['Account', 'hello', 'exported']\n"
+    )
+    (package_dir / "sub" / "__init__.py").write_text(
+        "__all__ = ['exported']\n"
+        "def exported():\n"
+        "    '''Exported.'''\n"
+        "def not_exported():\n"
+        "    '''Not exported.'''\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    yield "staticpkg"
+    for name in list(sys.modules):
+        if name == "staticpkg" or name.startswith("staticpkg."):
+            del sys.modules[name]
+
+
+@pytest.mark.parametrize("qualname", ["staticpkg.core.greet", "staticpkg.core.Account"])
+def test_matches_runtime_parser(package, qualname):
+    [result] = parse_static([qualname], max_workers=1).values()
+
+    module_name, _, relative_name = qualname.rpartition(".")
+    obj = getattr(importlib.import_module(module_name), relative_name)
+    assert result == parse_obj(obj, qualname)
+
+
+def test_does_not_import_package(package):
+    parse_static(["staticpkg.core.greet"], max_workers=1)
+
+    assert "staticpkg" not in sys.modules
+
+
+def test_reexport(package):
+    result = parse_static(["staticpkg.hello"], max_workers=1)["staticpkg.hello"]
+
+    assert isinstance(result, PyFunc)
+    # The name should be the one the user referenced, not the one in the source.
+    assert result.name == "staticpkg.hello"
+    assert result.signature.startswith("staticpkg.hello(")
+
+
+def test_star_import_respects_all(package):
+    results = parse_static(
+        ["staticpkg.exported", "staticpkg.not_exported"], max_workers=1
+    )
+
+    assert isinstance(results["staticpkg.exported"], PyFunc)
+    assert results["staticpkg.not_exported"] is None
+
+
+def test_class_methods(package):
+    result = parse_static(["staticpkg.Account"], max_workers=1)["staticpkg.Account"]
+
+    assert isinstance(result, PyClass)
+    assert [method.name for method in result.methods] == ["staticpkg.Account.deposit"]
+
+
+def test_missing_names(package):
+    results = parse_static(
+        ["staticpkg.core.missing", "nonexistentpkg.func"], max_workers=1
+    )
+
+    assert results == {"staticpkg.core.missing": None, "nonexistentpkg.func": None}
+
+
+def test_parallel_matches_serial(package):
+    qualnames = ["staticpkg.core.greet", "staticpkg.Account", "staticpkg.exported"]
+
+    assert parse_static(qualnames, max_workers=2) == parse_static(
+        qualnames, max_workers=1
+    )
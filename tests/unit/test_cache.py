@@ -0,0 +1,88 @@
+import os
+
+from luma import cache as cache_module
+from luma.cache import BuildCache, PageCache, RenderCache
+from luma.config import Config, resolve_config
+from luma.markdown import Heading
+
+
+def test_fresh_after_save(tmp_path):
+    page_path = str(tmp_path / "page.md")
+    with open(page_path, "w") as file:
+        file.write("# Page")
+
+    cache = BuildCache(str(tmp_path))
+    fingerprint = cache.fingerprint(cache.hash_file(page_path))
+    assert not cache.is_fresh("phase", fingerprint)
+    cache.record("phase", fingerprint)
+    cache.save()
+
+    cache = BuildCache(str(tmp_path))
+    assert cache.is_fresh("phase", cache.fingerprint(cache.hash_file(page_path)))
+
+
+def test_stale_after_content_changes(tmp_path):
+    page_path = str(tmp_path / "page.md")
+    with open(page_path, "w") as file:
+        file.write("# Page")
+
+    cache = BuildCache(str(tmp_path))
+    cache.record("phase", cache.fingerprint(cache.hash_file(page_path)))
+    cache.save()
+
+    with open(page_path, "w") as file:
+        file.write("# Updated page")
+
+    cache = BuildCache(str(tmp_path))
+    assert not cache.is_fresh("phase", cache.fingerprint(cache.hash_file(page_path)))
+
+
+def test_hash_missing_file(tmp_path):
+    cache = BuildCache(str(tmp_path))
+
+    assert cache.hash_file(str(tmp_path / "missing.md")) is None
+
+
+def test_render_cache_prune(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    cache.put(cache.key("kept"), {"markdown": "kept"})
+    cache.put(cache.key("stale"), {"markdown": "stale"})
+
+    cache.prune([cache.key("kept")])
+
+    assert cache.get(cache.key("kept")) == {"markdown": "kept"}
+    assert cache.get(cache.key("stale")) is None
+
+
+def test_page_cache_reads_only_changed_pages(tmp_path, monkeypatch):
+    (tmp_path / "index.md").write_text("---\ntitle: Home\n---\n\n## Usage\n")
+    (tmp_path / "setup.md").write_text("# Setup\n")
+    config = Config(
+        name="example",
+        navigation=["index.md", "setup.md"],
+        project_root=str(tmp_path),
+    )
+    resolve_config(config, project_root=str(tmp_path))
+
+    scanned = []
+    original_scan = cache_module.scan_markdown_file
+
+    def scan_markdown_file(path):
+        scanned.append(os.path.basename(path))
+        return original_scan(path)
+
+    monkeypatch.setattr(cache_module, "scan_markdown_file", scan_markdown_file)
+    (tmp_path / "setup.md").write_text("# Install\n")
+    resolved_config = resolve_config(config, project_root=str(tmp_path))
+
+    assert scanned == ["setup.md"]
+    assert [page.title for page in resolved_config.navigation] == ["Home", "Install"]
+    page = PageCache(str(tmp_path)).get(str(tmp_path / "index.md"))
+    assert page.metadata == {"title": "Home"}
+    assert page.headings == [Heading(2, "Usage", "usage")]
+
+
+def test_page_cache_missing_page(tmp_path):
+    cache = PageCache(str(tmp_path))
+
+    assert cache.get(str(tmp_path / "missing.md")) is None
@@ -1,6 +1,8 @@
 import pytest
 
 from luma.config import resolve_page, ResolvedPage
+from luma.config.validation import validate_page_exists
+from luma.scanner import scan_project
 
 
 @pytest.mark.parametrize(
@@ -20,3 +22,14 @@ def test_page_infers_correct_title(content, expected_title, tmp_path):
     resolved_page = resolve_page("file.md", project_root=tmp_path)
 
     assert resolved_page == ResolvedPage(title=expected_title, path="file.md")
+
+
+@pytest.mark.parametrize("scan", [True, False])
+def test_rejects_pages_in_ignored_directories(tmp_path, scan):
+    (tmp_path / "drafts").mkdir()
+    (tmp_path / "drafts" / "page.md").write_text("# Draft")
+    (tmp_path / ".gitignore").write_text("drafts/\n")
+    inventory = scan_project(str(tmp_path)) if scan else None
+
+    with pytest.raises(ValueError, match="ignores"):
+        validate_page_exists("drafts/page.md", str(tmp_path), inventory)
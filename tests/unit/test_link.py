@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from luma.build import _link_existing_pages
+from luma.cache import BuildCache
+from luma.link import link_existing_pages, link_static_assets
+from luma.scanner import ProjectInventory
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "guides").mkdir()
+    (tmp_path / "index.md").write_text("# Index")
+    (tmp_path / "guides" / "setup.md").write_text("# Setup")
+    (tmp_path / "logo.png").write_bytes(b"")
+    return tmp_path
+
+
+def _count_links(monkeypatch):
+    calls = []
+    original_link = os.link
+
+    def link(src, dst):
+        calls.append(dst)
+        original_link(src, dst)
+
+    monkeypatch.setattr(os, "link", link)
+    return calls
+
+
+def test_links_pages(project):
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+
+    linked = project / ".luma" / "pages" / "guides" / "setup.md"
+    assert os.path.samefile(linked, project / "guides" / "setup.md")
+
+
+def test_skips_valid_links(project, monkeypatch):
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+    (project / "index.md").write_text("# Edited in place")
+
+    calls = _count_links(monkeypatch)
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+
+    assert calls == []
+
+
+def test_relinks_replaced_sources(project, monkeypatch):
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+    # Editors often save by writing a new file and renaming it over the old one.
+    (project / "index.md.tmp").write_text("# Replaced")
+    os.replace(project / "index.md.tmp", project / "index.md")
+
+    calls = _count_links(monkeypatch)
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+
+    assert calls == [os.path.join(str(project), ".luma", "pages", "index.md")]
+    assert (project / ".luma" / "pages" / "index.md").read_text() == "# Replaced"
+
+
+def test_removes_stale_links(project):
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+    link_static_assets(str(project), ["logo.png"])
+
+    link_existing_pages(str(project), ["index.md"])
+
+    assert not (project / ".luma" / "pages" / "guides" / "setup.md").exists()
+    assert (project / ".luma" / "pages" / "index.md").exists()
+    # Pruning pages doesn't touch other groups.
+    assert (project / ".luma" / "public" / "logo.png").exists()
+
+
+def test_keeps_overwritten_files(project):
+    link_existing_pages(str(project), ["index.md", "guides/setup.md"])
+    generated = project / ".luma" / "pages" / "guides" / "setup.md"
+    generated.unlink()
+    generated.write_text("# Generated")
+
+    link_existing_pages(str(project), ["index.md"])
+
+    assert generated.read_text() == "# Generated"
+
+
+def test_build_relinks_deleted_links(project):
+    inventory = ProjectInventory(
+        pages=["index.md", "guides/setup.md"], assets=[], directories=[]
+    )
+    cache = BuildCache(str(project))
+    _link_existing_pages(cache, str(project), inventory)
+    cache.save()
+    linked = project / ".luma" / "pages" / "index.md"
+    linked.unlink()
+
+    _link_existing_pages(BuildCache(str(project)), str(project), inventory)
+
+    assert os.path.samefile(linked, project / "index.md")
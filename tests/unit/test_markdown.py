@@ -0,0 +1,93 @@
+import pytest
+
+from luma.markdown import Heading, scan_markdown, scan_markdown_file, slugify
+
+PAGE = """---
+title: Getting started
+---
+
+# Welcome
+
+Install **Luma** with [pip](https://pip.pypa.io) and run `luma dev`.
+
+```bash
+# Not a heading
+pip install luma-docs
+```
+
+## Configure `luma.yaml`
+
+~~~~
+```
+# Still code
+~~~~
+
+### Configure `luma.yaml`
+"""
+
+
+def test_scan_markdown():
+    page = scan_markdown(PAGE)
+
+    assert page.metadata == {"title": "Getting started"}
+    assert page.title == "Getting started"
+    assert page.headings == [
+        Heading(1, "Welcome", "welcome"),
+        Heading(2, "Configure `luma.yaml`", "configure-luma.yaml"),
+        Heading(3, "Configure `luma.yaml`", "configure-luma.yaml"),
+    ]
+    assert page.text == "Install Luma with pip and run ."
+    assert [heading.level for heading in page.table_of_contents] == [2, 3]
+
+
+def test_scan_markdown_file(tmp_path):
+    path = tmp_path / "page.md"
+    path.write_text(PAGE)
+
+    assert scan_markdown_file(str(path)) == scan_markdown(PAGE)
+
+
+@pytest.mark.parametrize(
+    "content, metadata, text",
+    [
+        ("\n---\ntitle: Setup\n---\nBody.\n", {"title": "Setup"}, "Body."),
+        # Without a closing line, the dashes start the body.
+        ("---\ntitle: Setup\n", {}, "--- title: Setup"),
+        ("Intro.\n\n---\ntitle: Setup\n---\n", {}, "Intro. --- title: Setup ---"),
+        # Links and emphasis can wrap across lines within a paragraph.
+        (
+            "See [the\nguide](/guide) for *more\ndetails*.\n",
+            {},
+            "See the guide for more details.",
+        ),
+    ],
+)
+def test_frontmatter_and_text(content, metadata, text):
+    page = scan_markdown(content)
+
+    assert page.metadata == metadata
+    assert page.text == text
+
+
+@pytest.mark.parametrize(
+    "content, title",
+    [
+        ("```\n# Comment\n```\n\n## Usage\n", "Usage"),
+        ("Text without headings.\n", None),
+    ],
+)
+def test_title_from_first_heading(content, title):
+    assert scan_markdown(content).title == title
+
+
+@pytest.mark.parametrize(
+    "text, slug",
+    [
+        ("Hello World", "hello-world"),
+        ("What's `new`?", "whats-new"),
+        ("snake_case -- and  spaces", "snake-case-and-spaces"),
+        ("luma.examples.fib()", "luma.examples.fib"),
+    ],
+)
+def test_slugify(text, slug):
+    assert slugify(text) == slug
@@ -0,0 +1,162 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import luma
+from luma.minisearch import build_index, tokenize
+from luma.search import SEARCH_FIELDS, STORED_FIELDS
+
+APP_ROOT = os.path.join(os.path.dirname(luma.__file__), "app")
+
+# A few documents and their index as serialized by the pinned MiniSearch version, so
+# that parity is checked without Node.js. `test_matches_client_side_indexing` checks
+# the fixture against the installed MiniSearch when it's available.
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__), "fixtures", "minisearch-7.2.0.json"
+)
+
+QUERIES = ["luma", "fib", "fibonaci", "python pack", "café", "install", "55"]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Hello, world.", ["Hello", "world", ""]),
+        ("", [""]),
+        ("luma.examples.fib", ["luma", "examples", "fib"]),
+        ("a b—c", ["a", "b", "c"]),
+        ("x + y", ["x", "+", "y"]),
+    ],
+)
+def test_tokenize_matches_javascript_split(text, expected):
+    assert tokenize(text) == expected
+
+
+def test_build_index():
+    documents = [
+        {"id": "a", "title": "Hello, hello", "kind": "page"},
+        {"id": "b", "title": "World"},
+    ]
+
+    index = build_index(documents, fields=["title"], store_fields=["kind"])
+
+    assert index == {
+        "documentCount": 2,
+        "nextId": 2,
+        "documentIds": {"0": "a", "1": "b"},
+        "fieldIds": {"title": 0},
+        "fieldLength": {"0": [2], "1": [1]},
+        "averageFieldLength": [1.5],
+        "storedFields": {"0": {"kind": "page"}, "1": {}},
+        "dirtCount": 0,
+        "index": [["hello", {"0": {"0": 2}}], ["world", {"0": {"1": 1}}]],
+        "serializationVersion": 2,
+    }
+
+
+def test_skips_duplicate_ids(caplog):
+    documents = [
+        {"id": "a", "title": "First"},
+        {"id": "a", "title": "Second"},
+        {"id": "b", "title": "Third"},
+    ]
+
+    index = build_index(documents, fields=["title"], store_fields=["title"])
+
+    assert index == build_index(
+        [documents[0], documents[2]], fields=["title"], store_fields=["title"]
+    )
+    assert "duplicate ID 'a'" in caplog.text
+
+
+def test_missing_id():
+    with pytest.raises(ValueError):
+        build_index([{"title": "First"}], fields=["title"], store_fields=[])
+
+
+def _load_fixture():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _sort_terms(index):
+    # MiniSearch serializes terms in the order of its radix tree.
+    return {**index, "index": sorted(index["index"])}
+
+
+def test_matches_minisearch_fixture():
+    fixture = _load_fixture()
+    assert fixture["options"] == {"fields": SEARCH_FIELDS, "storeFields": STORED_FIELDS}
+
+    index = build_index(
+        fixture["documents"], fields=SEARCH_FIELDS, store_fields=STORED_FIELDS
+    )
+
+    assert _sort_terms(index) == _sort_terms(fixture["index"])
+
+
+PARITY_SCRIPT = """
+const MiniSearch = require("minisearch");
+const { documents, index, options, queries } = JSON.parse(
+  require("fs").readFileSync(0, "utf-8"),
+);
+const clientSide = new MiniSearch(options);
+clientSide.addAll(documents);
+const prebuilt = MiniSearch.loadJS(index, options);
+const search = (miniSearch) => queries.map((query) => miniSearch.search(query));
+console.log(JSON.stringify({
+  clientSide: search(clientSide),
+  prebuilt: search(prebuilt),
+  serialized: clientSide.toJSON(),
+}));
+"""
+
+
+def _has_minisearch():
+    if shutil.which("node") is None:
+        return False
+    result = subprocess.run(
+        ["node", "-e", "require.resolve('minisearch')"],
+        cwd=APP_ROOT,
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+@pytest.mark.skipif(not _has_minisearch(), reason="Requires Node.js and minisearch")
+def test_matches_client_side_indexing():
+    fixture = _load_fixture()
+    options = {
+        **fixture["options"],
+        "searchOptions": {
+            "boost": {"title": 3, "heading": 2, "content": 1},
+            "fuzzy": 0.2,
+            "prefix": True,
+        },
+    }
+    index = build_index(
+        fixture["documents"], fields=SEARCH_FIELDS, store_fields=STORED_FIELDS
+    )
+
+    result = subprocess.run(
+        ["node", "-e", PARITY_SCRIPT],
+        cwd=APP_ROOT,
+        input=json.dumps(
+            {
+                "documents": fixture["documents"],
+                "index": index,
+                "options": options,
+                "queries": QUERIES,
+            }
+        ),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    output = json.loads(result.stdout)
+
+    assert output["prebuilt"] == output["clientSide"]
+    assert _sort_terms(output["serialized"]) == _sort_terms(fixture["index"])
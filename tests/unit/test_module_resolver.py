@@ -0,0 +1,108 @@
+import importlib
+import importlib.util
+import sys
+import textwrap
+
+import pytest
+
+import luma.examples
+from luma.parser import _render_apis
+from luma.utils import ModuleResolver
+
+# Records the names that the import system looks up in the package, in every process
+# that imports it.
+SPY_INIT_SOURCE = """
+import os
+import sys
+
+LOG_PATH = os.path.join(os.path.dirname(__file__), "lookups.txt")
+
+
+class LookupRecorder:
+    def find_spec(self, name, path=None, target=None):
+        if name.startswith("spypkg."):
+            with open(LOG_PATH, "a") as file:
+                file.write(name + "\\n")
+        return None
+
+
+sys.meta_path.insert(0, LookupRecorder())
+
+from .core import Greeter
+"""
+
+SPY_CORE_SOURCE = """
+class Greeter:
+    def greet(self, name: str) -> str:
+        \"\"\"Greet someone.\"\"\"
+        return f"Hello, {name}"
+"""
+
+
+def test_resolve():
+    resolver = ModuleResolver()
+
+    module, relative_name = resolver.resolve("luma.examples.Account.deposit")
+
+    assert module is luma.examples
+    assert relative_name == "Account.deposit"
+
+
+def test_resolve_missing_package():
+    with pytest.raises(ImportError):
+        ModuleResolver().resolve("nonexistentpkg.func")
+
+
+def test_prefixes_are_looked_up_once(monkeypatch):
+    looked_up = []
+    find_spec = importlib.util.find_spec
+
+    def record_lookup(name, *args, **kwargs):
+        looked_up.append(name)
+        return find_spec(name, *args, **kwargs)
+
+    monkeypatch.setattr(importlib.util, "find_spec", record_lookup)
+    resolver = ModuleResolver()
+
+    for _ in range(2):
+        resolver.resolve("luma.examples.Account.deposit")
+        resolver.resolve("luma.examples.Account.withdraw")
+        resolver.resolve("luma.examples.fib")
+
+    # 'luma.examples' is already imported, and the resolver should remember that
+    # 'luma.examples.Account' isn't a module.
+    assert looked_up == ["luma.examples.Account"]
+
+
+def test_clear():
+    resolver = ModuleResolver()
+    resolver.resolve("luma.examples.fib")
+
+    resolver.clear()
+
+    assert resolver.resolve("luma.examples.fib") == (luma.examples, "fib")
+
+
+def test_pool_workers_use_resolved_modules(tmp_path, monkeypatch):
+    package_dir = tmp_path / "spypkg"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text(textwrap.dedent(SPY_INIT_SOURCE))
+    (package_dir / "core.py").write_text(textwrap.dedent(SPY_CORE_SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    results = list(
+        _render_apis(
+            ["spypkg.Greeter.greet"],
+            static=False,
+            max_workers=1,
+            cache_dir=None,
+            fresh_interpreter=True,
+        )
+    )
+
+    assert "Greet someone." in results[0].markdown
+    # The worker imports the package that it was sent without looking for a
+    # 'spypkg.Greeter' module first, and this process doesn't import the package.
+    lookups = (package_dir / "lookups.txt").read_text().split()
+    assert set(lookups) == {"spypkg.core"}
+    assert "spypkg" not in sys.modules
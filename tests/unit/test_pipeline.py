@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from luma.pipeline import Pipeline
+from luma.profiling import profiling
+
+
+def test_dependencies_receive_results():
+    pipeline = Pipeline()
+    pipeline.add_step("a", lambda: 1)
+    pipeline.add_step("b", lambda: 2)
+    pipeline.add_step("sum", lambda a, b: a + b, after=["a", "b"])
+
+    assert pipeline.run()["sum"] == 3
+
+
+def test_independent_steps_overlap():
+    barrier = threading.Barrier(2, timeout=5)
+    pipeline = Pipeline()
+    # If the steps ran one after another, the barrier would time out.
+    pipeline.add_step("a", barrier.wait)
+    pipeline.add_step("b", barrier.wait)
+
+    pipeline.run(max_workers=2)
+
+
+def test_step_exception_propagates():
+    def fail():
+        raise ValueError("failed")
+
+    pipeline = Pipeline()
+    pipeline.add_step("fail", fail)
+    pipeline.add_step("after", lambda _: None, after=["fail"])
+
+    with pytest.raises(ValueError, match="failed"):
+        pipeline.run()
+
+
+def test_unknown_dependency():
+    pipeline = Pipeline()
+
+    with pytest.raises(AssertionError):
+        pipeline.add_step("a", lambda _: None, after=["missing"])
+
+
+def test_steps_run_one_at_a_time_while_profiling(tmp_path):
+    pipeline = Pipeline()
+    pipeline.add_step("a", lambda: bytearray(1 << 20))
+    pipeline.add_step("b", lambda: bytearray(1 << 20))
+
+    with profiling(True, str(tmp_path)) as profiler:
+        pipeline.run(max_workers=2)
+
+    records = {record.name: record for record in profiler.records}
+    assert records["a"].peak_memory >= 1 << 20
+    assert records["b"].peak_memory >= 1 << 20
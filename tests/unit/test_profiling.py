@@ -0,0 +1,61 @@
+import threading
+import tracemalloc
+
+from luma.profiling import Profiler
+
+
+def test_nested_phases():
+    profiler = Profiler()
+
+    with profiler.phase("outer"):
+        with profiler.phase("inner"):
+            pass
+
+    records = {record.name: record for record in profiler.records}
+    assert records["outer"].depth == 0
+    assert records["inner"].depth == 1
+    assert records["inner"].wall_time <= records["outer"].wall_time
+
+
+def test_chrome_trace():
+    profiler = Profiler()
+
+    with profiler.phase("phase"):
+        pass
+
+    (event,) = profiler.to_chrome_trace()["traceEvents"]
+    assert event["name"] == "phase"
+    assert event["ph"] == "X"
+    assert event["dur"] >= 0
+
+
+def test_overlapping_phases_have_no_peak_memory():
+    profiler = Profiler()
+    started = threading.Event()
+    finish = threading.Event()
+
+    def run_phase():
+        with profiler.phase("background"):
+            started.set()
+            finish.wait()
+
+    tracemalloc.start()
+    try:
+        thread = threading.Thread(target=run_phase)
+        thread.start()
+        started.wait()
+        with profiler.phase("overlapping"):
+            pass
+        finish.set()
+        thread.join()
+        with profiler.phase("alone"):
+            data = bytearray(1 << 20)
+        del data
+    finally:
+        tracemalloc.stop()
+
+    records = {record.name: record for record in profiler.records}
+    assert records["background"].peak_memory is None
+    assert records["overlapping"].peak_memory is None
+    assert records["alone"].peak_memory >= 1 << 20
+    assert profiler.peak_memory >= 1 << 20
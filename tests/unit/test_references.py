@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from conftest import read_data, read_shards, resolved_config
+from luma import parser
+from luma.config import Config, ResolvedReference, resolve_config
+from luma.parser import prepare_references, update_references
+from luma.search import build_search_index
+
+APIS = ["luma.examples.fib", "luma.examples.Account"]
+
+
+def _config(split, apis=APIS):
+    return resolved_config(
+        ResolvedReference(title="API", relative_path="api.md", apis=apis, split=split)
+    )
+
+
+# APIs that fail to render get no page, and aren't listed in the index.
+@pytest.mark.parametrize("apis", [APIS, [*APIS, "luma.examples.missing"]])
+def test_split_reference(project, apis):
+    prepare_references(str(project), _config(split=True, apis=apis))
+
+    pages = project / ".luma" / "pages"
+    index = (pages / "api.md").read_text()
+    assert "[`luma.examples.fib`](/api/luma.examples.fib)" in index
+    assert "luma.examples.missing" not in index
+    assert "luma.examples.fib" in (pages / "api" / "luma.examples.fib.md").read_text()
+    assert sorted(os.listdir(pages / "api")) == [
+        "luma.examples.Account.md",
+        "luma.examples.fib.md",
+    ]
+    assert read_data(project, "apis.json") == {
+        "luma.examples.fib": "api/luma.examples.fib#luma.examples.fib",
+        "luma.examples.Account": "api/luma.examples.Account#luma.examples.Account",
+    }
+
+
+def test_split_reference_search_index(project):
+    config = _config(split=True)
+    prepare_references(str(project), config)
+
+    build_search_index(str(project), config)
+
+    pages = {}
+    for shard in read_shards(project):
+        strings, columns = shard["strings"], shard["pages"]
+        for path, section in zip(columns["path"], columns["section"]):
+            pages[strings[path]] = strings[section]
+    assert pages == {
+        "/api": "",
+        "/api/luma.examples.fib": "API",
+        "/api/luma.examples.Account": "API",
+    }
+
+
+def test_removes_stale_pages(project):
+    prepare_references(str(project), _config(split=True))
+
+    prepare_references(str(project), _config(split=True, apis=APIS[:1]))
+    pages = project / ".luma" / "pages"
+    assert (pages / "api" / "luma.examples.fib.md").exists()
+    assert not (pages / "api" / "luma.examples.Account.md").exists()
+
+    prepare_references(str(project), _config(split=False))
+    assert not (pages / "api").exists()
+    assert "luma.examples.Account" in (pages / "api.md").read_text()
+
+
+def test_update_rewrites_only_changed_api_pages(project):
+    config = _config(split=True)
+    prepare_references(str(project), config)
+
+    rewritten = update_references(str(project), config, ["luma.examples.fib"])
+
+    assert rewritten == ["api/luma.examples.fib.md"]
+
+
+def test_writes_each_reference_as_its_apis_render(project, monkeypatch):
+    first = ResolvedReference(
+        title="First", relative_path="first.md", apis=APIS[:1], split=False
+    )
+    second = ResolvedReference(
+        title="Second", relative_path="second.md", apis=APIS, split=False
+    )
+    config = resolved_config(first, second)
+    first_page = project / ".luma" / "pages" / "first.md"
+    written_before = {}
+
+    render_api_chunk = parser._render_api_chunk
+
+    def render_and_check(qualnames, **kwargs):
+        written_before[qualnames[0]] = first_page.exists()
+        return render_api_chunk(qualnames, **kwargs)
+
+    monkeypatch.setattr(parser, "MAX_APIS_PER_CHUNK", 1)
+    monkeypatch.setattr(parser, "_render_api_chunk", render_and_check)
+    prepare_references(str(project), config, max_workers=1)
+
+    assert written_before == {"luma.examples.fib": False, "luma.examples.Account": True}
+    second_page = (project / ".luma" / "pages" / "second.md").read_text()
+    assert second_page.index("luma.examples.fib") < second_page.index("Account")
+    assert set(read_data(project, "apis.json")) == set(APIS)
+
+
+@pytest.mark.parametrize("split", [None, False, True])
+def test_split_is_opt_in(tmp_path, split):
+    apis = [f"pkg.api{i}" for i in range(500)]
+    reference = {"reference": "API", "apis": apis}
+    if split is not None:
+        reference["split"] = split
+    config = Config(name="example", navigation=[reference], project_root=str(tmp_path))
+
+    resolved_config = resolve_config(config, project_root=str(tmp_path))
+
+    assert resolved_config.navigation[0].split == bool(split)
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from luma.config.validation import validate_page_exists
+from luma.scanner import scan_project
+
+
+def _touch(root, relative_path):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+@pytest.fixture
+def project(tmp_path):
+    for relative_path in [
+        "index.md",
+        "guides/setup.md",
+        "guides/logo.png",
+        "notes.txt",
+        ".luma/pages/index.md",
+        ".luma/node_modules/pkg/README.md",
+        ".git/info.md",
+        "build/page.md",
+        "build/image.png",
+        "drafts/ignored.png",
+    ]:
+        _touch(tmp_path, relative_path)
+    (tmp_path / ".gitignore").write_text("build/\n*ignored*\n")
+    return tmp_path
+
+
+def test_classifies_pages_and_assets(project):
+    inventory = scan_project(str(project))
+
+    assert inventory.pages == ["index.md", os.path.join("guides", "setup.md")]
+    assert inventory.assets == [os.path.join("guides", "logo.png")]
+
+
+def test_prunes_directories(project, monkeypatch):
+    listed = []
+    original_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(os.path.relpath(path, project))
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    inventory = scan_project(str(project))
+
+    assert sorted(listed) == [".", "drafts", "guides"]
+    assert sorted(inventory.directories) == ["", "drafts", "guides"]
+
+
+def test_without_gitignore(tmp_path):
+    _touch(tmp_path, "build/page.md")
+
+    inventory = scan_project(str(tmp_path))
+
+    assert inventory.pages == [os.path.join("build", "page.md")]
+
+
+def test_has_page(project):
+    inventory = scan_project(str(project))
+
+    assert inventory.has_page("guides/setup.md")
+    assert inventory.has_page("./index.md")
+    assert not inventory.has_page("build/page.md")
+
+
+def test_page_validation_uses_inventory(project, monkeypatch):
+    inventory = scan_project(str(project))
+    monkeypatch.setattr(os.path, "exists", lambda path: False)
+
+    validate_page_exists("guides/setup.md", str(project), inventory)
+    with pytest.raises(ValueError):
+        validate_page_exists("build/page.md", str(project), inventory)
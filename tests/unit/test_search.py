@@ -0,0 +1,199 @@
+import gzip
+import os
+
+import pytest
+
+from conftest import read_search_documents, read_shards, resolved_config
+from luma import search
+from luma.config import ResolvedPage, ResolvedSection, ResolvedTab
+from luma.minisearch import build_index
+from luma.search import (
+    SEARCH_FIELDS,
+    STORED_FIELDS,
+    build_search_index,
+    search_index_exists,
+    update_search_index,
+)
+
+
+@pytest.fixture
+def project(project):
+    pages = project / ".luma" / "pages"
+    (pages / "guides").mkdir()
+    (pages / "index.md").write_text("# Welcome\n\n## Install\n")
+    (pages / "guides" / "setup.md").write_text("# Setup\n\nConfigure things.\n")
+    (pages / "guides" / "deploy.md").write_text("# Deploy\n\nShip it.\n")
+    return project
+
+
+def _config(tabs=True):
+    welcome = ResolvedPage(title="Welcome", path="index.md")
+    guides = ResolvedSection(
+        title="Guides",
+        contents=[
+            ResolvedPage(title="Setup", path="guides/setup.md", section="Guides"),
+            ResolvedPage(title="Deploy", path="guides/deploy.md", section="Guides"),
+        ],
+    )
+    if not tabs:
+        return resolved_config(welcome, guides)
+    return resolved_config(
+        ResolvedTab(title="Home", contents=[welcome]),
+        ResolvedTab(title="Guides", contents=[guides]),
+    )
+
+
+def _decode_shard(shard):
+    """Convert a compact shard to `MiniSearch.toJSON`'s format like 'SearchBar.tsx'."""
+    strings, pages, documents = shard["strings"], shard["pages"], shard["documents"]
+    stored_fields = {}
+    for short_id, page in enumerate(documents["page"]):
+        anchor, heading, heading_level = documents["headings"].get(
+            str(short_id), [None, "", 0]
+        )
+        path = strings[pages["path"][page]]
+        stored_fields[str(short_id)] = {
+            "title": strings[pages["title"][page]],
+            "path": path if anchor is None else f"{path}#{anchor}",
+            "section": strings[pages["section"][page]],
+            "heading": heading,
+            "headingLevel": heading_level,
+            "type": strings[pages["type"][page]],
+        }
+    count = len(documents["page"])
+    return {
+        **shard["index"],
+        "nextId": count,
+        "documentIds": {key: doc["path"] for key, doc in stored_fields.items()},
+        "fieldLength": dict(enumerate(shard["index"]["fieldLength"])),
+        "storedFields": stored_fields,
+        "dirtCount": 0,
+    }
+
+
+def _list_paths(shard):
+    return sorted(doc["path"] for doc in _decode_shard(shard)["storedFields"].values())
+
+
+@pytest.mark.parametrize("tabs", [True, False])
+def test_shards_by_tab_or_section(project, tabs):
+    build_search_index(str(project), _config(tabs))
+
+    shards = read_shards(project)
+
+    assert [_list_paths(shard) for shard in shards] == [
+        ["/index", "/index#install"],
+        ["/guides/deploy", "/guides/setup"],
+    ]
+
+
+@pytest.mark.parametrize(
+    "content, expected_paths",
+    [
+        # Skipped headings don't count: the first H1 and headings below H3.
+        (
+            "# Setup\n\n#### Install\n\n## Setup\n\n## Install\n\n### Install\n",
+            ["/index", "/index#install", "/index#install-2", "/index#setup"],
+        ),
+        # The counter skips slugs that are taken.
+        (
+            "# Welcome\n\n## Setup\n\n## Setup\n\n## Setup 2\n",
+            ["/index", "/index#setup", "/index#setup-2", "/index#setup-2-2"],
+        ),
+    ],
+)
+def test_numbers_repeated_slugs(project, content, expected_paths):
+    (project / ".luma" / "pages" / "index.md").write_text(content)
+
+    build_search_index(str(project), _config())
+
+    assert _list_paths(read_shards(project)[0]) == expected_paths
+
+
+def test_indexes_repeated_pages_once(project):
+    page = ResolvedPage(title="Welcome", path="index.md")
+    config = resolved_config(page, page)
+
+    build_search_index(str(project), config)
+    update_search_index(str(project), config, set())
+
+    assert [_list_paths(shard) for shard in read_shards(project)] == [
+        ["/index", "/index#install"]
+    ]
+
+
+def test_splits_large_groups(project, monkeypatch):
+    monkeypatch.setattr(search, "MAX_DOCUMENTS_PER_SHARD", 1)
+
+    build_search_index(str(project), _config())
+
+    assert [_list_paths(shard) for shard in read_shards(project)] == [
+        ["/index"],
+        ["/index#install"],
+        ["/guides/setup"],
+        ["/guides/deploy"],
+    ]
+
+
+def test_update_rebuilds_only_changed_shards(project, monkeypatch):
+    build_search_index(str(project), _config())
+    shards_path = project / ".luma" / "public" / "search-index"
+    before = set(os.listdir(shards_path))
+    (project / ".luma" / "pages" / "guides" / "setup.md").write_text("# Setup\n")
+
+    indexed = []
+    original_build_index = search.build_index
+
+    def build_index(docs, **kwargs):
+        indexed.append(sorted(doc["path"] for doc in docs))
+        return original_build_index(docs, **kwargs)
+
+    monkeypatch.setattr(search, "build_index", build_index)
+    update_search_index(str(project), _config(), {"guides/setup.md"})
+
+    assert indexed == [["/guides/deploy", "/guides/setup"]]
+    after = set(os.listdir(shards_path))
+    # The stale shard of the 'Guides' tab is removed with its compressed siblings.
+    assert len(after) == len(before)
+    assert len(before & after) == len(before) // 2
+
+
+def test_compact_shards_decode_to_minisearch_format(project):
+    build_search_index(str(project), _config())
+    docs = read_search_documents(project)
+
+    shards = read_shards(project)
+
+    decoded = [_decode_shard(shard) for shard in shards]
+    expected = [
+        build_index(docs[:2], fields=SEARCH_FIELDS, store_fields=STORED_FIELDS),
+        build_index(docs[2:], fields=SEARCH_FIELDS, store_fields=STORED_FIELDS),
+    ]
+    for index in expected:
+        index["fieldLength"] = dict(enumerate(index["fieldLength"].values()))
+    assert decoded == expected
+    # The 'Guides' section is interned once for both of its pages.
+    assert shards[1]["strings"].count("Guides") == 1
+
+
+def test_writes_gzipped_shards(project):
+    build_search_index(str(project), _config())
+    shards_path = project / ".luma" / "public" / "search-index"
+
+    for filename in os.listdir(shards_path):
+        if filename.endswith(".json"):
+            with gzip.open(shards_path / f"{filename}.gz") as file:
+                assert file.read() == (shards_path / filename).read_bytes()
+
+
+@pytest.mark.parametrize("suffix", [None, "", ".gz"])
+def test_search_index_exists(project, suffix):
+    build_search_index(str(project), _config())
+    if suffix is not None:
+        shards_path = project / ".luma" / "public" / "search-index"
+        filename = next(
+            name for name in os.listdir(shards_path) if name.endswith(".json")
+        )
+        os.remove(shards_path / f"{filename}{suffix}")
+
+    assert search_index_exists(str(project)) == (suffix is None)
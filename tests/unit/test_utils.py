@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from luma.utils import AtomicWriter, write_if_changed
+
+
+def test_writes_new_file(tmp_path):
+    path = tmp_path / "data.json"
+
+    assert write_if_changed(str(path), "[]")
+
+    assert path.read_text() == "[]"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_skips_identical_content(tmp_path):
+    path = tmp_path / "data.json"
+    write_if_changed(str(path), "[1]")
+    os.utime(path, ns=(0, 0))
+
+    assert not write_if_changed(str(path), "[1]")
+    assert path.stat().st_mtime_ns == 0
+
+    assert write_if_changed(str(path), "[2]")
+    assert path.read_text() == "[2]"
+
+
+def test_replaces_instead_of_writing_through_links(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_text("# Source")
+    path = tmp_path / "page.md"
+    os.link(source, path)
+
+    write_if_changed(str(path), "# Generated")
+
+    assert source.read_text() == "# Source"
+    assert path.read_text() == "# Generated"
+
+
+def test_keeps_original_on_failure(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text("[1]")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_if_changed(str(path), "[2]")
+
+    assert path.read_text() == "[1]"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_atomic_writer_streams_fragments(tmp_path):
+    path = tmp_path / "page.md"
+    path.write_text("# Old")
+
+    with AtomicWriter(str(path)) as writer:
+        for fragment in ["# API", "\n\n", "## greet"]:
+            writer.write(fragment)
+
+    assert writer.changed
+    assert path.read_text() == "# API\n\n## greet"
+    assert os.listdir(tmp_path) == ["page.md"]
+
+
+def test_atomic_writer_skips_identical_content(tmp_path):
+    path = tmp_path / "page.md"
+    path.write_text("# API\n\n## greet")
+    os.utime(path, ns=(0, 0))
+
+    with AtomicWriter(str(path)) as writer:
+        writer.write("# API")
+        writer.write("\n\n## greet")
+
+    assert not writer.changed
+    assert path.stat().st_mtime_ns == 0
+    assert os.listdir(tmp_path) == ["page.md"]
+
+
+def test_atomic_writer_discards_on_error(tmp_path):
+    path = tmp_path / "page.md"
+    path.write_text("# Old")
+
+    with pytest.raises(RuntimeError):
+        with AtomicWriter(str(path)) as writer:
+            writer.write("# New")
+            raise RuntimeError
+
+    assert path.read_text() == "# Old"
+    assert os.listdir(tmp_path) == ["page.md"]
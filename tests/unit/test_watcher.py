@@ -0,0 +1,241 @@
+import importlib
+import os
+import sys
+import textwrap
+import time
+
+import pytest
+
+from conftest import read_data, read_search_documents
+from luma import watcher as watcher_module
+from luma.cache import get_cache_root
+from luma.config import load_config, resolve_config
+from luma.link import link_config, link_existing_pages
+from luma.parser import prepare_references
+from luma.search import build_search_index
+from luma.watcher import ProjectWatcher
+
+CONFIG = """\
+name: example
+navigation:
+  - index.md
+  - section: Guides
+    contents:
+      - guides/setup.md
+"""
+
+
+@pytest.fixture
+def project(project):
+    (project / "guides").mkdir()
+    (project / "luma.yaml").write_text(CONFIG)
+    (project / "index.md").write_text("# Welcome\n\nHello.")
+    (project / "guides" / "setup.md").write_text("# Setup\n\n## Install\n")
+    return project
+
+
+@pytest.fixture
+def watcher(project):
+    config = load_config(str(project))
+    resolved_config = resolve_config(config, project_root=str(project))
+    link_config(resolved_config, str(project))
+    link_existing_pages(str(project))
+    build_search_index(str(project), resolved_config)
+    return ProjectWatcher(str(project), config, resolved_config)
+
+
+@pytest.mark.parametrize(
+    "path, content, expected_section, expected_title, expected_heading",
+    [
+        (
+            "guides/setup.md",
+            "# Installation\n\n## Requirements\n",
+            "Guides",
+            "Installation",
+            "Requirements",
+        ),
+        (
+            "luma.yaml",
+            CONFIG.replace("section: Guides", "section: Docs"),
+            "Docs",
+            "Setup",
+            "Install",
+        ),
+    ],
+)
+def test_edit_updates_config_and_search_index(
+    project, watcher, path, content, expected_section, expected_title, expected_heading
+):
+    (project / path).write_text(content)
+
+    watcher.apply({path})
+
+    section = read_data(project, "config.json")["navigation"][1]
+    assert section["title"] == expected_section
+    assert section["contents"][0]["title"] == expected_title
+    assert [
+        (doc["title"], doc["section"], doc["heading"])
+        for doc in read_search_documents(project)
+    ] == [
+        ("Welcome", "", ""),
+        (expected_title, expected_section, ""),
+        (expected_title, expected_section, expected_heading),
+    ]
+
+
+def test_patched_search_index_matches_rebuild(project, watcher):
+    (project / "index.md").write_text("# Welcome\n\n## News\n")
+    watcher.apply({"index.md"})
+    patched = read_search_documents(project)
+
+    config = load_config(str(project))
+    build_search_index(str(project), resolve_config(config, project_root=str(project)))
+
+    assert patched == read_search_documents(project)
+
+
+def test_invalid_config_keeps_previous_config(project, watcher, caplog):
+    (project / "luma.yaml").write_text(CONFIG.replace("index.md", "missing.md"))
+
+    watcher.apply({"luma.yaml"})
+
+    assert "Ignoring invalid config" in caplog.text
+    config = read_data(project, "config.json")
+    assert config["navigation"][0]["path"] == "index.md"
+
+
+def test_move_page(project, watcher):
+    os.rename(project / "guides" / "setup.md", project / "guides" / "install.md")
+
+    watcher.apply({"guides/setup.md", "guides/install.md"})
+
+    pages = project / ".luma" / "pages" / "guides"
+    assert not (pages / "setup.md").exists()
+    assert os.path.samefile(pages / "install.md", project / "guides" / "install.md")
+
+
+def test_static_assets(project, watcher):
+    (project / "logo.png").write_bytes(b"")
+    watcher.apply({"logo.png"})
+    assert (project / ".luma" / "public" / "logo.png").exists()
+
+    (project / "logo.png").unlink()
+    watcher.apply({"logo.png"})
+    assert not (project / ".luma" / "public" / "logo.png").exists()
+
+
+def test_coalesces_events(project, watcher, monkeypatch):
+    batches = []
+    monkeypatch.setattr(watcher, "apply", lambda paths, **kwargs: batches.append(paths))
+    watcher.start()
+    try:
+        for _ in range(3):
+            watcher.notify(str(project / "index.md"))
+        watcher.notify(str(project / "guides" / "setup.md"))
+
+        deadline = time.monotonic() + 5
+        while not batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert batches == [{"index.md", os.path.join("guides", "setup.md")}]
+
+
+def test_ignores_luma_directory(project, watcher, monkeypatch):
+    monkeypatch.setattr(
+        watcher_module,
+        "link_page",
+        lambda *args: pytest.fail("Files in '.luma' shouldn't be linked"),
+    )
+
+    watcher.apply({os.path.join(".luma", "pages", "index.md")})
+
+
+def test_watches_only_project_directories(project):
+    (project / ".luma" / "node_modules" / "pkg").mkdir(parents=True)
+    (project / "build").mkdir()
+    (project / ".gitignore").write_text("build/\n")
+    config = load_config(str(project))
+    resolved_config = resolve_config(config, project_root=str(project))
+    watcher = ProjectWatcher(str(project), config, resolved_config)
+
+    watcher.start()
+    try:
+        assert set(watcher._watches) == {str(project), str(project / "guides")}
+
+        (project / "notes").mkdir()
+        (project / "notes" / "todo.md").write_text("# Todo")
+
+        linked = project / ".luma" / "pages" / "notes" / "todo.md"
+        deadline = time.monotonic() + 5
+        while not linked.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert linked.exists()
+    assert set(watcher._watches) == {
+        str(project),
+        str(project / "guides"),
+        str(project / "notes"),
+    }
+
+
+PACKAGE_SOURCE = '''
+def greet(name: str) -> str:
+    """Greet someone."""
+    return f"Hello, {name}"
+
+
+def leave(name: str) -> str:
+    """Say goodbye."""
+    return f"Bye, {name}"
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    package_dir = tmp_path / "site-packages" / "livepkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "core.py").write_text(textwrap.dedent(PACKAGE_SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path / "site-packages"))
+    importlib.invalidate_caches()
+    yield package_dir
+    for name in list(sys.modules):
+        if name == "livepkg" or name.startswith("livepkg."):
+            del sys.modules[name]
+
+
+def test_source_change_regenerates_reference(project, package):
+    with open(project / "luma.yaml", "a") as file:
+        file.write(
+            "  - reference: API\n"
+            "    apis:\n"
+            "      - livepkg.core.greet\n"
+            "      - livepkg.core.leave\n"
+        )
+    config = load_config(str(project))
+    resolved_config = resolve_config(config, project_root=str(project))
+    cache_dir = os.path.join(get_cache_root(str(project)), "render")
+    prepare_references(str(project), resolved_config, cache_dir=cache_dir)
+    build_search_index(str(project), resolved_config)
+    watcher = ProjectWatcher(str(project), config, resolved_config)
+
+    source_path = str(package / "core.py")
+    (package / "core.py").write_text(
+        textwrap.dedent(PACKAGE_SOURCE).replace("Greet someone.", "Welcome someone.")
+    )
+    watcher.notify(source_path)
+    watcher.apply(set(), changed_sources=watcher._pending_sources)
+
+    page = (project / ".luma" / "pages" / "api.md").read_text()
+    assert "Welcome someone." in page
+    assert "Say goodbye." in page
+    assert read_data(project, "apis.json") == {
+        "livepkg.core.greet": "api#livepkg.core.greet",
+        "livepkg.core.leave": "api#livepkg.core.leave",
+    }
+    contents = [doc["content"] for doc in read_search_documents(project)]
+    assert any("Welcome someone." in content for content in contents)
@@ -0,0 +1,103 @@
+import importlib
+import os
+import sys
+import textwrap
+
+import pytest
+import yaml
+
+from luma.cache import get_cache_root
+from luma.config import load_config
+from luma.parser import _render_api_chunk
+from luma.worker import (
+    LOG_FILENAME,
+    WorkerError,
+    _connect,
+    render_in_worker,
+    stop_worker,
+)
+
+CORE_SOURCE = '''
+def greet(name: str) -> str:
+    """Greet someone."""
+    return f"Hello, {name}"
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    package_dir = tmp_path / "site-packages" / "workerpkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("from .core import greet\n")
+    (package_dir / "core.py").write_text(textwrap.dedent(CORE_SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path / "site-packages"))
+    importlib.invalidate_caches()
+    yield package_dir
+    for name in list(sys.modules):
+        if name == "workerpkg" or name.startswith("workerpkg."):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def project(tmp_path):
+    project_root = tmp_path / "project"
+    project_root.mkdir()
+    yield str(project_root)
+    stop_worker(str(project_root))
+
+
+def _render(project, qualnames):
+    results = render_in_worker(project, qualnames, static=False, cache_dir=None)
+    return {result.qualname: result.markdown for result in results}
+
+
+def test_matches_in_process_render(project, package):
+    rendered = _render(project, ["workerpkg.core.greet", "workerpkg.missing"])
+
+    expected = _render_api_chunk(
+        ["workerpkg.core.greet", "workerpkg.missing"], static=False, cache_dir=None
+    )
+    assert rendered == {result.qualname: result.markdown for result in expected}
+
+
+def test_does_not_import_in_cli(project, package):
+    _render(project, ["workerpkg.core.greet"])
+
+    assert "workerpkg" not in sys.modules
+
+
+@pytest.mark.parametrize("api, valid", [("greet", True), ("missing", False)])
+def test_validates_config_in_worker(project, package, api, valid):
+    navigation = [{"reference": "API", "apis": [f"workerpkg.{api}"]}]
+    with open(os.path.join(project, "luma.yaml"), "w") as file:
+        yaml.safe_dump({"name": "example", "navigation": navigation}, file)
+
+    if valid:
+        load_config(project, persistent_worker=True)
+    else:
+        with pytest.raises(ValueError, match="workerpkg.missing"):
+            load_config(project, persistent_worker=True)
+
+    assert "workerpkg" not in sys.modules
+
+
+def test_reloads_changed_modules(project, package):
+    assert "Greet someone." in _render(project, ["workerpkg.greet"])["workerpkg.greet"]
+
+    source = textwrap.dedent(CORE_SOURCE).replace("Greet someone.", "Welcome someone.")
+    (package / "core.py").write_text(source)
+
+    # The package re-exports the function, so it has to be reloaded after the module.
+    markdown = _render(project, ["workerpkg.greet"])["workerpkg.greet"]
+    assert "Welcome someone." in markdown
+
+
+def test_stop_worker(project, package):
+    _render(project, ["workerpkg.core.greet"])
+
+    stop_worker(project)
+
+    with pytest.raises(WorkerError):
+        _connect(project, start=False)
+    with open(os.path.join(get_cache_root(project), LOG_FILENAME)) as file:
+        assert "INFO luma.worker: Exiting on request." in file.read()